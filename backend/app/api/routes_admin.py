@@ -1,25 +1,76 @@
 # Purpose: Admin API routes for dev interactions
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
 import subprocess
 import os
 import sys
+import uuid
+import duckdb
+
+from app.db import dataset_store
+from app.db.connection import get_db
+from app.db.dataset_version import bump_dataset_version, dataset_write_lock, get_dataset_version
+from app.db.distributions import publish_feature_distribution
+from app.db.repositories import LocationRepository
+from app.schemas.location import LocationBase
+from app.core.config import settings
+from app.services.ingestion_service import IngestionService
+from app.services.validation_service import ValidationService, DatasetValidationError
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "generate_dummy_data.py")
 
 @router.post("/reset-dummy-data")
-def reset_dummy_data(rows: int = 10000):
+def reset_dummy_data(rows: int = 10000, db: duckdb.DuckDBPyConnection = Depends(get_db)):
     """ Developer-only endpoint to trigger dummy data generation. """
+    # Generate next to the live file under a name of its own, so concurrent resets
+    # never write, validate or publish each other's output; it only replaces the
+    # live file once validated
+    staged = f"{dataset_store.BASE_FILE}.{os.getpid()}.{uuid.uuid4().hex}.staged"
+    try:
+        try:
+            # We run the script in a subprocess to reuse the existing generation logic
+            result = subprocess.run(
+                [sys.executable, SCRIPT_PATH, "--rows", str(rows), "--output", staged],
+                capture_output=True, text=True, check=True
+            )
+        except subprocess.CalledProcessError as e:
+            return {"status": "error", "message": "Data generation failed.", "output": e.stderr}
+
+        profile = None
+        if settings.VALIDATION_ENABLED:
+            validator = ValidationService(db)
+            baseline = dataset_store.get_profile() or validator.profile_current()
+            report = validator.validate_parquet(staged, baseline)
+            if not report["passed"]:
+                return {"status": "error", "message": "Validation failed; dataset not published.", "validation": report, "output": result.stdout}
+            profile = report["profile"]
+
+        with dataset_write_lock():
+            os.replace(staged, dataset_store.BASE_FILE)
+            # Deltas were layered on the old base, so they go with it
+            dataset_store.reset(profile)
+            # Ready before the version moves, so workers load it rather than scan
+            publish_feature_distribution(
+                LocationRepository(db), get_dataset_version() + 1, dataset_store.get_generation(dataset_store.ALL_STATES_SCOPE)
+            )
+            # Every cache key embeds the version, so this invalidates all cached responses at once
+            version = bump_dataset_version(locked=True)
+    finally:
+        # Left behind by a failed generation or validation; published files were moved away
+        if os.path.exists(staged):
+            os.remove(staged)
+    return {"status": "success", "message": "Dummy data regenerated successfully.", "dataset_version": version, "output": result.stdout}
+
+@router.post("/upsert-locations")
+def upsert_locations(locations: List[LocationBase], db: duckdb.DuckDBPyConnection = Depends(get_db)):
+    """ Insert or replace locations by location_id without regenerating the dataset. """
+    service = IngestionService(db)
     try:
-        # We run the script in a subprocess to reuse the existing generation logic
-        result = subprocess.run(
-            [sys.executable, SCRIPT_PATH, "--rows", str(rows)],
-            capture_output=True, text=True, check=True
-        )
-        return {"status": "success", "message": "Dummy data regenerated successfully.", "output": result.stdout}
-    except subprocess.CalledProcessError as e:
-        return {"status": "error", "message": "Data generation failed.", "output": e.stderr}
+        result = service.upsert_locations([loc.model_dump() for loc in locations])
+    except DatasetValidationError as e:
+        raise HTTPException(status_code=422, detail={"message": "Validation failed; batch not published.", "errors": e.report["errors"]})
+    return {"status": "success", **result}
 
 def register_routes(app):
     app.include_router(router)
-
@@ -0,0 +1,67 @@
+# Purpose: Admin diagnostics routes (sampling profiler, slow query log, process info)
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.process import memory_usage, process_state
+from app.core.profiling import profiler, slow_query_log
+from app.db.connection import get_connection
+from app.db.repositories import LocationRepository
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.post("/profiler/start")
+def start_profiler(
+    seconds: float = Query(30.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1.0, le=1000.0)
+):
+    """ Start sampling this worker for N seconds. Collect the result with /admin/profiler/stop. """
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {settings.PROFILER_MAX_SECONDS}")
+    if not profiler.start(seconds, interval_ms / 1000):
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    return {"status": "started", **profiler.status()}
+
+@router.get("/profiler")
+def profiler_status():
+    return profiler.status()
+
+@router.post("/profiler/stop", response_class=PlainTextResponse)
+def stop_profiler():
+    """ Stop (if still running) and return collapsed stacks, ready for flamegraph.pl or speedscope. """
+    return PlainTextResponse(
+        profiler.stop(),
+        headers={"Content-Disposition": "attachment; filename=profile.collapsed"}
+    )
+
+@router.get("/slow-queries")
+def get_slow_queries(limit: int = Query(50, ge=1, le=1000), explain: bool = False):
+    """
+    Most recent repository queries over SLOW_QUERY_THRESHOLD_MS, newest first.
+    explain=true re-runs each listed query under EXPLAIN ANALYZE (against the
+    current data) and keeps the plan on the entry, so later reads reuse it.
+    """
+    queries = slow_query_log.entries(limit)
+    missing = [entry for entry in queries if entry["explain_analyze"] is None]
+    if explain and missing:
+        conn = get_connection()
+        try:
+            repo = LocationRepository(conn)
+            for entry in missing:
+                entry["explain_analyze"] = repo.explain_analyze(entry["sql"], entry["params"])
+        finally:
+            conn.close()
+    return {"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "queries": queries}
+
+@router.delete("/slow-queries")
+def clear_slow_queries():
+    slow_query_log.clear()
+    return {"status": "success"}
+
+@router.get("/process")
+def process_info():
+    """ Role, cold-start timings and memory (RSS/PSS) of the worker that served this request. """
+    return {**process_state.snapshot(), "memory": memory_usage()}
+
+def register_routes(app):
+    app.include_router(router)
@@ -1,6 +1,9 @@
 # Purpose: Health API routes
 from fastapi import APIRouter, Depends
+from typing import Optional
+import asyncio
 from app.core.config import settings
+from app.db.circuit_breaker import cache_breaker
 from app.db.redis import get_redis
 import time
 
@@ -8,10 +11,11 @@ router = APIRouter()
 START_TIME = time.time()
 
 @router.get("/health")
-async def health_check(redis: "redis.Redis" = Depends(get_redis)):
+async def health_check(redis: Optional["redis.Redis"] = Depends(get_redis)):
     uptime = time.time() - START_TIME
     try:
-        redis_status = await redis.ping()
+        # Same tight budget as cache calls, so a Redis brownout can't stall health checks
+        redis_status = await asyncio.wait_for(redis.ping(), timeout=settings.REDIS_OP_TIMEOUT_MS / 1000) if redis else False
     except Exception:
         redis_status = False
     
@@ -19,9 +23,9 @@ async def health_check(redis: "redis.Redis" = Depends(get_redis)):
         "status": "ok",
         "version": settings.VERSION,
         "uptime_seconds": round(uptime, 2),
-        "redis": "connected" if redis_status else "disconnected"
+        "redis": "connected" if redis_status else "disconnected",
+        "redis_circuit": cache_breaker.snapshot()
     }
 
 def register_routes(app):
     app.include_router(router, tags=["Health"])
-
@@ -1,62 +1,126 @@
 # Purpose: Locations API routes
 from fastapi import APIRouter, Depends, Query, Header
-import json
 import logging
 from typing import Optional
 import duckdb
 
 from app.db.connection import get_db
 from app.db.repositories import LocationRepository
-from app.schemas.location import LocationSearchResponse
-from app.db.redis import get_redis
+from app.schemas.location import LocationSearchResponse, AggregatesResponse, SuggestResponse
+from app.db.aggregates import region_aggregates
+from app.db.suggest_index import MAX_SUGGESTIONS, suggest_index
+from app.db.cache import CacheClient, build_cache_key, get_cache
+from app.db.dataset_store import state_scope
+from app.core.metrics import InstrumentedRoute, stage, record_cache, record_rows
+from app.core.http_cache import conditional_get, encoded_bodies, encoded_response, etag_for, negotiate_encoding
 
 logger = logging.getLogger("locofinder")
-router = APIRouter(prefix="/locations", tags=["Locations"])
+router = APIRouter(prefix="/locations", tags=["Locations"], route_class=InstrumentedRoute)
+
+def _search_cache_key(
+    state: Optional[str] = Query(None, description="Filter by state abbreviation"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+) -> str:
+    return build_cache_key("locations_search", f"state={state}:offset={offset}:limit={limit}", [state_scope(state)])
 
 @router.get("/search", response_model=LocationSearchResponse)
 async def search_locations(
     state: Optional[str] = Query(None, description="Filter by state abbreviation"),
     offset: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    # Declared first: a matching If-None-Match is answered before Redis or DuckDB are touched
+    cache_key: str = Depends(conditional_get(_search_cache_key)),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
     x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
-    redis: "redis.Redis" = Depends(get_redis),
+    cache: CacheClient = Depends(get_cache),
     db: duckdb.DuckDBPyConnection = Depends(get_db)
 ):
-    # Construct cache key
-    cache_key = f"locations_search:state={state}:offset={offset}:limit={limit}"
-    
-    # Try cache
+    etag = etag_for(cache_key)
+    encoding = negotiate_encoding(accept_encoding)
+
     if not x_bypass_cache:
-        try:
-            cached_result = await redis.get(cache_key)
-            if cached_result:
-                logger.info(f"Cache HIT for {cache_key}")
-                return json.loads(cached_result)
-            logger.info(f"Cache MISS for {cache_key}")
-        except Exception as e:
-            logger.warning(f"Redis get failed for {cache_key}: {e}")
+        # Bodies already encoded by this worker go out as is
+        local = await encoded_bodies.get_async(etag, encoding)
+        if local:
+            record_cache("locations_search", "local_hit")
+            return encoded_response(etag, local)
+
+        # Try cache (fails open: Redis trouble reads as a miss)
+        with stage("cache_get"):
+            cached_result = await cache.get(cache_key)
+        if cached_result:
+            logger.info(f"Cache HIT for {cache_key}")
+            record_cache("locations_search", "hit")
+            # The cached JSON is the response body; no parse/re-serialize round trip
+            return encoded_response(etag, await encoded_bodies.put_async(etag, cached_result.encode("utf-8"), encoding))
+        logger.info(f"Cache MISS for {cache_key}")
+        record_cache("locations_search", "miss")
     else:
         logger.info(f"Cache BYPASS for {cache_key}")
+        record_cache("locations_search", "bypass")
 
     # Fetch from DB
     repo = LocationRepository(db)
     from fastapi.concurrency import run_in_threadpool
-    locations, total = await run_in_threadpool(repo.get_locations, state, offset, limit)
-    
-    response_data = {
-        "total": total,
+    with stage("get_locations"):
+        locations, total = await run_in_threadpool(repo.get_locations, state, offset, limit)
+    record_rows("/locations/search", total, len(locations))
+
+    with stage("serialize_body"):
+        body = LocationSearchResponse(
+            total=total,
+            offset=offset,
+            limit=limit,
+            locations=locations
+        ).model_dump_json()
+
+    # Store in cache without waiting on Redis; the version prefix handles invalidation
+    with stage("cache_set"):
+        cache.set_background(cache_key, body)
+
+    return encoded_response(etag, await encoded_bodies.put_async(etag, body.encode("utf-8"), encoding))
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest_locations(
+    q: str = Query(..., min_length=1, max_length=100, description="Start of a city or county name"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS)
+):
+    """Typeahead over city and county names, most populous first, from the in-memory prefix index."""
+    # No DB dependency: opening a connection would cost more than the lookup. The
+    # index opens its own, and only when the dataset has changed since the last build.
+    if suggest_index.is_stale():
+        from fastapi.concurrency import run_in_threadpool
+        with stage("build_suggest_index"):
+            await run_in_threadpool(suggest_index.refresh)
+
+    with stage("suggest_lookup"):
+        suggestions = suggest_index.lookup(q, limit)
+    return {"query": q, "suggestions": suggestions}
+
+@router.get("/aggregates", response_model=AggregatesResponse)
+async def location_aggregates(
+    level: str = Query("state", pattern="^(state|county)$", description="Aggregate by state or by county"),
+    state: Optional[str] = Query(None, description="Only this state (and its counties)"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Count, mean, min/max and percentiles of every scorable feature, served from memory."""
+    # No DB dependency, as for /suggest: the table opens its own connection, and only
+    # the first request after a data change pays for it and the (per-state) recompute
+    if region_aggregates.is_stale():
+        from fastapi.concurrency import run_in_threadpool
+        with stage("refresh_aggregates"):
+            await run_in_threadpool(region_aggregates.refresh)
+
+    regions = region_aggregates.by_state(state) if level == "state" else region_aggregates.by_county(state)
+    return {
+        "level": level,
+        "total": len(regions),
         "offset": offset,
         "limit": limit,
-        "locations": locations
+        "regions": regions[offset:offset + limit]
     }
-    
-    # Store in cache (TTL 300s = 5m)
-    try:
-        await redis.setex(cache_key, 300, json.dumps(response_data))
-    except Exception as e:
-        logger.warning(f"Redis setex failed for {cache_key}: {e}")
-        
-    return response_data
 
 def register_routes(app):
     app.include_router(router)
@@ -0,0 +1,18 @@
+# Purpose: Prometheus metrics endpoint
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Prometheus text exposition of per-stage latency, cache hit ratios and row counts."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def register_routes(app):
+    app.include_router(router, tags=["Metrics"])
@@ -1,5 +1,6 @@
 # Purpose: Scoring API routes
 from fastapi import APIRouter, Depends, Query, Header, HTTPException
+from pydantic import TypeAdapter
 import json
 import logging
 from typing import Optional, List
@@ -7,67 +8,216 @@ import duckdb
 
 from app.db.connection import get_db
 from app.db.repositories import LocationRepository
-from app.db.redis import get_redis
-from app.schemas.scoring import ScoringRequest, RecommendResponse, ExplainResponse, FeatureSchema
+from app.db.cache import CacheClient, build_cache_key, hash_payload, get_cache
+from app.db.dataset_store import state_scope, STATS_SCOPE, ALL_STATES_SCOPE
+from app.db.distributions import feature_distributions
+from app.core.metrics import InstrumentedRoute, stage, record_cache, record_rows
+from app.core.http_cache import conditional_get, encoded_bodies, encoded_response, etag_for, negotiate_encoding
+from app.schemas.scoring import (
+    ScoringRequest, RecommendResponse, ExplainResponse, ExplainBatchRequest, ExplainBatchResponse,
+    FeatureSchema, ParetoRequest, ParetoResponse, SensitivityResponse
+)
 from app.scoring.engine import score_locations, SCORABLE_FEATURES
+from app.scoring.skyline import pareto_frontier
+from app.scoring.sensitivity import weight_sensitivity
+from app.scoring.normalization import Normalizer, MINMAX
 
 logger = logging.getLogger("locofinder")
-router = APIRouter(tags=["Scoring"])
+_FEATURE_SCHEMA_LIST = TypeAdapter(List[FeatureSchema])
+router = APIRouter(tags=["Scoring"], route_class=InstrumentedRoute)
+
+def _cache_scopes(state: Optional[str], normalization: str) -> List[str]:
+    # Results depend on the filtered state's rows and on the dataset-wide stats
+    scopes = [state_scope(state), STATS_SCOPE]
+    # z-score and percentile read the whole distribution, which any upsert can shift
+    if normalization != MINMAX and ALL_STATES_SCOPE not in scopes:
+        scopes.append(ALL_STATES_SCOPE)
+    return scopes
+
+async def _build_normalizer(repo: LocationRepository, strategy: str, stats: dict) -> Normalizer:
+    distribution = None
+    if strategy != MINMAX:
+        from fastapi.concurrency import run_in_threadpool
+        with stage("get_feature_distribution"):
+            distribution = await run_in_threadpool(feature_distributions.get, repo)
+    return Normalizer(strategy, stats, distribution)
 
 @router.post("/recommend", response_model=RecommendResponse)
 async def recommend_locations(
     request: ScoringRequest,
     x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
-    redis: "redis.Redis" = Depends(get_redis),
+    cache: CacheClient = Depends(get_cache),
     db: duckdb.DuckDBPyConnection = Depends(get_db)
 ):
     # Deterministic cache key based on the request body
     payload_str = request.model_dump_json()
-    cache_key = f"recommend:{hash(payload_str)}"
+    scopes = _cache_scopes(request.filters.state, request.normalization)
+    cache_key = build_cache_key("recommend", hash_payload(payload_str), scopes)
     
     if not x_bypass_cache:
-        try:
-            cached_result = await redis.get(cache_key)
-            if cached_result:
-                logger.info(f"Cache HIT for dict {cache_key}")
-                return json.loads(cached_result)
-        except Exception as e:
-            logger.warning(f"Redis get failed for {cache_key}: {e}")
+        with stage("cache_get"):
+            cached_result = await cache.get(cache_key)
+        if cached_result:
+            logger.info(f"Cache HIT for dict {cache_key}")
+            record_cache("recommend", "hit")
+            return json.loads(cached_result)
+        record_cache("recommend", "miss")
+    else:
+        record_cache("recommend", "bypass")
             
     repo = LocationRepository(db)
     from fastapi.concurrency import run_in_threadpool
     
     # 1. Fetch baseline locations matching hard constraints
-    raw_locations = await run_in_threadpool(repo.get_all_locations_for_scoring, request.filters.model_dump(exclude_none=True))
+    with stage("get_all_locations_for_scoring"):
+        raw_locations = await run_in_threadpool(repo.get_all_locations_for_scoring, request.filters.model_dump(exclude_none=True))
     total_analyzed = len(raw_locations)
     
     # 2. Extract database-wide min/max stats for normalization
-    stats = await run_in_threadpool(repo.get_feature_stats)
+    with stage("get_feature_stats"):
+        stats = await run_in_threadpool(repo.get_feature_stats)
     
     if not stats or not raw_locations:
+        record_rows("/recommend", total_analyzed, 0)
         return {"total_analyzed": 0, "results": []}
         
+    normalizer = await _build_normalizer(repo, request.normalization, stats)
+        
     # 3. Apply scoring engine (mutates and sorts list in-place)
-    ranked_locations = score_locations(raw_locations, stats, request.weights)
+    with stage("score_locations"):
+        ranked_locations = score_locations(raw_locations, stats, request.weights, normalizer)
     
     # 4. Truncate to limit
     top_results = ranked_locations[:request.limit]
+    record_rows("/recommend", total_analyzed, len(top_results))
     
     response_data = {
         "total_analyzed": total_analyzed,
         "results": [{"location": loc, "total_score": loc["total_score"]} for loc in top_results]
     }
     
-    try:
-        await redis.setex(cache_key, 300, json.dumps(response_data))
-    except Exception as e:
-        logger.warning(f"Redis setex failed for {cache_key}: {e}")
+    with stage("cache_set"):
+        cache.set_background(cache_key, json.dumps(response_data))
         
     return response_data
 
+@router.post("/recommend/pareto", response_model=ParetoResponse)
+async def pareto_locations(
+    request: ParetoRequest,
+    x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
+    cache: CacheClient = Depends(get_cache),
+    db: duckdb.DuckDBPyConnection = Depends(get_db)
+):
+    """
+    Weight-free mode: the Pareto-optimal locations over the selected features.
+    Clients rank the frontier locally while tuning weights instead of calling
+    /recommend on every slider move.
+    """
+    # Weights aren't part of the request, so one entry serves every slider position for a filter set
+    scopes = _cache_scopes(request.filters.state, request.normalization)
+    cache_key = build_cache_key("pareto", hash_payload(request.model_dump_json()), scopes)
+
+    if not x_bypass_cache:
+        with stage("cache_get"):
+            cached_result = await cache.get(cache_key)
+        if cached_result:
+            record_cache("pareto", "hit")
+            return json.loads(cached_result)
+        record_cache("pareto", "miss")
+    else:
+        record_cache("pareto", "bypass")
+
+    repo = LocationRepository(db)
+    from fastapi.concurrency import run_in_threadpool
+
+    with stage("get_all_locations_for_scoring"):
+        raw_locations = await run_in_threadpool(repo.get_all_locations_for_scoring, request.filters.model_dump(exclude_none=True))
+    total_analyzed = len(raw_locations)
+
+    with stage("get_feature_stats"):
+        stats = await run_in_threadpool(repo.get_feature_stats)
+
+    normalizer = await _build_normalizer(repo, request.normalization, stats)
+    features = [feat for feat in SCORABLE_FEATURES if feat.name in request.features]
+    with stage("skyline"):
+        frontier = await run_in_threadpool(pareto_frontier, raw_locations, stats, features, normalizer)
+    record_rows("/recommend/pareto", total_analyzed, len(frontier))
+
+    response_data = {
+        "total_analyzed": total_analyzed,
+        "features": request.features,
+        "results": frontier
+    }
+
+    with stage("cache_set"):
+        cache.set_background(cache_key, json.dumps(response_data))
+
+    return response_data
+
+@router.post("/scoring/sensitivity", response_model=SensitivityResponse)
+async def scoring_sensitivity(
+    request: ScoringRequest,
+    x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
+    cache: CacheClient = Depends(get_cache),
+    db: duckdb.DuckDBPyConnection = Depends(get_db)
+):
+    """
+    For the /recommend request in the body: the range each weight can move
+    within before the top-`limit` ranking changes, and who changes it.
+    """
+    scopes = _cache_scopes(request.filters.state, request.normalization)
+    cache_key = build_cache_key("sensitivity", hash_payload(request.model_dump_json()), scopes)
+
+    if not x_bypass_cache:
+        with stage("cache_get"):
+            cached_result = await cache.get(cache_key)
+        if cached_result:
+            record_cache("sensitivity", "hit")
+            return json.loads(cached_result)
+        record_cache("sensitivity", "miss")
+    else:
+        record_cache("sensitivity", "bypass")
+
+    repo = LocationRepository(db)
+    from fastapi.concurrency import run_in_threadpool
+
+    with stage("get_all_locations_for_scoring"):
+        raw_locations = await run_in_threadpool(repo.get_all_locations_for_scoring, request.filters.model_dump(exclude_none=True))
+    total_analyzed = len(raw_locations)
+
+    with stage("get_feature_stats"):
+        stats = await run_in_threadpool(repo.get_feature_stats)
+
+    normalizer = await _build_normalizer(repo, request.normalization, stats)
+    with stage("sensitivity"):
+        analysis = await run_in_threadpool(weight_sensitivity, raw_locations, stats, request.weights, request.limit, normalizer)
+    record_rows("/scoring/sensitivity", total_analyzed, len(analysis["top"]))
+
+    response_data = {"total_analyzed": total_analyzed, **analysis}
+
+    with stage("cache_set"):
+        cache.set_background(cache_key, json.dumps(response_data))
+
+    return response_data
+
+def _schema_cache_key() -> str:
+    # The schema only reads the feature stats
+    return build_cache_key("scoring_schema", "", [STATS_SCOPE])
+
 @router.get("/scoring/schema", response_model=List[FeatureSchema])
-def get_scoring_schema(db: duckdb.DuckDBPyConnection = Depends(get_db)):
+def get_scoring_schema(
+    cache_key: str = Depends(conditional_get(_schema_cache_key)),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
+    x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
+    db: duckdb.DuckDBPyConnection = Depends(get_db)
+):
     """Returns metadata about what features can be weighted and their data distributions."""
+    etag = etag_for(cache_key)
+    encoding = negotiate_encoding(accept_encoding)
+    local = None if x_bypass_cache else encoded_bodies.get(etag, encoding)
+    if local:
+        return encoded_response(etag, local)
+
     repo = LocationRepository(db)
     stats = repo.get_feature_stats()
     
@@ -81,7 +231,22 @@ def get_scoring_schema(db: duckdb.DuckDBPyConnection = Depends(get_db)):
             max_value=feat_stats["max"],
             optimization_direction="minimize" if feat.minimize else "maximize"
         ))
-    return schemas
+    body = _FEATURE_SCHEMA_LIST.dump_json(schemas)
+    return encoded_response(etag, encoded_bodies.put(etag, body, encoding))
+
+def _explain_locations(repo: LocationRepository, location_ids: List[str], weights, normalization: str) -> dict:
+    """location_id -> ExplainResponse dict for the ids that exist."""
+    stats = repo.get_feature_stats()
+    locations = repo.get_locations_by_ids(location_ids)
+    if not locations:
+        return {}
+    distribution = feature_distributions.get(repo) if normalization != MINMAX else None
+    # Normalization reads dataset-wide stats, so scoring the locations together equals scoring each alone
+    scored = score_locations(locations, stats, weights, Normalizer(normalization, stats, distribution))
+    return {
+        loc["location_id"]: {"location_id": loc["location_id"], "total_score": loc["total_score"], "features": loc["features"]}
+        for loc in scored
+    }
 
 @router.post("/scoring/explain/{location_id}", response_model=ExplainResponse)
 def explain_scoring(
@@ -90,34 +255,52 @@ def explain_scoring(
     db: duckdb.DuckDBPyConnection = Depends(get_db)
 ):
     """Provides a detailed breakdown of a specific location's score given the weights."""
-    repo = LocationRepository(db)
-    stats = repo.get_feature_stats()
-    
-    # We cheat slightly by pulling the specific location natively via duckdb,
-    # then running it through the normalizer as a list of 1.
-    query = f"SELECT * FROM read_parquet('{repo.DUMMY_DATA_FILE}') WHERE location_id = ?" if hasattr(repo, 'DUMMY_DATA_FILE') else f"SELECT * FROM read_parquet('backend/data/dummy_locations.parquet') WHERE location_id = ?"
-    try:
-        results = repo.conn.execute(query, [location_id]).fetchall()
-    except Exception:
-        # Fallback to absolute if needed
-        import os
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "dummy_locations.parquet")
-        query = f"SELECT * FROM read_parquet('{path}') WHERE location_id = ?"
-        results = repo.conn.execute(query, [location_id]).fetchall()
-        
-    if not results:
+    explained = _explain_locations(LocationRepository(db), [location_id], weights.weights, weights.normalization)
+    if location_id not in explained:
         raise HTTPException(status_code=404, detail="Location not found")
-        
-    columns = [desc[0] for desc in repo.conn.description]
-    loc_dict = dict(zip(columns, results[0]))
-    
-    # Score the single location
-    scored = score_locations([loc_dict], stats, weights.weights)[0]
-    
+    return explained[location_id]
+
+@router.post("/scoring/explain", response_model=ExplainBatchResponse)
+async def explain_scoring_batch(
+    request: ExplainBatchRequest,
+    x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache"),
+    cache: CacheClient = Depends(get_cache),
+    db: duckdb.DuckDBPyConnection = Depends(get_db)
+):
+    """
+    Score breakdowns for several locations at once. Each location is cached
+    under its own key, so overlapping batches share entries: the lookups are
+    one MGET and the new entries go out in one pipeline.
+    """
+    location_ids = list(dict.fromkeys(request.location_ids))
+    weights_hash = hash_payload(request.model_dump_json(include={"weights", "normalization"}))
+    # Every upsert bumps the unfiltered scope, whichever state the location is in
+    scopes = [ALL_STATES_SCOPE, STATS_SCOPE]
+    keys = {location_id: build_cache_key("explain", f"{weights_hash}:{location_id}", scopes) for location_id in location_ids}
+
+    explained = {}
+    if not x_bypass_cache:
+        with stage("cache_get"):
+            cached = await cache.get_many(list(keys.values()))
+        for location_id, value in zip(keys, cached):
+            if value is not None:
+                explained[location_id] = json.loads(value)
+            record_cache("explain", "hit" if value is not None else "miss")
+
+    misses = [location_id for location_id in location_ids if location_id not in explained]
+    if misses:
+        from fastapi.concurrency import run_in_threadpool
+        with stage("score_locations"):
+            fresh = await run_in_threadpool(
+                _explain_locations, LocationRepository(db), misses, request.weights, request.normalization
+            )
+        explained.update(fresh)
+        with stage("cache_set"):
+            cache.set_many_background({keys[location_id]: json.dumps(value) for location_id, value in fresh.items()})
+
     return {
-        "location_id": location_id,
-        "total_score": scored["total_score"],
-        "features": scored["features"]
+        "results": [explained[location_id] for location_id in location_ids if location_id in explained],
+        "missing": [location_id for location_id in location_ids if location_id not in explained]
     }
 
 def register_routes(app):
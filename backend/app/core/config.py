@@ -1,10 +1,54 @@
 # Purpose: App config
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.schemas import dataset as dataset_contract
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Locofinder API"
     VERSION: str = "0.1.0"
     REDIS_URL: str = "redis://localhost:6379"
+    # Connection pool tuning
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_KEEPALIVE: bool = True
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 1.0
+    # Per-call budget for cache operations; past it the request falls through to the DB
+    REDIS_OP_TIMEOUT_MS: float = 50.0
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0
+    # Cache keys embed the dataset version, so TTL only bounds memory, not staleness
+    CACHE_TTL_SECONDS: int = 86400
+    # Fold delta files into the base parquet once this many have accumulated
+    DELTA_COMPACTION_THRESHOLD: int = 20
+    # Stage timers, Server-Timing headers and /metrics; near-zero cost when off
+    METRICS_ENABLED: bool = True
+    # Repository queries at or over this duration are kept in the slow query log (0 disables)
+    SLOW_QUERY_THRESHOLD_MS: float = 500.0
+    SLOW_QUERY_LOG_SIZE: int = 200
+    PROFILER_MAX_SECONDS: int = 300
+    # Pre-publish validation; a failing dataset or upsert batch is never published
+    VALIDATION_ENABLED: bool = True
+    # Share of null/NaN/inf values tolerated per column (LocationBase fields are all required)
+    VALIDATION_MAX_NULL_RATE: float = 0.0
+    # Drift limits against the previous version; defaults shared with data-platform (app/schemas/dataset.py)
+    VALIDATION_MAX_RANGE_EXPANSION: float = dataset_contract.MAX_RANGE_EXPANSION
+    VALIDATION_MAX_MEAN_SHIFT: float = dataset_contract.MAX_MEAN_SHIFT
+    VALIDATION_MAX_STD_RATIO: float = dataset_contract.MAX_STD_RATIO
+    # Per-worker budget for precompressed response bodies (keyed by ETag, so never stale)
+    HTTP_BODY_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Bodies smaller than this are sent uncompressed; the framing overhead isn't worth it
+    HTTP_COMPRESS_MIN_BYTES: int = 512
+    # Async routes compress bodies at least this large in the threadpool instead of on the event loop
+    HTTP_COMPRESS_THREADPOOL_MIN_BYTES: int = 64 * 1024
+    # python -m app.serve: listen address and worker processes forked from one master
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    # Build the resident tables once in the master so forked workers share them copy-on-write
+    SERVER_PRELOAD: bool = True
+    # Startup fails if a worker hasn't finished its lifespan startup within this long
+    SERVER_READY_TIMEOUT_SECONDS: float = 60.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,200 @@
+# Purpose: Conditional GET (strong per-encoding ETags, 304s) and precompressed response bodies
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import brotli
+from fastapi import Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+IDENTITY = "identity"
+GZIP = "gzip"
+BROTLI = "br"
+
+# Past these levels the ratio barely moves while the CPU time climbs steeply
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def etag_for(cache_key: str) -> str:
+    """
+    Strong ETag for a response, before encoding. Cache keys already carry the
+    dataset version, the generations of the scopes the response reads and the
+    canonical query, so equal keys mean byte-identical bodies.
+    """
+    return f'"{hashlib.sha1(cache_key.encode("utf-8")).hexdigest()}"'
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    The ETag of one encoding of a body: a strong tag promises byte-identical
+    bodies, so gzip and brotli variants each get their own ("<sha>-br").
+    """
+    if encoding == IDENTITY:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+def _strip_encoding(tag: str) -> str:
+    for encoding in (GZIP, BROTLI):
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The If-None-Match tag naming any encoding of `etag`, as the client sent it
+    (W/ aside), or None. If-None-Match uses the weak comparison, and the
+    client's copy is valid whichever encoding it was sent in.
+    """
+    if not if_none_match:
+        return None
+    for tag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        if tag == "*":
+            return etag
+        if _strip_encoding(tag) == etag:
+            return tag
+    return None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    return matching_etag(if_none_match, etag) is not None
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Brotli if the client takes it, then gzip, else identity. q=0 rules an encoding out."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    for encoding in (BROTLI, GZIP):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return IDENTITY
+
+def encode_body(body: bytes, encoding: str) -> bytes:
+    if encoding == BROTLI:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == GZIP:
+        # mtime=0 keeps the bytes identical across workers
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+class EncodedBodyCache:
+    """
+    LRU of response bodies by (ETag, encoding), bounded by total bytes. Each
+    body is compressed at most once per encoding per worker; after that a
+    request costs a dict lookup, with no Redis round-trip or JSON work.
+    The ETag changes whenever the data does, so entries never need invalidating.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _store(self, key: Tuple[str, str], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _lookup(self, etag: str, encoding: str) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """(stored `encoding` body, stored identity body); either may be None."""
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+                return body, None
+            return None, self._entries.get((etag, IDENTITY))
+
+    def get(self, etag: str, encoding: str) -> Optional[Tuple[bytes, str]]:
+        """(body, encoding actually used), compressing from the stored identity body if needed."""
+        body, identity = self._lookup(etag, encoding)
+        if body is not None:
+            return body, encoding
+        if identity is None:
+            return None
+        return self.put(etag, identity, encoding)
+
+    async def get_async(self, etag: str, encoding: str) -> Optional[Tuple[bytes, str]]:
+        """get() for async routes: a body that still needs compressing goes through put_async()."""
+        body, identity = self._lookup(etag, encoding)
+        if body is not None:
+            return body, encoding
+        if identity is None:
+            return None
+        return await self.put_async(etag, identity, encoding)
+
+    def put(self, etag: str, body: bytes, encoding: str = IDENTITY) -> Tuple[bytes, str]:
+        """Store the identity body and its `encoding` variant; returns (body, encoding actually used)."""
+        if len(body) < settings.HTTP_COMPRESS_MIN_BYTES:
+            encoding = IDENTITY
+        encoded = encode_body(body, encoding)
+        with self._lock:
+            self._store((etag, IDENTITY), body)
+            if encoding != IDENTITY:
+                self._store((etag, encoding), encoded)
+        return encoded, encoding
+
+    async def put_async(self, etag: str, body: bytes, encoding: str = IDENTITY) -> Tuple[bytes, str]:
+        """put() for async routes: large bodies are compressed in the threadpool, off the event loop."""
+        if encoding != IDENTITY and len(body) >= settings.HTTP_COMPRESS_THREADPOOL_MIN_BYTES:
+            return await run_in_threadpool(self.put, etag, body, encoding)
+        return self.put(etag, body, encoding)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+# Global instance (one body cache per worker process)
+encoded_bodies = EncodedBodyCache(settings.HTTP_BODY_CACHE_MAX_BYTES)
+
+def _headers(etag: str) -> dict:
+    # no-cache: clients may keep the body but must revalidate, which is a cheap 304
+    return {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+def conditional_get(cache_key_dependency: Callable[..., str]) -> Callable[..., str]:
+    """
+    Dependency answering If-None-Match from the cache key alone. Declare it
+    before any DB or cache dependency: a match raises the 304 before those
+    are set up. Returns the cache key for the endpoint to use.
+    """
+    def dependency(
+        cache_key: str = Depends(cache_key_dependency),
+        if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+        x_bypass_cache: Optional[bool] = Header(False, alias="X-Bypass-Cache")
+    ) -> str:
+        if not x_bypass_cache:
+            # Echo the client's tag: it names the encoding the client holds
+            matched = matching_etag(if_none_match, etag_for(cache_key))
+            if matched:
+                raise HTTPException(status_code=304, headers=_headers(matched))
+        return cache_key
+    return dependency
+
+def encoded_response(etag: str, encoded: Tuple[bytes, str]) -> Response:
+    body, encoding = encoded
+    headers = _headers(encoded_etag(etag, encoding))
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,258 @@
+# Purpose: Lightweight hot-path instrumentation (stage timers, Server-Timing, Prometheus text)
+import time
+import threading
+import functools
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+# Per-request {stage: seconds}; the dict is shared by reference, so stages timed
+# inside run_in_threadpool (which copies the context) still land in it.
+_request_stages: ContextVar[Optional[dict]] = ContextVar("request_stages", default=None)
+_NOOP = nullcontext()
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000)
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def items(self) -> List[Tuple[tuple, float]]:
+        """(labels, value) pairs as of now. Scrapes run in the threadpool while requests inc(), so copy under the lock."""
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return "\n".join(lines)
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series[2] if series else 0
+
+    def items(self) -> List[Tuple[tuple, list]]:
+        """(labels, [bucket counts, sum, count]) pairs, copied under the lock like Counter.items()."""
+        with self._lock:
+            return [(key, [list(counts), total, count]) for key, (counts, total, count) in self._series.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines)
+
+REQUEST_SECONDS = Histogram("locofinder_request_seconds", "End-to-end request latency by route", LATENCY_BUCKETS)
+STAGE_SECONDS = Histogram("locofinder_stage_seconds", "Latency of each hot-path stage", LATENCY_BUCKETS)
+CACHE_REQUESTS = Counter("locofinder_cache_requests_total", "Cache lookups by namespace and result (hit/miss/bypass)")
+CACHE_FAILURES = Counter("locofinder_cache_failures_total", "Cache calls that failed open, by operation and reason")
+ROWS_SCANNED = Histogram("locofinder_rows_scanned", "Rows read from the dataset per request", ROW_BUCKETS)
+ROWS_RETURNED = Histogram("locofinder_rows_returned", "Rows returned to the client per request", ROW_BUCKETS)
+REGISTRY = [REQUEST_SECONDS, STAGE_SECONDS, CACHE_REQUESTS, CACHE_FAILURES, ROWS_SCANNED, ROWS_RETURNED]
+
+@contextmanager
+def _timed_stage(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + elapsed
+
+def stage(name: str):
+    """Context manager timing one stage of the current request. A no-op when metrics are disabled."""
+    if not settings.METRICS_ENABLED:
+        return _NOOP
+    return _timed_stage(name)
+
+def timed(name: str) -> Callable:
+    """Decorator form of stage(), for sync and async callables."""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_cache(namespace: str, result: str):
+    if settings.METRICS_ENABLED:
+        CACHE_REQUESTS.inc(namespace=namespace, result=result)
+
+def record_cache_failure(op: str, reason: str):
+    if settings.METRICS_ENABLED:
+        CACHE_FAILURES.inc(op=op, reason=reason)
+
+def record_rows(route: str, scanned: int, returned: int):
+    if settings.METRICS_ENABLED:
+        ROWS_SCANNED.observe(scanned, route=route)
+        ROWS_RETURNED.observe(returned, route=route)
+
+def render_metrics() -> str:
+    lines = [metric.render() for metric in REGISTRY]
+    hits = {}
+    # Pre-computed ratio for dashboards that don't want to write PromQL
+    for key, value in CACHE_REQUESTS.items():
+        labels = dict(key)
+        totals = hits.setdefault(labels["namespace"], [0.0, 0.0])
+        totals[1] += value
+        # local_hit: served from the worker's encoded body cache without asking Redis
+        if labels["result"] in ("hit", "local_hit"):
+            totals[0] += value
+    lines.append("# HELP locofinder_cache_hit_ratio Share of cache lookups served from cache\n# TYPE locofinder_cache_hit_ratio gauge")
+    for namespace, (hit, total) in sorted(hits.items()):
+        lines.append(f'locofinder_cache_hit_ratio{{namespace="{namespace}"}} {hit / total if total else 0.0}')
+    return "\n".join(lines) + "\n"
+
+def server_timing_header(stages: dict, total: float) -> str:
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+class InstrumentedRoute(APIRoute):
+    """
+    Times the endpoint body and, separately, FastAPI's response validation and
+    JSON encoding ("serialize"), which happen after the endpoint returns.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, self._mark_endpoint_done(endpoint), **kwargs)
+
+    @staticmethod
+    def _mark_endpoint_done(endpoint: Callable) -> Callable:
+        def mark():
+            stages = _request_stages.get()
+            if stages is not None:
+                stages["_endpoint_done"] = time.perf_counter()
+
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_endpoint(*args, **kwargs):
+                result = await endpoint(*args, **kwargs)
+                mark()
+                return result
+            return async_endpoint
+
+        @functools.wraps(endpoint)
+        def sync_endpoint(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            mark()
+            return result
+        return sync_endpoint
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def instrumented_handler(request):
+            if not settings.METRICS_ENABLED:
+                return await handler(request)
+
+            stages = _request_stages.get()
+            if stages is None:
+                stages = {}
+                _request_stages.set(stages)
+            stages["_route"] = route_path
+
+            response = await handler(request)
+            done = stages.pop("_endpoint_done", None)
+            if done is not None:
+                serialize = time.perf_counter() - done
+                stages["serialize"] = serialize
+                STAGE_SECONDS.observe(serialize, stage="serialize")
+            return response
+
+        return instrumented_handler
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: sets up per-request stage collection and emits Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stages: dict = {}
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                visible = {k: v for k, v in stages.items() if not k.startswith("_")}
+                header = server_timing_header(visible, time.perf_counter() - started)
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Label by route template; unrouted paths (404s) are grouped so arbitrary URLs can't blow up cardinality
+            route = stages.get("_route") or getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route=route)
+            _request_stages.reset(token)
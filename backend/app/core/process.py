@@ -0,0 +1,128 @@
+# Purpose: Process role, cold-start timings and memory usage (RSS/PSS) for the prefork server
+import os
+import time
+import logging
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger("locofinder")
+
+# "single": plain uvicorn or one in-process worker; "master"/"worker": app.serve prefork
+ROLE_SINGLE, ROLE_MASTER, ROLE_WORKER = "single", "master", "worker"
+
+# smaps_rollup fields reported, in kB
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+class ProcessState:
+    """
+    What this process is and how long it took to get going. The master fills
+    in its import and preload timings before forking, so every worker starts
+    with a copy of them and adds its own fork-to-ready time. Times use the
+    monotonic clock, which is system-wide, so a worker can measure from the
+    instant its master forked it.
+    """
+
+    def __init__(self):
+        self.role = ROLE_SINGLE
+        self.worker_index: Optional[int] = None
+        self.preloaded = False
+        self.ready = False
+        self.started_at = time.monotonic()
+        self.timings: Dict[str, float] = {}
+        self._ready_fd: Optional[int] = None
+
+    def record(self, name: str, ms: float) -> None:
+        self.timings[name] = round(ms, 3)
+
+    def become_master(self) -> None:
+        self.role = ROLE_MASTER
+
+    def become_worker(self, index: int, forked_at: float, ready_fd: Optional[int]) -> None:
+        """Called in the child right after fork."""
+        self.role = ROLE_WORKER
+        self.worker_index = index
+        self.started_at = forked_at
+        self.ready = False
+        self._ready_fd = ready_fd
+        if ready_fd is not None:
+            # A master that stopped listening must never block a worker's startup
+            os.set_blocking(ready_fd, False)
+
+    def mark_ready(self) -> float:
+        """Record the time to ready, log it, and tell the master (if any). Returns the ms."""
+        ms = (time.monotonic() - self.started_at) * 1000
+        self.record("ready_ms", ms)
+        self.ready = True
+        memory = memory_usage()
+        logger.info(
+            f"{self.role.capitalize()} {os.getpid()} ready in {ms:.1f} ms "
+            f"(rss {memory.get('rss_mb', 0.0):.1f} MB, pss {memory.get('pss_mb', 0.0):.1f} MB)"
+        )
+        if self._ready_fd is not None:
+            try:
+                # One short write, well under PIPE_BUF, so lines from workers never interleave
+                os.write(self._ready_fd, f"{os.getpid()} {ms:.3f}\n".encode("ascii"))
+            except OSError as e:
+                logger.warning(f"Could not report readiness to the master: {e}")
+            finally:
+                os.close(self._ready_fd)
+                self._ready_fd = None
+        return ms
+
+    def snapshot(self) -> dict:
+        return {
+            "role": self.role,
+            "pid": os.getpid(),
+            "worker_index": self.worker_index,
+            "preloaded": self.preloaded,
+            "ready": self.ready,
+            "uptime_s": round(time.monotonic() - self.started_at, 3),
+            "timings_ms": dict(self.timings),
+        }
+
+def parse_smaps_rollup(text: str) -> Dict[str, float]:
+    """rss/pss/shared/private in MB from /proc/<pid>/smaps_rollup content."""
+    kb = dict.fromkeys(_SMAPS_FIELDS, 0)
+    for line in text.splitlines():
+        name, _, rest = line.partition(":")
+        if name in kb:
+            kb[name] = int(rest.split()[0])
+    return {
+        "rss_mb": round(kb["Rss"] / 1024, 2),
+        "pss_mb": round(kb["Pss"] / 1024, 2),
+        "shared_mb": round((kb["Shared_Clean"] + kb["Shared_Dirty"]) / 1024, 2),
+        "private_mb": round((kb["Private_Clean"] + kb["Private_Dirty"]) / 1024, 2),
+    }
+
+def memory_usage(pid: Union[int, str] = "self") -> Dict[str, float]:
+    """
+    Memory of a process in MB. PSS (each shared page divided among the
+    processes mapping it) is the honest per-worker cost under copy-on-write:
+    summed over the workers it gives the real footprint, where summed RSS
+    counts the shared pages once per worker. Linux only for PSS; elsewhere
+    falls back to RSS, and for this process to peak RSS.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            return parse_smaps_rollup(f.read())
+    except OSError:
+        pass
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return {"rss_mb": round(int(line.split()[1]) / 1024, 2)}
+    except OSError:
+        pass
+    if pid == "self":
+        try:
+            import resource
+            import sys
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kB on Linux, bytes on macOS
+            return {"max_rss_mb": round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)}
+        except ImportError:
+            pass
+    return {}
+
+# Global instance (one per process; a forked worker starts from the master's copy)
+process_state = ProcessState()
@@ -0,0 +1,121 @@
+# Purpose: Production diagnostics (on-demand sampling profiler, slow query log)
+import sys
+import time
+import threading
+import logging
+from collections import Counter as StackCounter, deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("locofinder")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+class SamplingProfiler:
+    """
+    Wall-clock sampler over every thread in this worker. A background thread
+    snapshots sys._current_frames() at a fixed interval, so nothing is
+    installed on the profiled code path and overhead is bounded by the rate.
+    Output is the collapsed-stack format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: StackCounter = StackCounter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval: float) -> bool:
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = StackCounter()
+            self.samples = 0
+            self._stop.clear()
+            self.started_at = time.time()
+            self.finished_at = None
+            self._thread = threading.Thread(target=self._run, args=(seconds, interval), name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Sampling profiler started for {seconds}s at {interval * 1000:.1f}ms intervals")
+        return True
+
+    def stop(self) -> str:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        return self.collapsed()
+
+    def _run(self, seconds: float, interval: float):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(interval)
+        self.finished_at = time.time()
+        logger.info(f"Sampling profiler finished with {self.samples} samples")
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "samples": self.samples,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class SlowQueryLog:
+    """Bounded in-memory log of repository queries slower than SLOW_QUERY_THRESHOLD_MS."""
+
+    def __init__(self):
+        self._entries = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, params: list, duration_ms: float, rows: int, plan: Optional[str] = None):
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "sql": sql,
+            "params": [p if isinstance(p, (int, float, str, bool)) or p is None else str(p) for p in params],
+            "explain_analyze": plan
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(f"Slow query ({duration_ms:.1f}ms, {rows} rows): {sql}")
+
+    def entries(self, limit: int) -> List[dict]:
+        with self._lock:
+            return list(self._entries)[-limit:][::-1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Global instances (one per worker process)
+profiler = SamplingProfiler()
+slow_query_log = SlowQueryLog()
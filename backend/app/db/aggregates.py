@@ -0,0 +1,108 @@
+# Purpose: Resident per-state and per-county aggregates (materialized in worker memory)
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import duckdb
+
+from app.db import dataset_store
+from app.db.connection import get_connection
+from app.db.dataset_version import get_dataset_version
+from app.db.repositories import LocationRepository
+
+logger = logging.getLogger("locofinder")
+
+class RegionAggregates:
+    """
+    Aggregates by state and by county, held in this worker's memory. Checking
+    freshness costs two stat() calls (version file and manifest). When upserts
+    have bumped some state generations, only those states are recomputed; a
+    dataset version change (a full reset) rebuilds everything.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._generations: Dict[str, int] = {}
+        self._states: Dict[str, dict] = {}
+        self._counties: Dict[str, List[dict]] = {}
+        self._state_list: List[dict] = []
+        self._county_list: List[dict] = []
+
+    def is_stale(self) -> bool:
+        return (
+            get_dataset_version() != self._version
+            or dataset_store.read_manifest()["generations"] != self._generations
+        )
+
+    def _changed_states(self, generations: Dict[str, int]) -> List[str]:
+        scopes = set(generations) | set(self._generations)
+        return sorted(
+            scope.split(":", 1)[1] for scope in scopes
+            if scope.startswith("state:") and scope != dataset_store.ALL_STATES_SCOPE
+            and generations.get(scope, 0) != self._generations.get(scope, 0)
+        )
+
+    def refresh(self, conn: Optional[duckdb.DuckDBPyConnection] = None) -> None:
+        """Recompute if stale. Opens its own connection when none is given, so readers never need one."""
+        with self._lock:
+            # Read before computing: a write landing mid-refresh leaves the
+            # table marked stale, so it is picked up by the next call
+            version = get_dataset_version()
+            generations = dict(dataset_store.read_manifest()["generations"])
+            if version == self._version and generations == self._generations:
+                return
+
+            if version != self._version:
+                refreshed = None
+                states, counties = {}, {}
+            else:
+                refreshed = self._changed_states(generations)
+                states, counties = dict(self._states), dict(self._counties)
+                for state in refreshed:
+                    states.pop(state, None)
+                    counties.pop(state, None)
+            own = conn is None
+            conn = get_connection() if own else conn
+            try:
+                rows = LocationRepository(conn).compute_region_aggregates(refreshed)
+            finally:
+                if own:
+                    conn.close()
+
+            for row in rows:
+                if row["county"] is None:
+                    states[row["state"]] = row
+                else:
+                    counties.setdefault(row["state"], []).append(row)
+            for state in refreshed if refreshed is not None else list(counties):
+                if state in counties:
+                    counties[state].sort(key=lambda r: r["county"])
+
+            # Swap everything in at once; readers never take the lock
+            self._states, self._counties = states, counties
+            self._state_list = [states[s] for s in sorted(states)]
+            self._county_list = [row for s in sorted(counties) for row in counties[s]]
+            self._version, self._generations = version, generations
+            logger.info(f"Refreshed region aggregates for {'all states' if refreshed is None else refreshed}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._generations = {}
+            self._states, self._counties = {}, {}
+            self._state_list, self._county_list = [], []
+
+    def by_state(self, state: Optional[str] = None) -> List[dict]:
+        if state:
+            row = self._states.get(state)
+            return [row] if row else []
+        return self._state_list
+
+    def by_county(self, state: Optional[str] = None) -> List[dict]:
+        if state:
+            return self._counties.get(state, [])
+        return self._county_list
+
+# Global instance (one table per worker process)
+region_aggregates = RegionAggregates()
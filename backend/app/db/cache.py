@@ -0,0 +1,119 @@
+# Purpose: Redis-backed response caching (key construction and a fail-open, batched cache client)
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from fastapi import Depends
+from app.core.config import settings
+from app.core.metrics import record_cache_failure
+from app.db.circuit_breaker import CircuitBreaker, cache_breaker
+from app.db import dataset_store
+from app.db.dataset_version import get_dataset_version
+from app.db.redis import get_redis
+
+logger = logging.getLogger("locofinder")
+
+def build_cache_key(namespace: str, query: str, scopes: List[str] = ()) -> str:
+    """
+    Keys are prefixed with the dataset version plus the generation of every
+    scope the response depends on. A full rewrite bumps the version and orphans
+    everything; a delta upsert only bumps the scopes it touched. Orphaned keys
+    simply age out via TTL.
+    """
+    generations = "".join(f".{dataset_store.get_generation(scope)}" for scope in scopes)
+    return f"v{get_dataset_version()}{generations}:{namespace}:{query}"
+
+def hash_payload(payload: str) -> str:
+    # Python's hash() is salted per process, which breaks sharing across workers
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+_pending_writes: Set[asyncio.Task] = set()
+
+class CacheClient:
+    """
+    Fail-open wrapper over the redis.asyncio client. Every call has a tight
+    timeout and goes through the circuit breaker; on timeout, error, open
+    breaker or missing pool, reads return misses and writes are dropped, so
+    callers simply fall through to the DB. Multi-key operations cost one
+    round-trip: reads use MGET, writes go through a non-transactional pipeline.
+    """
+
+    def __init__(self, redis: Optional["redis.Redis"], breaker: CircuitBreaker = cache_breaker):
+        self.redis = redis
+        self.breaker = breaker
+
+    async def _call(self, op: str, awaitable_factory: Callable[[], Awaitable], fallback):
+        if self.redis is None:
+            record_cache_failure(op, "not_initialized")
+            return fallback
+        if not self.breaker.allow():
+            record_cache_failure(op, "circuit_open")
+            return fallback
+        recorded = False
+        try:
+            result = await asyncio.wait_for(awaitable_factory(), timeout=settings.REDIS_OP_TIMEOUT_MS / 1000)
+        except Exception as e:
+            self.breaker.record_failure()
+            recorded = True
+            reason = "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+            record_cache_failure(op, reason)
+            logger.warning(f"Redis {op} failed ({reason}), falling back: {e}")
+            return fallback
+        else:
+            self.breaker.record_success()
+            recorded = True
+            return result
+        finally:
+            # CancelledError is not an Exception; without this a cancelled probe
+            # would leave the breaker half-open with a probe "in flight" forever
+            if not recorded:
+                self.breaker.record_abandoned()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._call("get", lambda: self.redis.get(key), None)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        await self._call("setex", lambda: self.redis.setex(key, ttl or settings.CACHE_TTL_SECONDS, value), None)
+
+    def set_background(self, key: str, value: str, ttl: Optional[int] = None):
+        """Fire-and-forget write: the response never waits on Redis."""
+        _in_background(self.set(key, value, ttl))
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """Values in key order, None for misses."""
+        if not keys:
+            return []
+        return await self._call("mget", lambda: self.redis.mget(list(keys)), [None] * len(keys))
+
+    async def set_many(self, items: Dict[str, str], ttl: Optional[int] = None):
+        if not items:
+            return
+        ttl = ttl or settings.CACHE_TTL_SECONDS
+
+        def pipelined():
+            # MSET can't carry a TTL, so pipeline the SETEXs instead
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, value)
+            return pipe.execute()
+
+        await self._call("pipeline", pipelined, None)
+
+    def set_many_background(self, items: Dict[str, str], ttl: Optional[int] = None):
+        """Fire-and-forget set_many()."""
+        if items:
+            _in_background(self.set_many(items, ttl))
+
+def _in_background(write: Awaitable) -> None:
+    task = asyncio.get_running_loop().create_task(write)
+    # The loop only keeps weak references to tasks
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+async def drain_pending_writes():
+    """Wait for in-flight background writes (used at shutdown)."""
+    if _pending_writes:
+        await asyncio.gather(*list(_pending_writes), return_exceptions=True)
+
+async def get_cache(redis: Optional["redis.Redis"] = Depends(get_redis)) -> AsyncIterator[CacheClient]:
+    yield CacheClient(redis)
@@ -0,0 +1,110 @@
+# Purpose: Circuit breaker guarding cache calls, so a slow or dead Redis never adds latency
+import time
+import threading
+import logging
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("locofinder")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    closed    -> calls go through; `failure_threshold` consecutive failures open it.
+    open      -> calls are skipped outright until `reset_timeout` has passed.
+    half_open -> exactly one probe call is let through; success closes the
+                 breaker, failure re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.total_failures = 0
+        self.total_short_circuits = 0
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.total_short_circuits += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed after a successful probe")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self.total_failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} consecutive failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def record_abandoned(self):
+        """
+        A call that was let through ended with no outcome (cancelled by a client
+        disconnect or shutdown). Nothing is learned about Redis, but if it was
+        the probe, the next call must be allowed to probe instead.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "total_failures": self.total_failures,
+                "short_circuited_calls": self.total_short_circuits,
+                "seconds_until_probe": (
+                    max(0.0, round(self.reset_timeout - (time.monotonic() - self._opened_at), 2))
+                    if self._state == OPEN else None
+                )
+            }
+
+# Global instance (one Redis per worker process)
+cache_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.REDIS_BREAKER_RESET_SECONDS
+)
@@ -0,0 +1,207 @@
+# Purpose: Versioned location store (base parquet + upserted delta files + manifest)
+import os
+import json
+import logging
+import functools
+from typing import Dict, List, Optional
+
+import duckdb
+
+from app.db.connection import DATA_DIR, DUMMY_DATA_FILE
+from app.schemas.dataset import LOCATION_COLUMNS
+
+logger = logging.getLogger("locofinder")
+
+BASE_FILE = DUMMY_DATA_FILE
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+# Feature distributions (mean/std, quantile grid), computed by writers and only loaded by workers
+DISTRIBUTION_FILE = os.path.join(DATA_DIR, "distribution.json")
+DELTA_DIR = os.path.join(DATA_DIR, "deltas")
+
+@functools.lru_cache(maxsize=None)
+def location_schema() -> dict:
+    """
+    Polars dtypes per column, from the shared LOCATION_COLUMNS. Built on first
+    use: polars is only needed on the write path, so read-only workers never
+    import it.
+    """
+    import polars as pl
+    dtypes = {"string": pl.String, "float": pl.Float64, "int": pl.Int64}
+    return {name: dtypes[kind] for name, kind in LOCATION_COLUMNS.items()}
+
+# Cache scopes: responses are keyed by the generations of the scopes they read
+ALL_STATES_SCOPE = "state:*"
+STATS_SCOPE = "stats"
+
+def state_scope(state: Optional[str]) -> str:
+    return f"state:{state}" if state else ALL_STATES_SCOPE
+
+# (raw bytes, parsed manifest), swapped as one tuple so threads never pair one file's bytes with another's parse
+_cached = {"entry": (None, None)}
+
+def _empty_manifest() -> dict:
+    return {"deltas": [], "retired": [], "next_delta": 1, "stats": None, "generations": {}, "profile": None}
+
+def read_manifest() -> dict:
+    """
+    Manifest as last published. The file is small and read on every call, but
+    only parsed when its bytes change. Stat metadata can't be trusted for this:
+    a replace may reuse a freed inode and land a same-size file within one
+    mtime tick.
+    """
+    try:
+        with open(MANIFEST_FILE, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return _empty_manifest()
+
+    cached_raw, manifest = _cached["entry"]
+    if raw != cached_raw:
+        manifest = json.loads(raw)
+        _cached["entry"] = (raw, manifest)
+    return manifest
+
+def write_manifest(manifest: dict) -> None:
+    """Publish a new manifest. Callers must hold dataset_write_lock()."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = f"{MANIFEST_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def has_data() -> bool:
+    return os.path.exists(BASE_FILE)
+
+def delta_paths(manifest: Optional[dict] = None) -> List[str]:
+    manifest = manifest or read_manifest()
+    return [os.path.join(DELTA_DIR, name) for name in manifest["deltas"]]
+
+def _retire_deltas(manifest: dict) -> None:
+    # Files dropped from the manifest may still be named in a query another worker
+    # is building right now, so they are only deleted one publish later.
+    for name in manifest.get("retired", []):
+        path = os.path.join(DELTA_DIR, name)
+        if os.path.exists(path):
+            os.remove(path)
+    manifest["retired"] = manifest["deltas"]
+    manifest["deltas"] = []
+
+def source_relation(manifest: Optional[dict] = None) -> str:
+    """
+    SQL relation over the current dataset. Delta rows replace base rows with the
+    same location_id, and among deltas the newest file wins. Delta names are
+    zero-padded, so ordering by filename is ordering by publish time.
+    """
+    base = f"read_parquet('{BASE_FILE}')"
+    deltas = delta_paths(manifest)
+    if not deltas:
+        return base
+
+    delta_list = ", ".join(f"'{p}'" for p in deltas)
+    deltas_rel = f"read_parquet([{delta_list}], filename=true)"
+    return (
+        f"(SELECT * FROM {base} "
+        f"WHERE location_id NOT IN (SELECT location_id FROM {deltas_rel}) "
+        f"UNION ALL "
+        f"SELECT * EXCLUDE (filename) FROM {deltas_rel} "
+        f"QUALIFY row_number() OVER (PARTITION BY location_id ORDER BY filename DESC) = 1)"
+    )
+
+def get_generation(scope: str) -> int:
+    return read_manifest()["generations"].get(scope, 0)
+
+def get_stats() -> Optional[Dict[str, Dict[str, float]]]:
+    """Feature stats maintained by incremental writes, or None if never computed."""
+    return read_manifest()["stats"]
+
+def get_profile() -> Optional[dict]:
+    """Validation profile (row count, per-feature min/max/mean/std) recorded when the base was published."""
+    return read_manifest().get("profile")
+
+def _read_distribution_file() -> List[dict]:
+    try:
+        with open(DISTRIBUTION_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def get_distribution(version: int, generation: int) -> Optional[Dict[str, dict]]:
+    """Feature distribution published for this dataset version and unfiltered-scope generation, or None."""
+    for entry in _read_distribution_file():
+        if (entry["version"], entry["generation"]) == (version, generation):
+            return entry["features"]
+    return None
+
+def publish_distribution(version: int, generation: int, features: Dict[str, dict]) -> None:
+    """
+    Store the feature distribution for a dataset state, keeping the previous
+    one so workers still on the old state mid-write keep finding theirs.
+    Callers must hold dataset_write_lock().
+    """
+    entries = [entry for entry in _read_distribution_file() if (entry["version"], entry["generation"]) != (version, generation)]
+    entries = entries[-1:] + [{"version": version, "generation": generation, "features": features}]
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = f"{DISTRIBUTION_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+    os.replace(tmp_path, DISTRIBUTION_FILE)
+
+def write_delta(rows: List[dict]) -> str:
+    """
+    Write rows to a new delta file and publish it in the manifest.
+    Callers must hold dataset_write_lock().
+    """
+    manifest = dict(read_manifest())
+    name = f"delta-{manifest['next_delta']:06d}.parquet"
+    os.makedirs(DELTA_DIR, exist_ok=True)
+
+    import polars as pl
+    df = pl.DataFrame(rows, schema=location_schema())
+    df.write_parquet(os.path.join(DELTA_DIR, name))
+
+    manifest["deltas"] = manifest["deltas"] + [name]
+    manifest["next_delta"] = manifest["next_delta"] + 1
+    write_manifest(manifest)
+    return name
+
+def publish_stats(stats: Dict[str, Dict[str, float]], bumped_scopes: List[str]) -> None:
+    """Store new stats and bump the generation of every cache scope the write touched."""
+    manifest = dict(read_manifest())
+    generations = dict(manifest["generations"])
+    for scope in bumped_scopes:
+        generations[scope] = generations.get(scope, 0) + 1
+    manifest["stats"] = stats
+    manifest["generations"] = generations
+    write_manifest(manifest)
+
+def compact(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Fold all deltas into the base file. Callers must hold dataset_write_lock().
+    The base is replaced before the manifest drops the deltas; re-applying a
+    delta on top of a base that already contains it is a no-op, so readers
+    never observe a wrong result in between.
+    """
+    manifest = dict(read_manifest())
+    if not manifest["deltas"]:
+        return
+
+    tmp_path = f"{BASE_FILE}.{os.getpid()}.tmp"
+    conn.execute(f"COPY (SELECT * FROM {source_relation(manifest)}) TO '{tmp_path}' (FORMAT PARQUET)")
+    os.replace(tmp_path, BASE_FILE)
+
+    compacted = len(manifest["deltas"])
+    _retire_deltas(manifest)
+    write_manifest(manifest)
+    logger.info(f"Compacted {compacted} delta files into {BASE_FILE}")
+
+def reset(profile: Optional[dict] = None) -> None:
+    """
+    Drop deltas and derived stats after the base file was regenerated wholesale,
+    recording the new base's validation profile as the next drift baseline.
+    Callers must hold dataset_write_lock().
+    """
+    manifest = dict(read_manifest())
+    _retire_deltas(manifest)
+    manifest["stats"] = None
+    manifest["profile"] = profile
+    write_manifest(manifest)
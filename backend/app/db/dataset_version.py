@@ -0,0 +1,94 @@
+# Purpose: Dataset version counter used to namespace cached responses
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.db.connection import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("locofinder")
+VERSION_FILE = os.path.join(DATA_DIR, "dataset_version")
+LOCK_FILE = VERSION_FILE + ".lock"
+
+_lock = threading.Lock()
+
+def _read_version_file() -> int:
+    try:
+        with open(VERSION_FILE, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def get_dataset_version() -> int:
+    """
+    Current dataset version, so a bump from any worker is seen immediately.
+    The file holds nothing but the counter, so it is read on every call rather
+    than cached behind stat() metadata, which a replace can leave unchanged
+    (reused inode, same size, same mtime tick).
+    """
+    return _read_version_file()
+
+def _lock_file(fd: int) -> None:
+    # The OS drops the lock when its holder exits, so a crashed writer can't wedge
+    # writes and nobody ever has to guess whether a holder is still alive
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            # Windows dev boxes: LK_LOCK retries for ~10s before raising, so keep waiting
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+def _unlock_file(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def dataset_write_lock() -> Iterator[None]:
+    """
+    Serializes dataset writers across threads and worker processes. Held for
+    as long as the write takes (validation, compaction included); the lock
+    file itself is never deleted, only locked.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with _lock:
+        fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR)
+        try:
+            _lock_file(fd)
+            try:
+                yield
+            finally:
+                _unlock_file(fd)
+        finally:
+            os.close(fd)
+
+def bump_dataset_version(locked: bool = False) -> int:
+    """
+    Atomically increment the dataset version. Call after every data write.
+    Pass locked=True when already holding dataset_write_lock().
+    """
+    if not locked:
+        with dataset_write_lock():
+            return bump_dataset_version(locked=True)
+
+    new_version = _read_version_file() + 1
+    tmp_path = f"{VERSION_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(new_version))
+    os.replace(tmp_path, VERSION_FILE)
+
+    logger.info(f"Dataset version bumped to {new_version}")
+    return new_version
@@ -0,0 +1,75 @@
+# Purpose: Resident per-feature distributions (mean/std, quantile grid) for z-score and percentile scoring
+import logging
+import threading
+from typing import Optional, Tuple
+
+from app.db import dataset_store
+from app.db.dataset_version import dataset_write_lock, get_dataset_version
+from app.db.repositories import LocationRepository
+from app.scoring.normalization import QUANTILE_POINTS
+
+logger = logging.getLogger("locofinder")
+
+def _current_key() -> Tuple[int, int]:
+    return get_dataset_version(), dataset_store.get_generation(dataset_store.ALL_STATES_SCOPE)
+
+def publish_feature_distribution(repo: LocationRepository, version: int, generation: int) -> dict:
+    """
+    Compute the distribution of the dataset as it stands at (version,
+    generation) and publish it for every worker to load. Runs on the write
+    path, once per write, instead of once per worker after every write.
+    Callers must hold dataset_write_lock().
+    """
+    features = repo.compute_feature_distribution(QUANTILE_POINTS)
+    dataset_store.publish_distribution(version, generation, features)
+    logger.info(f"Published feature distributions for dataset version {version}, generation {generation}")
+    return features
+
+def ensure_feature_distribution(repo: LocationRepository) -> None:
+    """
+    Publish the distribution for the current dataset if no writer has, e.g.
+    data generated outside the app or a data dir from before the sidecar.
+    Called at startup (once, in the prefork master).
+    """
+    with dataset_write_lock():
+        version, generation = _current_key()
+        if dataset_store.get_distribution(version, generation) is None:
+            publish_feature_distribution(repo, version, generation)
+
+class FeatureDistributions:
+    """
+    The dataset-wide distribution of every scorable feature, held in this
+    worker's memory. Writers publish it next to the manifest, keyed by dataset
+    version and unfiltered-scope generation (every upsert bumps it), so a
+    worker only loads it when that key moves. Percentile normalization
+    interpolates in the stored quantile grid, so no request ever sorts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[int, int]] = None
+        self._distribution: dict = {}
+
+    def get(self, repo: LocationRepository) -> dict:
+        key = _current_key()
+        if key == self._key:
+            return self._distribution
+        with self._lock:
+            key = _current_key()
+            if key != self._key:
+                distribution = dataset_store.get_distribution(*key)
+                if distribution is None:
+                    # Nothing published for this dataset; the scan stays in this worker
+                    logger.warning(f"No published feature distributions for dataset version {key[0]}, generation {key[1]}; computing locally")
+                    distribution = repo.compute_feature_distribution(QUANTILE_POINTS)
+                self._distribution = distribution
+                self._key = key
+            return self._distribution
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._distribution = {}
+
+# Global instance (one per worker process)
+feature_distributions = FeatureDistributions()
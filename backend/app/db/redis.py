@@ -1,7 +1,8 @@
 # Purpose: Redis connection management
 import redis.asyncio as redis
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 import logging
+from app.core.config import settings
 
 logger = logging.getLogger("locofinder")
 
@@ -10,8 +11,20 @@ class RedisClient:
         self.pool = None
 
     def init_pool(self, url: str):
-        self.pool = redis.from_url(url, decode_responses=True)
-        logger.info(f"Initialized Redis pool at {url}")
+        # Blocking pool: at max_connections, callers wait for a free socket
+        # (up to the socket timeout) instead of failing with "Too many connections"
+        connection_pool = redis.BlockingConnectionPool.from_url(
+            url,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT
+        )
+        self.pool = redis.Redis.from_pool(connection_pool)
+        logger.info(f"Initialized Redis pool at {url} (max_connections={settings.REDIS_MAX_CONNECTIONS})")
 
     async def close(self):
         if self.pool:
@@ -30,7 +43,6 @@ class RedisClient:
 # Global instance
 redis_client = RedisClient()
 
-async def get_redis() -> AsyncIterator[redis.Redis]:
-    if not redis_client.pool:
-        raise RuntimeError("Redis pool not initialized")
+async def get_redis() -> AsyncIterator[Optional[redis.Redis]]:
+    # A missing pool is treated like an unreachable Redis: callers fail open
     yield redis_client.pool
@@ -1,23 +1,53 @@
 # Purpose: DB repositories for Data Access
 import duckdb
+import time
 from typing import List, Tuple, Optional, Dict
-from app.db.connection import DUMMY_DATA_FILE
-import os
+from app.core.config import settings
+from app.core.profiling import slow_query_log
+from app.db import dataset_store
+from app.schemas.dataset import STAT_FEATURES
 import logging
 
 logger = logging.getLogger("locofinder")
 
+AGGREGATE_QUANTILES = [0.25, 0.5, 0.75, 0.9]
+
 class LocationRepository:
     def __init__(self, conn: duckdb.DuckDBPyConnection):
         self.conn = conn
 
+    def _execute(self, query: str, params: Optional[list] = None) -> Tuple[List[tuple], List[str]]:
+        """Run a query and fetch all rows; queries over SLOW_QUERY_THRESHOLD_MS go to the slow query log"""
+        params = params or []
+        started = time.perf_counter()
+        results = self.conn.execute(query, params).fetchall()
+        columns = [desc[0] for desc in self.conn.description]
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0 and duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_query_log.record(query, params, duration_ms, len(results))
+        return results, columns
+
+    def explain_analyze(self, query: str, params: list) -> Optional[str]:
+        """
+        Re-runs a query under EXPLAIN ANALYZE. Only ever called from the slow
+        query endpoint, never inside the request that was slow: that would
+        double the cost of exactly the slowest requests.
+        """
+        try:
+            plan_rows = self.conn.execute(f"EXPLAIN ANALYZE {query}", params).fetchall()
+            return "\n".join(str(row[-1]) for row in plan_rows)
+        except Exception as e:
+            logger.warning(f"EXPLAIN ANALYZE failed for slow query: {e}")
+            return None
+
     def get_locations(self, state: Optional[str], offset: int, limit: int) -> Tuple[List[dict], int]:
-        if not os.path.exists(DUMMY_DATA_FILE):
-            logger.error(f"Cannot query. {DUMMY_DATA_FILE} is missing.")
+        if not dataset_store.has_data():
+            logger.error(f"Cannot query. {dataset_store.BASE_FILE} is missing.")
             return [], 0
 
-        base_query = f"FROM read_parquet('{DUMMY_DATA_FILE}')"
-        
+        base_query = f"FROM {dataset_store.source_relation()}"
+
         where_clause = ""
         params = []
         if state:
@@ -25,24 +55,22 @@ class LocationRepository:
             params.append(state)
 
         count_query = f"SELECT count(*) {base_query} {where_clause}"
-        total = self.conn.execute(count_query, params).fetchone()[0]
+        total = self._execute(count_query, params)[0][0][0]
 
         data_query = f"SELECT * {base_query} {where_clause} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         
-        results = self.conn.execute(data_query, params).fetchall()
-        
-        columns = [desc[0] for desc in self.conn.description]
+        results, columns = self._execute(data_query, params)
         locations = [dict(zip(columns, row)) for row in results]
         
         return locations, total
 
     def get_all_locations_for_scoring(self, filters: dict) -> List[dict]:
         """Fetch unpaginated bulk list of locations matching hard constraints"""
-        if not os.path.exists(DUMMY_DATA_FILE):
+        if not dataset_store.has_data():
             return []
             
-        base_query = f"FROM read_parquet('{DUMMY_DATA_FILE}')"
+        base_query = f"FROM {dataset_store.source_relation()}"
         conditions = []
         params = []
         
@@ -67,16 +95,36 @@ class LocationRepository:
             where_clause = "WHERE " + " AND ".join(conditions)
 
         data_query = f"SELECT * {base_query} {where_clause}"
-        results = self.conn.execute(data_query, params).fetchall()
-        columns = [desc[0] for desc in self.conn.description]
+        results, columns = self._execute(data_query, params)
+        return [dict(zip(columns, row)) for row in results]
+
+    def get_locations_by_ids(self, location_ids: List[str]) -> List[dict]:
+        if not dataset_store.has_data() or not location_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in location_ids)
+        query = f"SELECT * FROM {dataset_store.source_relation()} WHERE location_id IN ({placeholders})"
+        results, columns = self._execute(query, list(location_ids))
         return [dict(zip(columns, row)) for row in results]
 
+    def get_location_by_id(self, location_id: str) -> Optional[dict]:
+        rows = self.get_locations_by_ids([location_id])
+        return rows[0] if rows else None
+
     def get_feature_stats(self) -> Dict[str, Dict[str, float]]:
         """Extract min/max of key numerical columns for normalization"""
-        if not os.path.exists(DUMMY_DATA_FILE):
+        if not dataset_store.has_data():
             return {}
 
-        features = ["median_income", "crime_index", "growth_index", "home_price", "rent_price"]
+        # Incremental writes keep the stats up to date in the manifest, avoiding a scan
+        stats = dataset_store.get_stats()
+        if stats:
+            return stats
+        return self.compute_feature_stats()
+
+    def compute_feature_stats(self, features: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Full-scan min/max of the given features (all stat features by default)"""
+        features = features or STAT_FEATURES
         stats = {}
         
         # Build a single query to get MIN and MAX for all features at once for performance
@@ -84,11 +132,12 @@ class LocationRepository:
         for feat in features:
             selects.append(f"MIN({feat}) as {feat}_min, MAX({feat}) as {feat}_max")
             
-        query = f"SELECT {', '.join(selects)} FROM read_parquet('{DUMMY_DATA_FILE}')"
+        query = f"SELECT {', '.join(selects)} FROM {dataset_store.source_relation()}"
         
-        row = self.conn.execute(query).fetchone()
+        results, _ = self._execute(query)
+        row = results[0] if results else None
         
-        if not row:
+        if not row or row[0] is None:
             return {}
             
         # Map row tuple back to dict { feature_name: {min, max} }
@@ -100,3 +149,93 @@ class LocationRepository:
             
         return stats
 
+    def compute_region_aggregates(self, states: Optional[List[str]] = None) -> List[dict]:
+        """
+        Count plus mean/min/max/quartiles/p90 of every stat feature, per state
+        and per (state, county), in one grouped scan. Limited to `states` when given.
+        """
+        if not dataset_store.has_data():
+            return []
+
+        selects = []
+        for feat in STAT_FEATURES:
+            selects.append(
+                f"AVG({feat}), MIN({feat}), MAX({feat}), "
+                f"quantile_cont({feat}, [{', '.join(str(q) for q in AGGREGATE_QUANTILES)}])"
+            )
+
+        where_clause = ""
+        params = []
+        if states is not None:
+            if not states:
+                return []
+            where_clause = f"WHERE state IN ({', '.join('?' for _ in states)})"
+            params = list(states)
+
+        query = (
+            f"SELECT state, CASE WHEN grouping(county) = 1 THEN NULL ELSE county END, count(*), {', '.join(selects)} "
+            f"FROM {dataset_store.source_relation()} {where_clause} "
+            f"GROUP BY GROUPING SETS ((state), (state, county))"
+        )
+        results, _ = self._execute(query, params)
+
+        regions = []
+        for row in results:
+            features = {}
+            for i, feat in enumerate(STAT_FEATURES):
+                mean, low, high, quantiles = row[3 + i * 4: 7 + i * 4]
+                features[feat] = {
+                    "mean": float(mean),
+                    "min": float(low),
+                    "max": float(high),
+                    **{f"p{int(q * 100)}": float(v) for q, v in zip(AGGREGATE_QUANTILES, quantiles)}
+                }
+            regions.append({"state": row[0], "county": row[1], "count": int(row[2]), "features": features})
+        return regions
+
+    def get_place_names(self) -> List[tuple]:
+        """
+        Distinct places for typeahead: (name, kind, state, county, population,
+        locations, top_location_id) per (city, state) and per (county, state),
+        population summed over their locations. Cities carry their most
+        populous location's county and id; counties carry neither.
+        """
+        if not dataset_store.has_data():
+            return []
+
+        source = dataset_store.source_relation()
+        query = (
+            f"SELECT city, 'city', state, arg_max(county, population), SUM(population)::BIGINT, count(*), "
+            f"arg_max(location_id, population) FROM {source} GROUP BY city, state "
+            f"UNION ALL "
+            f"SELECT county, 'county', state, NULL, SUM(population)::BIGINT, count(*), NULL "
+            f"FROM {source} GROUP BY county, state"
+        )
+        results, _ = self._execute(query)
+        return results
+
+    def compute_feature_distribution(self, points: int) -> Dict[str, dict]:
+        """
+        Mean, population std and an evenly spaced `points`-quantile grid of
+        every stat feature, in one scan (quantile_cont sorts each column once).
+        """
+        if not dataset_store.has_data():
+            return {}
+
+        grid = ", ".join(repr(i / (points - 1)) for i in range(points))
+        selects = [f"AVG({feat}), STDDEV_POP({feat}), quantile_cont({feat}, [{grid}])" for feat in STAT_FEATURES]
+        query = f"SELECT {', '.join(selects)} FROM {dataset_store.source_relation()}"
+
+        results, _ = self._execute(query)
+        row = results[0] if results else None
+        if not row or row[0] is None:
+            return {}
+
+        return {
+            feat: {
+                "mean": float(row[i * 3]),
+                "std": float(row[i * 3 + 1]),
+                "quantiles": [float(v) for v in row[i * 3 + 2]]
+            }
+            for i, feat in enumerate(STAT_FEATURES)
+        }
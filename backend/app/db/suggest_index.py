@@ -0,0 +1,149 @@
+# Purpose: Resident prefix index over city and county names for typeahead
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import numpy as np
+
+from app.db import dataset_store
+from app.db.connection import get_connection
+from app.db.dataset_version import get_dataset_version
+from app.db.repositories import LocationRepository
+
+logger = logging.getLogger("locofinder")
+
+MAX_SUGGESTIONS = 20
+# Prefix ranges up to this size are ranked at query time (a partial sort of a
+# few thousand populations); larger ones have their top entries precomputed
+SCAN_LIMIT = 2048
+# Sorts after any character a place name can contain
+_PREFIX_END = "\U0010ffff"
+
+def normalize_term(text: str) -> str:
+    """Case- and accent-insensitive form used for both indexing and queries."""
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+class PrefixIndex:
+    """
+    Immutable: place names sorted by normalized term, so every prefix is a
+    contiguous range found with two bisects. Ranges wider than SCAN_LIMIT
+    (short prefixes like "s") have their top MAX_SUGGESTIONS by population
+    stored at build time; narrower ones are ranked on the spot. Either way a
+    lookup touches at most SCAN_LIMIT entries.
+    """
+
+    def __init__(self, places: List[tuple]):
+        keyed = sorted(((normalize_term(place[0]), place) for place in places), key=lambda item: (item[0], item[1][1], item[1][2]))
+        self.terms: List[str] = [term for term, _ in keyed]
+        self.places: List[tuple] = [place for _, place in keyed]
+        self.population = np.array([place[4] for place in self.places], dtype=np.int64)
+        self._top: Dict[str, np.ndarray] = {}
+        self._precompute()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _rank(self, lo: int, hi: int, limit: int) -> np.ndarray:
+        """Indices of the `limit` most populous entries in [lo, hi); ties keep name order."""
+        population = self.population[lo:hi]
+        if len(population) > limit:
+            # Partition first so only the candidates get sorted
+            threshold = np.partition(population, len(population) - limit)[len(population) - limit]
+            candidates = np.flatnonzero(population >= threshold)
+        else:
+            candidates = np.arange(len(population))
+        order = np.argsort(-population[candidates], kind="stable")[:limit]
+        return lo + candidates[order]
+
+    def _precompute(self) -> None:
+        # A prefix can only be wide if its parent was, so descend from wide ranges only
+        pending = [(0, len(self.terms), 0)]
+        while pending:
+            lo, hi, depth = pending.pop()
+            i = lo
+            while i < hi:
+                term = self.terms[i]
+                if len(term) <= depth:
+                    # Entries equal to the parent prefix itself; no child prefix to extend
+                    i = bisect_right(self.terms, term, i, hi)
+                    continue
+                prefix = term[:depth + 1]
+                j = bisect_left(self.terms, prefix + _PREFIX_END, i, hi)
+                if j - i > SCAN_LIMIT:
+                    self._top[prefix] = self._rank(i, j, MAX_SUGGESTIONS)
+                    pending.append((i, j, depth + 1))
+                i = j
+
+    def lookup(self, query: str, limit: int = 10) -> List[dict]:
+        term = normalize_term(query)
+        if not term:
+            return []
+        ranked = self._top.get(term)
+        if ranked is None:
+            lo = bisect_left(self.terms, term)
+            hi = bisect_left(self.terms, term + _PREFIX_END, lo)
+            ranked = self._rank(lo, hi, limit)
+
+        suggestions = []
+        for i in ranked[:limit]:
+            name, kind, state, county, population, locations, location_id = self.places[i]
+            suggestions.append({
+                "name": name,
+                "kind": kind,
+                "state": state,
+                "county": county,
+                "population": int(population),
+                "locations": int(locations),
+                "location_id": location_id
+            })
+        return suggestions
+
+class SuggestIndex:
+    """
+    The prefix index for this worker, rebuilt (off to the side, then swapped
+    in) whenever the dataset version or the unfiltered-scope generation moves,
+    since any upsert can add or rename places. Lookups never take the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[int, int]] = None
+        self._index: PrefixIndex = PrefixIndex([])
+
+    @staticmethod
+    def _current_key() -> Tuple[int, int]:
+        return get_dataset_version(), dataset_store.get_generation(dataset_store.ALL_STATES_SCOPE)
+
+    def is_stale(self) -> bool:
+        return self._current_key() != self._key
+
+    def refresh(self, conn: Optional[duckdb.DuckDBPyConnection] = None) -> PrefixIndex:
+        """Rebuild if stale. Opens its own connection when none is given, so lookups never need one."""
+        with self._lock:
+            key = self._current_key()
+            if key != self._key:
+                own = conn is None
+                conn = get_connection() if own else conn
+                try:
+                    index = PrefixIndex(LocationRepository(conn).get_place_names())
+                finally:
+                    if own:
+                        conn.close()
+                self._index, self._key = index, key
+                logger.info(f"Built suggest index ({len(index)} places) for dataset version {key[0]}, generation {key[1]}")
+            return self._index
+
+    def lookup(self, query: str, limit: int = 10) -> List[dict]:
+        return self._index.lookup(query, limit)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._index = PrefixIndex([])
+
+# Global instance (one index per worker process)
+suggest_index = SuggestIndex()
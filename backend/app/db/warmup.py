@@ -0,0 +1,52 @@
+# Purpose: Fill every per-worker resident table up front (at startup, or once in the prefork master)
+import time
+import logging
+from typing import Dict
+
+from app.db import dataset_store
+from app.db.aggregates import region_aggregates
+from app.db.connection import get_connection
+from app.db.distributions import ensure_feature_distribution, feature_distributions
+from app.db.repositories import LocationRepository
+from app.db.suggest_index import suggest_index
+
+logger = logging.getLogger("locofinder")
+
+def warm_distributions(repo: LocationRepository) -> dict:
+    # Data written outside the app has no published distribution yet; publish it
+    # once here so the workers load it instead of each scanning for it
+    ensure_feature_distribution(repo)
+    return feature_distributions.get(repo)
+
+def warm_resident_state() -> Dict[str, float]:
+    """
+    Build the suggest index, feature distributions and region aggregates for
+    the current dataset and return how long each took, in ms. A table that
+    fails is left cold and fills on first use, as it would without warming.
+    The connection is closed before returning, so the caller may fork right
+    after: every table is plain Python/NumPy memory that forked workers share.
+    """
+    if not dataset_store.has_data():
+        logger.warning("No dataset to warm resident tables from; they will fill on first use")
+        return {}
+
+    conn = get_connection()
+    builders = (
+        ("suggest_index", lambda: suggest_index.refresh(conn)),
+        ("feature_distributions", lambda: warm_distributions(LocationRepository(conn))),
+        ("region_aggregates", lambda: region_aggregates.refresh(conn)),
+    )
+    timings = {}
+    try:
+        for name, build in builders:
+            started = time.perf_counter()
+            try:
+                build()
+            except Exception as e:
+                logger.warning(f"{name} not warmed: {e}")
+                continue
+            timings[name] = round((time.perf_counter() - started) * 1000, 3)
+    finally:
+        conn.close()
+    logger.info(f"Warmed resident tables in {sum(timings.values()):.1f} ms: {timings}")
+    return timings
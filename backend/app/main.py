@@ -1,10 +1,15 @@
 # Purpose: FastAPI app entrypoint
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.core.metrics import MetricsMiddleware
 from app.db.redis import redis_client
-from app.api import routes_health, routes_locations, routes_admin, routes_scoring
+from app.db.cache import drain_pending_writes
+from app.db.warmup import warm_resident_state
+from app.core.process import process_state
+from app.api import routes_health, routes_locations, routes_admin, routes_scoring, routes_metrics, routes_diagnostics
 
 logger = configure_logging()
 
@@ -13,9 +18,15 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     redis_client.init_pool(settings.REDIS_URL)
+    # Build the resident tables before taking traffic, unless a prefork master already
+    # did and this worker inherited them; a table that fails just fills on first use
+    if not process_state.preloaded:
+        await run_in_threadpool(warm_resident_state)
+    process_state.mark_ready()
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await drain_pending_writes()
     await redis_client.close()
 
 app = FastAPI(
@@ -23,9 +34,12 @@ app = FastAPI(
     version=settings.VERSION,
     lifespan=lifespan
 )
+app.add_middleware(MetricsMiddleware)
 
 routes_health.register_routes(app)
 routes_locations.register_routes(app)
 routes_admin.register_routes(app)
 routes_scoring.register_routes(app)
+routes_metrics.register_routes(app)
+routes_diagnostics.register_routes(app)
 
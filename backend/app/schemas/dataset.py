@@ -0,0 +1,77 @@
+# Purpose: The location dataset contract (column types, drift rules), shared with data-platform
+# Pure Python with no app imports, so data-platform can import it with only backend/ on its path.
+from typing import Dict, List, Optional
+
+# Column -> type kind ("string", "float", "int"). Every other schema (the polars
+# one in dataset_store, the generator's arrow one, data-platform's) derives from
+# this; LocationBase is checked against it in the tests.
+LOCATION_COLUMNS: Dict[str, str] = {
+    "location_id": "string",
+    "city": "string",
+    "county": "string",
+    "state": "string",
+    "median_income": "float",
+    "crime_index": "float",
+    "growth_index": "float",
+    "home_price": "float",
+    "rent_price": "float",
+    "population": "int",
+    "lat": "float",
+    "lon": "float",
+}
+
+# Features with min/max stats, distributions and drift profiles
+STAT_FEATURES: List[str] = ["median_income", "crime_index", "growth_index", "home_price", "rent_price"]
+
+# Drift limits against the previous version: how far min/max may move, as a share of the old range,
+MAX_RANGE_EXPANSION = 0.5
+# ...how far the mean may move, in old standard deviations,
+MAX_MEAN_SHIFT = 0.5
+# ...and by what factor the standard deviation may grow or shrink
+MAX_STD_RATIO = 2.0
+
+def drift_issues(
+    current: dict,
+    baseline: Optional[dict],
+    batch: bool = False,
+    max_range_expansion: float = MAX_RANGE_EXPANSION,
+    max_mean_shift: float = MAX_MEAN_SHIFT,
+    max_std_ratio: float = MAX_STD_RATIO
+) -> List[dict]:
+    """
+    Drift of a profile ({"features": {feat: {"min", "max", "mean", "std"}}})
+    against the previous version's. Batches (a handful of upserted rows) say
+    nothing about the distribution, so they only get the range check, and
+    their baseline may carry min/max alone.
+    """
+    if not baseline:
+        return []
+    issues = []
+    for feat, new in current["features"].items():
+        old = baseline.get("features", {}).get(feat)
+        if not old:
+            continue
+        slack = max_range_expansion * (old["max"] - old["min"])
+        if new["max"] > old["max"] + slack or new["min"] < old["min"] - slack:
+            issues.append({
+                "check": "drift", "column": feat,
+                "message": (
+                    f"'{feat}' range [{new['min']}, {new['max']}] exceeds the previous "
+                    f"[{old['min']}, {old['max']}] by more than {max_range_expansion:.0%} of its width"
+                )
+            })
+        if batch or not old.get("std"):
+            continue
+        shift = abs(new["mean"] - old["mean"]) / old["std"]
+        if shift > max_mean_shift:
+            issues.append({
+                "check": "drift", "column": feat,
+                "message": f"'{feat}' mean moved {shift:.2f} standard deviations ({old['mean']} -> {new['mean']})"
+            })
+        ratio = new["std"] / old["std"]
+        if not (1 / max_std_ratio <= ratio <= max_std_ratio):
+            issues.append({
+                "check": "drift", "column": feat,
+                "message": f"'{feat}' standard deviation changed by a factor of {ratio:.2f}"
+            })
+    return issues
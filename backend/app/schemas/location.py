@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 class LocationBase(BaseModel):
     location_id: str
@@ -23,3 +23,39 @@ class LocationSearchResponse(BaseModel):
     offset: int
     limit: int
     locations: List[LocationOut]
+
+class PlaceSuggestion(BaseModel):
+    name: str
+    kind: Literal["city", "county"]
+    state: str
+    # Cities only: county and id of the most populous location with that name
+    county: Optional[str] = None
+    location_id: Optional[str] = None
+    population: int
+    locations: int
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[PlaceSuggestion]
+
+class FeatureAggregate(BaseModel):
+    mean: float
+    min: float
+    max: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+
+class RegionAggregate(BaseModel):
+    state: str
+    county: Optional[str] = None
+    count: int
+    features: Dict[str, FeatureAggregate]
+
+class AggregatesResponse(BaseModel):
+    level: str
+    total: int
+    offset: int
+    limit: int
+    regions: List[RegionAggregate]
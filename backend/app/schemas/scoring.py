@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Literal, Optional
 from app.schemas.location import LocationOut
+from app.scoring.engine import SCORABLE_FEATURES
 
 class ScoringWeights(BaseModel):
     median_income: float = Field(default=0.0, description="Weight for high median income (positive helps)")
@@ -15,10 +16,16 @@ class ScoringFilters(BaseModel):
     max_rent_price: Optional[float] = None
     min_income: Optional[float] = None
 
+NormalizationStrategy = Literal["minmax", "zscore", "percentile"]
+
 class ScoringRequest(BaseModel):
     weights: ScoringWeights
     filters: ScoringFilters = Field(default_factory=ScoringFilters)
     limit: int = Field(default=20, ge=1, le=100)
+    normalization: NormalizationStrategy = Field(
+        default="minmax",
+        description="minmax (dataset min/max), zscore (sigmoid of the z-score) or percentile (dataset rank)"
+    )
 
 class ExplainedScore(BaseModel):
     base_value: float
@@ -39,9 +46,73 @@ class ExplainResponse(BaseModel):
     total_score: float
     features: Dict[str, ExplainedScore]
 
+class ExplainBatchRequest(BaseModel):
+    location_ids: List[str] = Field(..., min_length=1, max_length=100)
+    weights: ScoringWeights
+    normalization: NormalizationStrategy = "minmax"
+
+class ExplainBatchResponse(BaseModel):
+    results: List[ExplainResponse]
+    missing: List[str]  # Requested ids with no such location
+
 class FeatureSchema(BaseModel):
     feature_name: str
     description: str
     min_value: float
     max_value: float
     optimization_direction: str  # "minimize" or "maximize"
+
+class ParetoRequest(BaseModel):
+    features: List[str] = Field(
+        default_factory=lambda: [feat.name for feat in SCORABLE_FEATURES],
+        description="Features the frontier is computed over (default: all scorable features)"
+    )
+    filters: ScoringFilters = Field(default_factory=ScoringFilters)
+    normalization: NormalizationStrategy = "minmax"
+
+    @field_validator("features")
+    @classmethod
+    def check_features(cls, features: List[str]) -> List[str]:
+        known = {feat.name for feat in SCORABLE_FEATURES}
+        unknown = [name for name in features if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown features {unknown}; expected a subset of {sorted(known)}")
+        if not features:
+            raise ValueError("At least one feature is required")
+        # Order and duplicates don't change the frontier; canonicalise so they share a cache entry
+        return [feat.name for feat in SCORABLE_FEATURES if feat.name in features]
+
+class ParetoLocation(BaseModel):
+    location: LocationOut
+    normalized: Dict[str, float]
+
+class ParetoResponse(BaseModel):
+    total_analyzed: int
+    features: List[str]
+    results: List[ParetoLocation]
+
+class RankChange(BaseModel):
+    kind: str  # "swap" (reorder within the top-K) or "enter" (location_id joins the top-K)
+    location_id: str
+    overtakes_id: str
+
+class WeightRange(BaseModel):
+    feature_name: str
+    weight: float
+    min_weight: Optional[float]  # None: the ranking holds however far the weight moves
+    max_weight: Optional[float]
+    below_min: Optional[RankChange]
+    above_max: Optional[RankChange]
+
+class TopEntry(BaseModel):
+    location_id: str
+    total_score: float
+
+class NextEntrant(TopEntry):
+    score_gap: float
+
+class SensitivityResponse(BaseModel):
+    total_analyzed: int
+    top: List[TopEntry]
+    next_entrant: Optional[NextEntrant]
+    ranges: List[WeightRange]
@@ -1,6 +1,9 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
 from pydantic import BaseModel
 
+from app.scoring.normalization import Normalizer, MINMAX, sigmoid_zscore
+
 def normalize_minmax(value: float, min_val: float, max_val: float, minimize: bool = False) -> float:
     """
     Min-max normalization. 
@@ -19,15 +22,7 @@ def normalize_zscore(value: float, mean: float, std_dev: float, minimize: bool =
     Z-score normalization mapped roughly to a 0-1 scale using sigmoid to bound it.
     Not strictly needed for basic Phase 3 but included per specs.
     """
-    import math
-    if std_dev == 0:
-        return 0.5
-    z = (value - mean) / std_dev
-    if minimize:
-        z = -z
-    
-    # Sigmoid function out to bound between 0 and 1
-    return 1 / (1 + math.exp(-z))
+    return float(sigmoid_zscore(value, mean, std_dev, minimize))
 
 
 class EngineFeature(BaseModel):
@@ -43,39 +38,56 @@ SCORABLE_FEATURES = [
     EngineFeature(name="rent_price", minimize=True)
 ]
 
-def score_locations(locations: List[dict], db_stats: Dict[str, Dict[str, float]], weights: BaseModel) -> List[dict]:
+def normalized_matrix(
+    locations: List[dict],
+    db_stats: Dict[str, Dict[str, float]],
+    features: Sequence[EngineFeature],
+    normalizer: Optional[Normalizer] = None
+) -> np.ndarray:
+    """
+    An (n_locations x n_features) matrix of the normalized values
+    score_locations uses, one column per feature. Min-max unless a
+    normalizer for another strategy is given.
+    """
+    normalizer = normalizer or Normalizer(MINMAX, db_stats)
+    matrix = np.array(
+        [[float(loc.get(feat.name, 0.0)) for feat in features] for loc in locations],
+        dtype=np.float64
+    ).reshape(len(locations), len(features))
+    for j, feat in enumerate(features):
+        matrix[:, j] = normalizer.normalize(feat.name, matrix[:, j], feat.minimize)
+    return matrix
+
+def score_locations(
+    locations: List[dict],
+    db_stats: Dict[str, Dict[str, float]],
+    weights: BaseModel,
+    normalizer: Optional[Normalizer] = None
+) -> List[dict]:
     """
     Takes a raw list of location dictionaries from DB.
-    Applies the weights using Min-Max normalization based on the overall database stats.
+    Applies the weights to values normalized by `normalizer` (Min-Max over
+    the overall database stats by default), one vectorized pass per feature.
     Returns the same list mutated with 'total_score' and 'explained_scores'.
     """
     
     weight_dict = weights.model_dump()
+    active = [feat for feat in SCORABLE_FEATURES if weight_dict.get(feat.name, 0.0) != 0]
+    matrix = normalized_matrix(locations, db_stats, active, normalizer)
     
-    for loc in locations:
+    for i, loc in enumerate(locations):
         total_score = 0.0
         explained = {}
         
-        for feat in SCORABLE_FEATURES:
-            w = weight_dict.get(feat.name, 0.0)
-            if w == 0:
-                continue
-                
-            val = loc.get(feat.name, 0.0)
-            stats = db_stats.get(feat.name, {"min": 0, "max": 1})
-            
-            norm_val = normalize_minmax(
-                value=float(val), 
-                min_val=stats["min"], 
-                max_val=stats["max"], 
-                minimize=feat.minimize
-            )
+        for j, feat in enumerate(active):
+            w = weight_dict[feat.name]
+            norm_val = float(matrix[i, j])
             
             contribution = norm_val * w
             total_score += contribution
             
             explained[feat.name] = {
-                "base_value": float(val),
+                "base_value": float(loc.get(feat.name, 0.0)),
                 "normalized_value": norm_val,
                 "weight": w,
                 "contribution": contribution
@@ -1,3 +1,77 @@
-# Purpose: Score normalization
-def normalize_score(value):
-    raise NotImplementedError('Implement score normalization')
+# Purpose: Score normalization strategies (min-max, z-score, percentile)
+from typing import Dict, Optional
+
+import numpy as np
+
+MINMAX = "minmax"
+ZSCORE = "zscore"
+PERCENTILE = "percentile"
+STRATEGIES = (MINMAX, ZSCORE, PERCENTILE)
+
+# Quantile grid resolution stored per feature for percentile normalization (0.1% steps)
+QUANTILE_POINTS = 1001
+
+def _percentile_table(quantiles: list):
+    """
+    (values, ranks) for np.interp. A value repeated across the grid is a mass
+    point; it maps to the middle of the rank range it covers.
+    """
+    grid = np.asarray(quantiles, dtype=np.float64)
+    ranks = np.linspace(0.0, 1.0, len(grid))
+    values, inverse = np.unique(grid, return_inverse=True)
+    return values, np.bincount(inverse, weights=ranks) / np.bincount(inverse)
+
+def sigmoid_zscore(values: np.ndarray, mean: float, std: float, minimize: bool = False) -> np.ndarray:
+    """Z-score squashed into (0, 1) by a sigmoid; 0.5 everywhere for a constant feature."""
+    values = np.asarray(values, dtype=np.float64)
+    if std == 0:
+        return np.full(values.shape, 0.5)
+    z = (values - mean) / std
+    if minimize:
+        z = -z
+    return 1.0 / (1.0 + np.exp(-z))
+
+class Normalizer:
+    """
+    Maps raw feature values to [0, 1], 1 being best, under one strategy.
+    Every strategy works from precomputed per-feature summaries (min/max,
+    mean/std, a quantile grid) and is a few vectorized ops per feature, so
+    they all cost the same at request time.
+
+    db_stats:     {feature: {"min", "max"}}
+    distribution: {feature: {"mean", "std", "quantiles": [QUANTILE_POINTS floats]}},
+                  required for zscore and percentile
+    """
+
+    def __init__(self, strategy: str, db_stats: Dict[str, Dict[str, float]], distribution: Optional[dict] = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown normalization strategy '{strategy}'")
+        if strategy != MINMAX and distribution is None:
+            raise ValueError(f"'{strategy}' normalization needs the feature distribution")
+        self.strategy = strategy
+        self.db_stats = db_stats
+        self.distribution = distribution or {}
+        self._tables: Dict[str, tuple] = {}
+
+    def normalize(self, feature: str, values: np.ndarray, minimize: bool) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if self.strategy == MINMAX:
+            stats = self.db_stats.get(feature, {"min": 0, "max": 1})
+            span = stats["max"] - stats["min"]
+            if span == 0:
+                return np.full(len(values), 0.5)
+            normalized = (values - stats["min"]) / span
+            return 1.0 - normalized if minimize else normalized
+
+        dist = self.distribution.get(feature)
+        if not dist:
+            return np.full(len(values), 0.5)
+
+        if self.strategy == ZSCORE:
+            return sigmoid_zscore(values, dist["mean"], dist["std"], minimize)
+
+        table = self._tables.get(feature)
+        if table is None:
+            table = self._tables[feature] = _percentile_table(dist["quantiles"])
+        ranks = np.interp(values, *table)
+        return 1.0 - ranks if minimize else ranks
@@ -0,0 +1,105 @@
+# Purpose: Pareto frontier (skyline) over the scorable features
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.scoring.engine import EngineFeature, normalized_matrix
+from app.scoring.normalization import Normalizer
+
+# Candidates taken per step, and frontier rows they're compared against per
+# vectorized call; bounds the (block x chunk x features) arrays to a few MB.
+BLOCK_SIZE = 2048
+FRONTIER_CHUNK = 128
+
+def _covered(candidates: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """(candidates x frontier) mask of frontier rows >= the candidate in every column"""
+    covered = frontier[None, :, 0] >= candidates[:, None, 0]
+    for j in range(1, candidates.shape[1]):
+        covered &= frontier[None, :, j] >= candidates[:, None, j]
+    return covered
+
+def skyline_indices(values: np.ndarray) -> np.ndarray:
+    """
+    Sort-filter-skyline over an (n x d) matrix where larger is better in every
+    column. Rows are presorted by the sum of their min-max normalized values
+    (ties broken lexicographically), a monotone order in which no row can be
+    dominated by a row after it. Each block of candidates is then filtered
+    against the frontier found so far and against itself, and the survivors
+    are final. Returns row indices in presort order, best overall first.
+    Identical rows do not dominate each other and are all kept.
+    """
+    n, d = values.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # On distinct rows "dominates" is just ">= everywhere", which halves the comparisons
+    distinct, inverse = np.unique(values, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    low = distinct.min(axis=0)
+    span = distinct.max(axis=0) - low
+    span[span == 0] = 1.0
+    entropy = ((distinct - low) / span).sum(axis=1)
+    order = np.lexsort(tuple(distinct[:, j] for j in reversed(range(d))) + (entropy,))[::-1]
+
+    frontier = np.empty((0, d), dtype=distinct.dtype)
+    kept: List[np.ndarray] = []
+    for start in range(0, len(order), BLOCK_SIZE):
+        block_idx = order[start:start + BLOCK_SIZE]
+        block = distinct[block_idx]
+        # The frontier is in presort order, so its first rows are the strongest
+        # and eliminate most candidates before the later chunks are reached
+        for chunk_start in range(0, len(frontier), FRONTIER_CHUNK):
+            if not len(block):
+                break
+            survivors = ~_covered(block, frontier[chunk_start:chunk_start + FRONTIER_CHUNK]).any(axis=1)
+            block_idx, block = block_idx[survivors], block[survivors]
+        # Dominance is transitive, so discarding rows dominated by any block
+        # member (even a dominated one) never loses a frontier row
+        covered = _covered(block, block)
+        np.fill_diagonal(covered, False)
+        survivors = ~covered.any(axis=1)
+        block_idx, block = block_idx[survivors], block[survivors]
+        frontier = np.vstack([frontier, block])
+        kept.append(block_idx)
+
+    # Map frontier rows back to every original row holding those values
+    rank = np.full(len(distinct), -1, dtype=np.int64)
+    frontier_rows = np.concatenate(kept)
+    rank[frontier_rows] = np.arange(len(frontier_rows))
+    row_rank = rank[inverse]
+    on_frontier = np.flatnonzero(row_rank >= 0)
+    return on_frontier[np.argsort(row_rank[on_frontier], kind="stable")]
+
+def pareto_frontier(
+    locations: List[dict],
+    db_stats: Dict[str, Dict[str, float]],
+    features: Sequence[EngineFeature],
+    normalizer: Optional[Normalizer] = None
+) -> List[dict]:
+    """
+    Returns the locations no other location beats on every selected feature,
+    honouring each feature's minimize direction. Each result carries the
+    normalized value per feature (1.0 = best), the same values /recommend
+    multiplies by the weights, so a client can rank the frontier for any
+    weights locally. For non-negative weights the /recommend winner is always
+    on the frontier. Every normalization strategy is monotone, so the
+    frontier itself doesn't depend on it; only the normalized values do.
+    """
+    if not locations or not features:
+        return []
+
+    # Orient every column so larger is better
+    values = np.array(
+        [[float(loc.get(feat.name, 0.0)) for feat in features] for loc in locations],
+        dtype=np.float64
+    )
+    signs = np.array([-1.0 if feat.minimize else 1.0 for feat in features])
+    values *= signs
+
+    members = [locations[i] for i in skyline_indices(values)]
+    normalized = normalized_matrix(members, db_stats, features, normalizer)
+    return [
+        {"location": loc, "normalized": {feat.name: float(row[j]) for j, feat in enumerate(features)}}
+        for loc, row in zip(members, normalized)
+    ]
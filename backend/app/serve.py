@@ -0,0 +1,194 @@
+# Purpose: Prefork server: one master imports the app and builds the resident tables, then forks the workers
+# Usage: python -m app.serve --workers 4 [--host 0.0.0.0] [--port 8000] [--no-preload]
+import gc
+import os
+import sys
+import time
+import select
+import signal
+import socket
+import logging
+import argparse
+from typing import Dict, Optional
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.process import memory_usage, process_state
+
+logger = logging.getLogger("locofinder")
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+def _run_uvicorn(app, sock: socket.socket) -> None:
+    uvicorn.Server(uvicorn.Config(app, lifespan="on")).run(sockets=[sock])
+
+class Master:
+    """
+    Forks `workers` children that all accept on one inherited listening socket.
+    Each child runs its own uvicorn event loop and lifespan (so the Redis pool
+    is per worker, never shared across a fork) and reports over a pipe once
+    its startup is done. A worker that dies after startup is replaced; one that
+    dies during startup aborts the whole server, as a respawn would only crash
+    the same way. SIGTERM/SIGINT are forwarded and the master exits once every
+    worker has drained.
+    """
+
+    def __init__(self, app, sock: socket.socket, workers: int, ready_timeout: float):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.ready_timeout = ready_timeout
+        self.children: Dict[int, int] = {}
+        self.stopping = False
+        self.ready_r, self.ready_w = os.pipe()
+
+    def spawn(self, index: int) -> int:
+        forked_at = time.monotonic()
+        pid = os.fork()
+        if pid:
+            self.children[pid] = index
+            return pid
+
+        # Child: never returns into the master's loop
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            os.close(self.ready_r)
+            gc.enable()
+            process_state.become_worker(index, forked_at, self.ready_w)
+            _run_uvicorn(self.app, self.sock)
+        except BaseException:
+            logger.exception(f"Worker {os.getpid()} crashed")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def stop(self, signum, frame) -> None:
+        if not self.stopping:
+            logger.info(f"Master received signal {signum}, stopping {len(self.children)} worker(s)")
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def await_ready(self, forked_at: float) -> Optional[Dict[int, float]]:
+        """pid -> startup ms for every worker, or None if one died first or the timeout passed."""
+        ready: Dict[int, float] = {}
+        pending = b""
+        deadline = time.monotonic() + self.ready_timeout
+        while len(ready) < len(self.children) and not self.stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error(f"Only {len(ready)} of {len(self.children)} workers ready after {self.ready_timeout}s")
+                return None
+            readable, _, _ = select.select([self.ready_r], [], [], min(remaining, 0.1))
+            if readable:
+                pending += os.read(self.ready_r, 4096)
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    pid, ms = line.split()
+                    ready[int(pid)] = float(ms)
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self.children.pop(pid, None)
+                logger.error(f"Worker {pid} exited during startup (status {status})")
+                return None
+        logger.info(f"All {len(ready)} workers ready {(time.monotonic() - forked_at) * 1000:.1f} ms after the first fork")
+        return ready
+
+    def report(self, ready: Dict[int, float]) -> None:
+        """Per-worker cold start and memory. Summed PSS is the real footprint; summed RSS double-counts shared pages."""
+        timings = process_state.timings
+        logger.info(
+            f"Master {os.getpid()}: import {timings.get('import_ms', 0.0):.1f} ms, "
+            f"preload {timings.get('preload_ms', 0.0):.1f} ms, {memory_usage()}"
+        )
+        totals = {"rss_mb": 0.0, "pss_mb": 0.0, "private_mb": 0.0}
+        for pid, ms in sorted(ready.items()):
+            memory = memory_usage(pid)
+            for key in totals:
+                totals[key] += memory.get(key, 0.0)
+            logger.info(f"Worker {self.children.get(pid)} (pid {pid}): ready in {ms:.1f} ms, {memory}")
+        logger.info(
+            f"Workers total: rss {totals['rss_mb']:.1f} MB, pss {totals['pss_mb']:.1f} MB, "
+            f"private {totals['private_mb']:.1f} MB"
+        )
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        forked_at = time.monotonic()
+        for index in range(self.workers):
+            self.spawn(index)
+
+        ready = self.await_ready(forked_at)
+        if ready is None:
+            self.stop(signal.SIGTERM, None)
+        else:
+            self.report(ready)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self.children.pop(pid, None)
+            if index is not None and not self.stopping:
+                logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, replacing it")
+                self.spawn(index)
+
+        self.sock.close()
+        return 0 if ready is not None else 1
+
+def serve(host: str, port: int, workers: int, preload: bool) -> int:
+    # Per the gc docs for fork without exec: no collections in the master, so
+    # no freed holes in shared pages; freeze before fork so the workers'
+    # collections never write to the gc headers of inherited objects
+    gc.disable()
+    started = time.perf_counter()
+    from app.main import app
+    process_state.record("import_ms", (time.perf_counter() - started) * 1000)
+
+    if not hasattr(os, "fork"):
+        logger.warning("fork() is unavailable on this platform; serving from a single process")
+        gc.enable()
+        uvicorn.run(app, host=host, port=port)
+        return 0
+
+    if preload:
+        from app.db.warmup import warm_resident_state
+        started = time.perf_counter()
+        warm_resident_state()
+        process_state.record("preload_ms", (time.perf_counter() - started) * 1000)
+        process_state.preloaded = True
+
+    sock = _bind(host, port)
+    if workers <= 1:
+        gc.enable()
+        _run_uvicorn(app, sock)
+        return 0
+
+    process_state.become_master()
+    gc.freeze()
+    return Master(app, sock, workers, settings.SERVER_READY_TIMEOUT_SECONDS).run()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API from a preloading prefork master.")
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="Worker processes to fork")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=settings.SERVER_PRELOAD,
+                        help="Let each worker build its own resident tables instead of inheriting them")
+    args = parser.parse_args()
+    sys.exit(serve(args.host, args.port, args.workers, args.preload))
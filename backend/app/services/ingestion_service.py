@@ -0,0 +1,92 @@
+# Purpose: Incremental (delta) ingestion of changed locations
+import logging
+from typing import Dict, List
+
+import duckdb
+
+from app.core.config import settings
+from app.db import dataset_store
+from app.db.dataset_version import dataset_write_lock, get_dataset_version
+from app.db.distributions import publish_feature_distribution
+from app.db.repositories import LocationRepository, STAT_FEATURES
+from app.services.validation_service import ValidationService, DatasetValidationError, stats_baseline
+
+logger = logging.getLogger("locofinder")
+
+class IngestionService:
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        self.repo = LocationRepository(conn)
+        self.conn = conn
+
+    def upsert_locations(self, rows: List[dict]) -> dict:
+        """
+        Upsert rows by location_id as a new delta file. Stats are merged
+        incrementally, and only the cache scopes the rows can affect are
+        invalidated: the old and new states of every row, the unfiltered
+        scope, and the stats scope when min/max moved. The feature
+        distribution is recomputed here, once, rather than by every worker.
+        A batch that fails validation raises DatasetValidationError and
+        nothing is written.
+        """
+        # Last write wins within a batch too
+        by_id = {row["location_id"]: row for row in rows}
+        rows = list(by_id.values())
+        if not rows:
+            return {"upserted": 0, "inserted": 0, "delta_file": None, "affected_states": [], "stats_changed": False, "compacted": False}
+
+        with dataset_write_lock():
+            previous = self.repo.get_locations_by_ids(list(by_id))
+            old_stats = self.repo.get_feature_stats()
+
+            if settings.VALIDATION_ENABLED:
+                report = ValidationService(self.conn).validate_rows(rows, stats_baseline(old_stats))
+                if not report["passed"]:
+                    raise DatasetValidationError(report)
+
+            stats, stale_features = self._merge_stats(old_stats, previous, rows)
+            delta_name = dataset_store.write_delta(rows)
+
+            # A replaced row may have held the old extreme; only then is a rescan needed
+            if stale_features:
+                stats.update(self.repo.compute_feature_stats(stale_features))
+
+            states = {row["state"] for row in rows} | {row["state"] for row in previous}
+            scopes = [dataset_store.ALL_STATES_SCOPE] + sorted(dataset_store.state_scope(s) for s in states)
+            stats_changed = stats != old_stats
+            if stats_changed:
+                scopes.append(dataset_store.STATS_SCOPE)
+            # Published under the generation publish_stats is about to set, so no
+            # worker ever sees the new generation without its distribution
+            generation = dataset_store.get_generation(dataset_store.ALL_STATES_SCOPE) + 1
+            publish_feature_distribution(self.repo, get_dataset_version(), generation)
+            dataset_store.publish_stats(stats, scopes)
+
+            compacted = len(dataset_store.read_manifest()["deltas"]) >= settings.DELTA_COMPACTION_THRESHOLD
+            if compacted:
+                dataset_store.compact(self.conn)
+
+        logger.info(f"Upserted {len(rows)} locations into {delta_name} (states={sorted(states)}, stats_changed={stats_changed})")
+        return {
+            "upserted": len(rows),
+            "inserted": len(rows) - len(previous),
+            "delta_file": delta_name,
+            "affected_states": sorted(states),
+            "stats_changed": stats_changed,
+            "compacted": compacted
+        }
+
+    @staticmethod
+    def _merge_stats(old_stats: Dict[str, Dict[str, float]], previous: List[dict], rows: List[dict]):
+        stats = {}
+        stale = []
+        for feat in STAT_FEATURES:
+            values = [float(row[feat]) for row in rows]
+            old = old_stats.get(feat)
+            if not old:
+                stats[feat] = {"min": min(values), "max": max(values)}
+                continue
+
+            stats[feat] = {"min": min(old["min"], *values), "max": max(old["max"], *values)}
+            if any(float(row[feat]) in (old["min"], old["max"]) for row in previous):
+                stale.append(feat)
+        return stats, stale
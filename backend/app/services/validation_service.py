@@ -0,0 +1,156 @@
+# Purpose: Pre-publish dataset validation (schema, nulls, drift), column-wise in DuckDB
+import time
+import logging
+from typing import Dict, List, Optional
+
+import duckdb
+
+from app.core.config import settings
+from app.db import dataset_store
+from app.schemas.dataset import LOCATION_COLUMNS, STAT_FEATURES, drift_issues
+
+logger = logging.getLogger("locofinder")
+
+# Parquet/DuckDB types accepted for each LOCATION_COLUMNS kind
+_ACCEPTED_TYPES = {
+    "string": {"VARCHAR"},
+    "float": {"DOUBLE", "FLOAT"},
+    "int": {"BIGINT", "INTEGER", "SMALLINT", "TINYINT"},
+}
+
+class DatasetValidationError(Exception):
+    """Raised when data fails validation; carries the full report."""
+
+    def __init__(self, report: dict):
+        super().__init__("; ".join(issue["message"] for issue in report["errors"]))
+        self.report = report
+
+class ValidationService:
+    """
+    Runs every check as a handful of aggregate queries over the whole relation
+    (one pass for nulls, one for the profile, one for duplicates), never row by row.
+
+    - schema: columns and types against LOCATION_COLUMNS
+    - nulls: null/NaN/inf rate per column against VALIDATION_MAX_NULL_RATE
+    - duplicates: location_id must be unique
+    - drift: against the previous version's profile (min/max range expansion,
+      mean shift in old standard deviations, std ratio). Batches (upserts) are
+      only range-checked, since a few rows say nothing about the distribution.
+    """
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        self.conn = conn
+
+    def validate_parquet(self, path: str, baseline: Optional[dict] = None) -> dict:
+        """A complete candidate dataset, e.g. a regenerated base file before it is swapped in."""
+        return self._validate(f"read_parquet('{path}')", baseline, batch=False)
+
+    def validate_rows(self, rows: List[dict], baseline: Optional[dict] = None) -> dict:
+        """An upsert batch, checked as one columnar frame."""
+        import polars as pl
+        frame = pl.DataFrame(rows, schema=dataset_store.location_schema())
+        self.conn.register("validation_batch", frame)
+        try:
+            return self._validate("validation_batch", baseline, batch=True)
+        finally:
+            self.conn.unregister("validation_batch")
+
+    def profile_current(self) -> Optional[dict]:
+        """Profile of the published dataset (base plus deltas), for a baseline when none was recorded."""
+        if not dataset_store.has_data():
+            return None
+        return self._check_nulls_and_profile(dataset_store.source_relation())[2]
+
+    def _validate(self, relation: str, baseline: Optional[dict], batch: bool) -> dict:
+        started = time.perf_counter()
+        errors = self._check_schema(relation)
+        profile = None
+        rows = 0
+        # Later checks query the expected columns, so they only run on a valid schema
+        if not errors:
+            rows, null_errors, profile = self._check_nulls_and_profile(relation)
+            errors += null_errors
+            errors += self._check_duplicates(relation, rows)
+            if baseline:
+                errors += self._check_drift(profile, baseline, batch)
+
+        report = {
+            "passed": not errors,
+            "rows": rows,
+            "errors": errors,
+            "profile": profile,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+        if errors:
+            logger.warning(f"Validation failed for {relation}: {len(errors)} issue(s)")
+        return report
+
+    def _check_schema(self, relation: str) -> List[dict]:
+        actual = {row[0]: row[1] for row in self.conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()}
+        errors = []
+        for name, kind in LOCATION_COLUMNS.items():
+            if name not in actual:
+                errors.append({"check": "schema", "column": name, "message": f"missing column '{name}'"})
+            elif actual[name] not in _ACCEPTED_TYPES[kind]:
+                errors.append({
+                    "check": "schema", "column": name,
+                    "message": f"column '{name}' is {actual[name]}, expected {kind}"
+                })
+        for name in actual:
+            if name not in LOCATION_COLUMNS:
+                errors.append({"check": "schema", "column": name, "message": f"unexpected column '{name}'"})
+        return errors
+
+    def _check_nulls_and_profile(self, relation: str):
+        columns = list(LOCATION_COLUMNS)
+        floats = [name for name, kind in LOCATION_COLUMNS.items() if kind == "float"]
+        # count(col) is answered from parquet metadata; only NaN/inf need a scan
+        selects = ["count(*)"] + [f"count({name})" for name in columns]
+        selects += [f"count(*) FILTER (WHERE NOT isfinite({name}))" for name in floats]
+        row = self.conn.execute(f"SELECT {', '.join(selects)} FROM {relation}").fetchone()
+        rows = row[0]
+        non_finite = dict(zip(floats, row[1 + len(columns):]))
+
+        errors = []
+        for i, name in enumerate(columns):
+            invalid = rows - row[1 + i] + non_finite.get(name, 0)
+            rate = invalid / rows if rows else 0.0
+            if invalid and rate > settings.VALIDATION_MAX_NULL_RATE:
+                errors.append({
+                    "check": "nulls", "column": name,
+                    "message": f"{invalid} null/NaN/inf values in '{name}' ({rate:.4%}, max {settings.VALIDATION_MAX_NULL_RATE:.4%})"
+                })
+
+        # Profile over finite values only; NaN/inf would poison the aggregates. The
+        # filter roughly doubles the cost, so it's only applied where it matters.
+        selects = []
+        for feat in STAT_FEATURES:
+            finite = f" FILTER (WHERE isfinite({feat}))" if non_finite.get(feat) else ""
+            selects.append(f"MIN({feat}){finite}, MAX({feat}){finite}, AVG({feat}){finite}, STDDEV_POP({feat}){finite}")
+        stats = self.conn.execute(f"SELECT {', '.join(selects)} FROM {relation}").fetchone()
+
+        profile = {"rows": rows, "features": {}}
+        for i, feat in enumerate(STAT_FEATURES):
+            low, high, mean, std = stats[i * 4: i * 4 + 4]
+            if low is not None:
+                profile["features"][feat] = {"min": float(low), "max": float(high), "mean": float(mean), "std": float(std)}
+        return rows, errors, profile
+
+    def _check_duplicates(self, relation: str, rows: int) -> List[dict]:
+        distinct = self.conn.execute(f"SELECT count(DISTINCT location_id) FROM {relation}").fetchone()[0]
+        if distinct == rows:
+            return []
+        return [{"check": "duplicates", "column": "location_id", "message": f"{rows - distinct} duplicate location_id values"}]
+
+    def _check_drift(self, profile: dict, baseline: dict, batch: bool) -> List[dict]:
+        # The rules are shared with data-platform; only the limits come from settings here
+        return drift_issues(
+            profile, baseline, batch,
+            max_range_expansion=settings.VALIDATION_MAX_RANGE_EXPANSION,
+            max_mean_shift=settings.VALIDATION_MAX_MEAN_SHIFT,
+            max_std_ratio=settings.VALIDATION_MAX_STD_RATIO
+        )
+
+def stats_baseline(stats: Optional[Dict[str, Dict[str, float]]]) -> Optional[dict]:
+    """Baseline from the live min/max stats, for range-checking upsert batches."""
+    return {"features": stats} if stats else None
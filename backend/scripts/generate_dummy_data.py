@@ -1,71 +1,123 @@
 """
 Purpose: Generate realistic dummy data for Locofinder
-Responsibilities: Create a 10k+ row synthetic dataset using Polars and Faker, save to Parquet.
+Responsibilities: Create a 10k to 10M+ row synthetic dataset, save to Parquet.
+Numeric columns are drawn with NumPy a chunk at a time, names are sampled from
+Faker-built pools, and chunks are generated across processes and streamed into
+a single Parquet file, so memory stays flat regardless of row count.
 Inputs/Outputs: No inputs. Outputs 'backend/data/dummy_locations.parquet'.
 """
 import os
-import random
-from faker import Faker
-import polars as pl
+import sys
 import argparse
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from faker import Faker
+
+# Run as a script from anywhere; the column contract lives in the backend package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.schemas.dataset import LOCATION_COLUMNS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("dummy_data_gen")
 
 TARGET_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "dummy_locations.parquet")
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_SIZE = 250_000
+CITY_POOL_SIZE = 5000
+
+_ARROW_TYPES = {"string": pa.string(), "float": pa.float64(), "int": pa.int64()}
+SCHEMA = pa.schema([(name, _ARROW_TYPES[kind]) for name, kind in LOCATION_COLUMNS.items()])
 
-def generate_data(num_rows: int = 10000) -> None:
+def build_pools(seed: int) -> dict:
+    """Faker is slow per call, so it only runs a few thousand times to fill the pools"""
     fake = Faker('en_US')
-    # Make generation deterministic for testing
-    Faker.seed(42)
-    random.seed(42)
+    Faker.seed(seed)
+    cities = sorted({fake.city() for _ in range(CITY_POOL_SIZE)})
+    states = sorted({fake.state_abbr() for _ in range(2000)})
+    return {
+        "cities": np.array(cities, dtype=object),
+        "counties": np.array([f"{city} County" for city in cities], dtype=object),
+        "states": np.array(states, dtype=object),
+    }
+
+def generate_chunk(chunk_index: int, start: int, size: int, seed: int, pools: dict) -> pa.RecordBatch:
+    """
+    Rows [start, start + size). Each chunk seeds its own generator from
+    (seed, chunk_index), so output does not depend on the number of workers.
+    """
+    rng = np.random.default_rng([seed, chunk_index])
+    ids = np.arange(start + 1, start + size + 1)
+    city_idx = rng.integers(0, len(pools["cities"]), size)
 
-    logger.info(f"Generating {num_rows} rows of dummy data...")
-    
-    data = []
-    for i in range(1, num_rows + 1):
-        location_id = f"LOC-{i:06d}"
-        city = fake.city()
-        county = city + " County"
-        state = fake.state_abbr()
-        median_income = round(random.uniform(30000, 150000), 2)
-        crime_index = round(random.uniform(10, 100), 1)
-        growth_index = round(random.uniform(-5, 15), 1)
-        home_price = round(random.uniform(100000, 1500000), 2)
-        rent_price = round(random.uniform(500, 5000), 2)
-        population = random.randint(1000, 5000000)
-        lat = float(fake.latitude())
-        lon = float(fake.longitude())
-        
-        data.append({
-            "location_id": location_id,
-            "city": city,
-            "county": county,
-            "state": state,
-            "median_income": median_income,
-            "crime_index": crime_index,
-            "growth_index": growth_index,
-            "home_price": home_price,
-            "rent_price": rent_price,
-            "population": population,
-            "lat": lat,
-            "lon": lon
-        })
+    columns = [
+        pa.array(np.char.add("LOC-", np.char.zfill(ids.astype(str), 6)).astype(object), pa.string()),
+        pa.array(pools["cities"][city_idx], pa.string()),
+        pa.array(pools["counties"][city_idx], pa.string()),
+        pa.array(pools["states"][rng.integers(0, len(pools["states"]), size)], pa.string()),
+        pa.array(np.round(rng.uniform(30000, 150000, size), 2)),
+        pa.array(np.round(rng.uniform(10, 100, size), 1)),
+        pa.array(np.round(rng.uniform(-5, 15, size), 1)),
+        pa.array(np.round(rng.uniform(100000, 1500000, size), 2)),
+        pa.array(np.round(rng.uniform(500, 5000, size), 2)),
+        pa.array(rng.integers(1000, 5000001, size, dtype=np.int64)),
+        pa.array(np.round(rng.uniform(-90, 90, size), 6)),
+        pa.array(np.round(rng.uniform(-180, 180, size), 6)),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=SCHEMA)
+
+def _chunk_bounds(num_rows: int, chunk_size: int) -> List[tuple]:
+    return [(i, start, min(chunk_size, num_rows - start)) for i, start in enumerate(range(0, num_rows, chunk_size))]
+
+def generate_data(
+    num_rows: int = 10000,
+    output: str = TARGET_FILE,
+    seed: int = DEFAULT_SEED,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None
+) -> None:
+    started = time.perf_counter()
+    workers = workers or min(os.cpu_count() or 1, 8)
+    chunks = _chunk_bounds(num_rows, chunk_size)
+    pools = build_pools(seed)
+
+    logger.info(f"Generating {num_rows} rows of dummy data in {len(chunks)} chunks across {workers} workers...")
 
-    # Use Polars to create a DataFrame and write to parquet
-    df = pl.DataFrame(data)
-    
     # Ensure data directory exists
-    os.makedirs(os.path.dirname(TARGET_FILE), exist_ok=True)
-    
-    # Write to parquet
-    df.write_parquet(TARGET_FILE)
-    
-    logger.info(f"Successfully generated {len(df)} rows and saved to {TARGET_FILE}.")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    # Write next to the target and swap in at the end, so readers never see a half-written file
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with pq.ParquetWriter(tmp_path, SCHEMA) as writer:
+        if workers == 1 or len(chunks) == 1:
+            for index, start, size in chunks:
+                writer.write_batch(generate_chunk(index, start, size, seed, pools))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Bound in-flight chunks so memory stays at ~2 chunks per worker
+                pending = []
+                for index, start, size in chunks:
+                    pending.append(executor.submit(generate_chunk, index, start, size, seed, pools))
+                    if len(pending) >= workers * 2:
+                        writer.write_batch(pending.pop(0).result())
+                for future in pending:
+                    writer.write_batch(future.result())
+    os.replace(tmp_path, output)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Successfully generated {num_rows} rows and saved to {output} in {elapsed:.2f}s.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate dummy location data.")
     parser.add_argument("--rows", type=int, default=10000, help="Number of rows to generate")
+    parser.add_argument("--output", default=TARGET_FILE, help="Parquet file to write")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed; output is identical for the same seed")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per generated record batch")
+    parser.add_argument("--workers", type=int, default=None, help="Generator processes (default: CPU count, max 8)")
     args = parser.parse_args()
-    generate_data(args.rows)
+    generate_data(args.rows, args.output, args.seed, args.chunk_size, args.workers)
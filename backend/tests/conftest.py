@@ -15,6 +15,31 @@ TEST_DATA = [
     {"location_id": "LOC-003", "city": "TestC", "county": "TX", "state": "TX", "median_income": 150000.0, "crime_index": 10.0, "growth_index": 10.0, "home_price": 800000.0, "rent_price": 3000.0, "population": 5000, "lat": 0.0, "lon": 0.0},
 ]
 
+@pytest.fixture(autouse=True)
+def reset_cache_breaker():
+    # The breaker is process-global; don't let one test's Redis failures leak into the next
+    from app.db.circuit_breaker import cache_breaker
+    cache_breaker.reset()
+    yield
+    cache_breaker.reset()
+
+@pytest.fixture(autouse=True)
+def reset_resident_tables():
+    # Per-worker derived tables are keyed by dataset version, which tests don't always change
+    from app.db.aggregates import region_aggregates
+    from app.db.distributions import feature_distributions
+    from app.db.suggest_index import suggest_index
+    from app.core.http_cache import encoded_bodies
+    region_aggregates.clear()
+    feature_distributions.clear()
+    suggest_index.clear()
+    encoded_bodies.clear()
+    yield
+    region_aggregates.clear()
+    feature_distributions.clear()
+    suggest_index.clear()
+    encoded_bodies.clear()
+
 @pytest.fixture
 def mock_db():
     # Setup an in-memory db for testing
@@ -28,6 +53,20 @@ def mock_db():
     yield conn
     conn.close()
 
+@pytest.fixture
+def isolated_data_dir(tmp_path, monkeypatch):
+    # Point the version counter and dataset store at a scratch dir, never the real data dir
+    from app.db import dataset_version, dataset_store
+    monkeypatch.setattr(dataset_version, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(dataset_version, "VERSION_FILE", str(tmp_path / "dataset_version"))
+    monkeypatch.setattr(dataset_version, "LOCK_FILE", str(tmp_path / "dataset_version.lock"))
+    monkeypatch.setattr(dataset_store, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(dataset_store, "BASE_FILE", str(tmp_path / "locations.parquet"))
+    monkeypatch.setattr(dataset_store, "MANIFEST_FILE", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(dataset_store, "DISTRIBUTION_FILE", str(tmp_path / "distribution.json"))
+    monkeypatch.setattr(dataset_store, "DELTA_DIR", str(tmp_path / "deltas"))
+    return tmp_path
+
 @pytest.fixture
 def mock_redis_client():
     return MockRedis()
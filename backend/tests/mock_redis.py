@@ -1,25 +1,73 @@
+import asyncio
 import json
-from typing import Optional
+from typing import List, Optional
+
+class MockPipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def setex(self, key: str, time: int, value: str):
+        self._commands.append((key, value))
+        return self
+
+    async def execute(self):
+        # The whole pipeline is a single round-trip
+        self._redis.round_trips += 1
+        for key, value in self._commands:
+            self._redis._store[key] = value
+        results = [True] * len(self._commands)
+        self._commands = []
+        return results
 
 class MockRedis:
     def __init__(self):
         self._store = {}
+        self.round_trips = 0
 
     async def get(self, key: str) -> Optional[str]:
+        self.round_trips += 1
         return self._store.get(key)
-        
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        self.round_trips += 1
+        return [self._store.get(key) for key in keys]
+
     async def setex(self, key: str, time: int, value: str):
+        self.round_trips += 1
         self._store[key] = value
 
+    def pipeline(self, transaction: bool = True):
+        return MockPipeline(self)
+
     async def ping(self):
         return True
 
 class MockFailingRedis(MockRedis):
     async def get(self, key: str) -> Optional[str]:
         raise ConnectionError("Redis is down")
-        
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        raise ConnectionError("Redis is down")
+
     async def setex(self, key: str, time: int, value: str):
         raise ConnectionError("Redis is down")
         
     async def ping(self):
         return False
+
+class MockSlowRedis(MockRedis):
+    """Redis in a brownout: answers, but far too slowly."""
+    def __init__(self, delay: float = 1.0):
+        super().__init__()
+        self.delay = delay
+
+    async def get(self, key: str) -> Optional[str]:
+        self.round_trips += 1
+        await asyncio.sleep(self.delay)
+        return self._store.get(key)
+
+    async def setex(self, key: str, time: int, value: str):
+        self.round_trips += 1
+        await asyncio.sleep(self.delay)
+        self._store[key] = value
@@ -0,0 +1,33 @@
+import pytest
+
+from app.db.repositories import LocationRepository
+from tests.performance.conftest import SELECTIVITIES, home_price_cutoff
+
+@pytest.mark.parametrize("state", [None, "CA"], ids=lambda s: f"state={s}")
+def test_get_locations(benchmark, bench_conn, state):
+    repo = LocationRepository(bench_conn)
+    benchmark(repo.get_locations, state, 40, 20)
+
+@pytest.mark.parametrize("selectivity", SELECTIVITIES, ids=lambda s: f"sel={s}")
+def test_get_all_locations_for_scoring(benchmark, bench_conn, selectivity):
+    repo = LocationRepository(bench_conn)
+    benchmark(repo.get_all_locations_for_scoring, {"max_home_price": home_price_cutoff(selectivity)})
+
+def test_get_all_locations_for_scoring_by_state(benchmark, bench_conn):
+    repo = LocationRepository(bench_conn)
+    benchmark(repo.get_all_locations_for_scoring, {"state": "CA", "min_income": 60000})
+
+def test_get_feature_stats(benchmark, bench_conn):
+    repo = LocationRepository(bench_conn)
+    benchmark(repo.get_feature_stats)
+
+def test_compute_feature_stats(benchmark, bench_conn):
+    repo = LocationRepository(bench_conn)
+    benchmark(repo.compute_feature_stats)
+
+@pytest.mark.parametrize("batch", [1, 100], ids=lambda n: f"ids={n}")
+def test_get_locations_by_ids(benchmark, bench_conn, dataset, batch):
+    repo = LocationRepository(bench_conn)
+    step = max(dataset // batch, 1)
+    ids = [f"LOC-{i:06d}" for i in range(1, dataset + 1, step)][:batch]
+    benchmark(repo.get_locations_by_ids, ids)
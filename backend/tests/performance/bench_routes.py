@@ -0,0 +1,44 @@
+import pytest
+
+from tests.performance.conftest import SELECTIVITIES, home_price_cutoff
+
+BYPASS = {"X-Bypass-Cache": "true"}
+
+def recommend_payload(selectivity: float) -> dict:
+    return {
+        "weights": {"median_income": 1.0, "crime_index": 0.8, "home_price": 0.5},
+        "filters": {"max_home_price": home_price_cutoff(selectivity)},
+        "limit": 20
+    }
+
+@pytest.mark.parametrize("selectivity", SELECTIVITIES, ids=lambda s: f"sel={s}")
+def test_recommend_cache_miss(benchmark, bench_client, event_loop_runner, selectivity):
+    payload = recommend_payload(selectivity)
+    response = benchmark(lambda: event_loop_runner(bench_client.post("/recommend", json=payload, headers=BYPASS)))
+    assert response.status_code == 200
+
+def test_recommend_cache_hit(benchmark, bench_client, event_loop_runner):
+    payload = recommend_payload(0.1)
+    event_loop_runner(bench_client.post("/recommend", json=payload))
+    response = benchmark(lambda: event_loop_runner(bench_client.post("/recommend", json=payload)))
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("cached", [False, True], ids=["miss", "hit"])
+def test_search(benchmark, bench_client, event_loop_runner, cached):
+    headers = {} if cached else BYPASS
+    event_loop_runner(bench_client.get("/locations/search?state=CA&limit=50"))
+    response = benchmark(lambda: event_loop_runner(bench_client.get("/locations/search?state=CA&limit=50", headers=headers)))
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip", "br"])
+def test_search_local_hit(benchmark, bench_client, event_loop_runner, encoding):
+    headers = {"Accept-Encoding": encoding}
+    event_loop_runner(bench_client.get("/locations/search?state=CA&limit=100", headers=headers))
+    response = benchmark(lambda: event_loop_runner(bench_client.get("/locations/search?state=CA&limit=100", headers=headers)))
+    assert response.status_code == 200
+
+def test_search_not_modified(benchmark, bench_client, event_loop_runner):
+    etag = event_loop_runner(bench_client.get("/locations/search?state=CA&limit=100")).headers["etag"]
+    headers = {"If-None-Match": etag}
+    response = benchmark(lambda: event_loop_runner(bench_client.get("/locations/search?state=CA&limit=100", headers=headers)))
+    assert response.status_code == 304
@@ -0,0 +1,30 @@
+import pytest
+
+from app.db.repositories import LocationRepository
+from app.schemas.scoring import ScoringWeights
+from app.scoring.engine import score_locations, SCORABLE_FEATURES
+from app.scoring.skyline import pareto_frontier
+from app.scoring.normalization import Normalizer, STRATEGIES, MINMAX, QUANTILE_POINTS
+from tests.performance.conftest import SELECTIVITIES, home_price_cutoff
+
+WEIGHTS = ScoringWeights(median_income=1.0, crime_index=0.8, growth_index=0.3, home_price=0.5, rent_price=0.5)
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("selectivity", SELECTIVITIES, ids=lambda s: f"sel={s}")
+def test_score_locations(benchmark, bench_conn, selectivity, strategy):
+    repo = LocationRepository(bench_conn)
+    rows = repo.get_all_locations_for_scoring({"max_home_price": home_price_cutoff(selectivity)})
+    stats = repo.get_feature_stats()
+    # Precomputed once per dataset version in the app, so outside the timed call here too
+    distribution = repo.compute_feature_distribution(QUANTILE_POINTS) if strategy != MINMAX else None
+
+    # score_locations rewrites total_score/features in place, so reusing the list is fair
+    benchmark(score_locations, rows, stats, WEIGHTS, Normalizer(strategy, stats, distribution))
+
+@pytest.mark.parametrize("selectivity", SELECTIVITIES, ids=lambda s: f"sel={s}")
+def test_pareto_frontier(benchmark, bench_conn, selectivity):
+    repo = LocationRepository(bench_conn)
+    rows = repo.get_all_locations_for_scoring({"max_home_price": home_price_cutoff(selectivity)})
+    stats = repo.get_feature_stats()
+
+    benchmark(pareto_frontier, rows, stats, SCORABLE_FEATURES)
@@ -0,0 +1,92 @@
+"""
+Shared fixtures for the in-process benchmark suite (bench_*.py).
+Datasets are produced by scripts/generate_dummy_data.py and cached on disk per
+(rows, seed), so only the first run at a given size pays for generation.
+
+Sizes default to 10k and 100k rows; set BENCH_SIZES=10000,100000,1000000,5000000
+for the full sweep.
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+
+import duckdb
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.db import dataset_store, dataset_version
+from app.db.connection import get_db
+from app.db.redis import get_redis
+from app.main import app
+from tests.mock_redis import MockRedis
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "generate_dummy_data.py")
+BENCH_SEED = 42
+BENCH_SIZES = [int(n) for n in os.environ.get("BENCH_SIZES", "10000,100000").split(",")]
+BENCH_DATA_DIR = os.environ.get("BENCH_DATA_DIR", os.path.join(tempfile.gettempdir(), "locofinder-bench"))
+
+# Share of rows kept by the max_home_price filter; home prices are uniform on [100k, 1.5M]
+SELECTIVITIES = [0.01, 0.1, 0.5, 1.0]
+
+def home_price_cutoff(selectivity: float) -> float:
+    return 100000 + selectivity * 1400000
+
+def _load_generator():
+    spec = importlib.util.spec_from_file_location("generate_dummy_data", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def dataset_path(rows: int) -> str:
+    path = os.path.join(BENCH_DATA_DIR, f"locations-{rows}-seed{BENCH_SEED}.parquet")
+    if not os.path.exists(path):
+        _load_generator().generate_data(rows, output=path, seed=BENCH_SEED)
+    return path
+
+@pytest.fixture(scope="module", params=BENCH_SIZES, ids=lambda n: f"rows={n}")
+def dataset(request, tmp_path_factory):
+    """Points the dataset store at a generated file of the parametrized size."""
+    rows = request.param
+    scratch = tmp_path_factory.mktemp(f"store-{rows}")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(dataset_store, "BASE_FILE", dataset_path(rows))
+        mp.setattr(dataset_store, "MANIFEST_FILE", str(scratch / "manifest.json"))
+        mp.setattr(dataset_store, "DISTRIBUTION_FILE", str(scratch / "distribution.json"))
+        mp.setattr(dataset_store, "DELTA_DIR", str(scratch / "deltas"))
+        mp.setattr(dataset_version, "DATA_DIR", str(scratch))
+        mp.setattr(dataset_version, "VERSION_FILE", str(scratch / "dataset_version"))
+        mp.setattr(dataset_version, "LOCK_FILE", str(scratch / "dataset_version.lock"))
+        yield rows
+
+@pytest.fixture(scope="module")
+def bench_conn(dataset):
+    conn = duckdb.connect(':memory:')
+    yield conn
+    conn.close()
+
+@pytest.fixture(scope="module")
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+@pytest.fixture(scope="module")
+def bench_client(dataset, bench_conn, event_loop_runner):
+    """ASGI client against the real routes, with MockRedis standing in for Redis."""
+    redis = MockRedis()
+
+    async def override_get_db():
+        yield bench_conn
+
+    async def override_get_redis():
+        yield redis
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_redis] = override_get_redis
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+    yield client
+    event_loop_runner(client.aclose())
+    app.dependency_overrides.clear()
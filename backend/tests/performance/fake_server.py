@@ -0,0 +1,28 @@
+"""
+Runs the API in-process with MockRedis in place of Redis, for local load tests:
+    python -m tests.performance.fake_server --port 8000
+"""
+import argparse
+
+import uvicorn
+
+from app.db.redis import get_redis
+from app.main import app
+from tests.mock_redis import MockRedis
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the API backed by an in-memory fake Redis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    redis = MockRedis()
+
+    async def override_get_redis():
+        yield redis
+
+    app.dependency_overrides[get_redis] = override_get_redis
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,212 @@
-from locust import HttpUser, task, between
+"""
+Mixed-workload load profile for the Locofinder API.
+
+Query popularity is Zipf-distributed over a fixed catalog, so the warm phase
+exercises the Redis hit path the way real traffic does, while the cold phase
+forces misses with X-Bypass-Cache. Stats are grouped per endpoint and phase,
+and p50/p95/p99 are checked against SLOs when the run ends (non-zero exit on
+violation).
+
+Run against a local server backed by a fake Redis:
+    python -m tests.performance.fake_server &
+    locust -f tests/performance/locustfile.py --headless -u 50 -r 10 -t 2m --host http://localhost:8000
+
+Environment knobs:
+    LOAD_MODE            closed (default) or open (constant arrival rate, Poisson)
+    LOAD_TARGET_RPS      open-loop arrival rate across all users (default 50)
+    LOAD_COLD_SECONDS    length of the initial cache-miss phase (default 30)
+    LOAD_ZIPF_S          Zipf exponent for query popularity (default 1.1)
+    LOAD_CATALOG_SIZE    distinct queries per endpoint (default 500)
+    LOAD_LOCATION_COUNT  location ids to explain, LOC-000001.. (default 10000)
+    LOAD_SLO_FILE        JSON {"<endpoint>": {"p50": ms, "p95": ms, "p99": ms}}
+"""
+import json
+import os
 import random
+import time
+from itertools import accumulate
+
+import gevent
+from locust import HttpUser, task, between, events
+
+MODE = os.environ.get("LOAD_MODE", "closed")
+TARGET_RPS = float(os.environ.get("LOAD_TARGET_RPS", "50"))
+COLD_SECONDS = float(os.environ.get("LOAD_COLD_SECONDS", "30"))
+ZIPF_S = float(os.environ.get("LOAD_ZIPF_S", "1.1"))
+CATALOG_SIZE = int(os.environ.get("LOAD_CATALOG_SIZE", "500"))
+LOCATION_COUNT = int(os.environ.get("LOAD_LOCATION_COUNT", "10000"))
+
+STATES = ["CA", "TX", "NY", "IN", "FL", "OH", "WA", "CO", "GA", "PA", None]
+
+# Milliseconds, matched against the endpoint part of the stats name
+DEFAULT_SLOS = {
+    "/locations/search": {"p50": 50, "p95": 200, "p99": 500},
+    "/recommend": {"p50": 150, "p95": 750, "p99": 1500},
+    "/scoring/explain": {"p50": 50, "p95": 200, "p99": 500},
+    "/scoring/schema": {"p50": 30, "p95": 100, "p99": 250},
+}
+
+def load_slos() -> dict:
+    path = os.environ.get("LOAD_SLO_FILE")
+    if not path:
+        return DEFAULT_SLOS
+    with open(path, "r", encoding="utf-8") as f:
+        return {**DEFAULT_SLOS, **json.load(f)}
+
+class ZipfCatalog:
+    """A fixed list of items where item k is requested with probability ~ 1/k^s."""
+
+    def __init__(self, items: list, s: float):
+        self.items = items
+        self.cum_weights = list(accumulate(1.0 / (k ** s) for k in range(1, len(items) + 1)))
 
-class LocofinderBenchmarkUser(HttpUser):
-    # Wait between 1 and 3 seconds between requests per user
-    wait_time = between(1.0, 3.0)
-    
-    # State options to randomize queries and observe cache warm/cold
-    STATES = ["CA", "TX", "NY", "IN", "FL", "OH", None]
-
-    @task(3) # 3x more likely to run than the others
-    def get_locations_search(self):
-        """Simulate browsing paginated search results"""
-        state = random.choice(self.STATES)
-        limit = random.choice([10, 20, 50])
-        offset = random.choice([0, limit, limit*2])
-        
-        params = {"limit": limit, "offset": offset}
+    def sample(self):
+        return random.choices(self.items, cum_weights=self.cum_weights)[0]
+
+def build_search_catalog(rng: random.Random) -> list:
+    catalog = []
+    for _ in range(CATALOG_SIZE):
+        limit = rng.choice([10, 20, 50])
+        params = {"limit": limit, "offset": rng.choice([0, limit, limit * 2])}
+        state = rng.choice(STATES)
         if state:
             params["state"] = state
-            
-        self.client.get(
-            "/locations/search", 
-            params=params,
-            headers={"X-Bypass-Cache": "true"},
-            name="/locations/search (Cache Miss)" # Group by name in report
-        )
+        catalog.append(params)
+    return catalog
 
-    @task(1)
-    def post_recommend(self):
-        """Simulate a weighted recommendation (heavier sorting op)"""
-        state = random.choice(self.STATES)
-        
+def build_recommend_catalog(rng: random.Random) -> list:
+    catalog = []
+    for _ in range(CATALOG_SIZE):
         payload = {
             "weights": {
-                "median_income": random.uniform(0, 1),
-                "home_price": random.uniform(0, 1),
-                "crime_index": random.uniform(0.5, 1) # people usually care about crime
+                # Slider positions snap to 0.1 steps in the UI, so repeats are realistic
+                "median_income": round(rng.uniform(0, 1), 1),
+                "home_price": round(rng.uniform(0, 1), 1),
+                "crime_index": round(rng.uniform(0.5, 1), 1)
             },
             "limit": 20
         }
-        
+        state = rng.choice(STATES)
         if state:
             payload["filters"] = {"state": state}
-            
+        catalog.append(payload)
+    return catalog
+
+# Fixed seed: every worker and every run sees the same catalog and popularity ranking
+_rng = random.Random(1234)
+SEARCH_QUERIES = ZipfCatalog(build_search_catalog(_rng), ZIPF_S)
+RECOMMEND_QUERIES = ZipfCatalog(build_recommend_catalog(_rng), ZIPF_S)
+EXPLAIN_IDS = ZipfCatalog([f"LOC-{i:06d}" for i in range(1, LOCATION_COUNT + 1)], ZIPF_S)
+
+RUN_STARTED = time.monotonic()
+
+def current_phase() -> str:
+    return "cold" if time.monotonic() - RUN_STARTED < COLD_SECONDS else "warm"
+
+class MixedWorkload:
+    """Request mix shared by the closed- and open-loop users."""
+
+    def request_headers(self, phase: str) -> dict:
+        return {"X-Bypass-Cache": "true"} if phase == "cold" else {}
+
+    def search(self):
+        phase = current_phase()
+        self.client.get(
+            "/locations/search",
+            params=SEARCH_QUERIES.sample(),
+            headers=self.request_headers(phase),
+            name=f"/locations/search [{phase}]"
+        )
+
+    def recommend(self):
+        phase = current_phase()
         self.client.post(
             "/recommend",
-            json=payload,
-            headers={"X-Bypass-Cache": "true"},
-            name="/recommend (Cache Miss)" 
+            json=RECOMMEND_QUERIES.sample(),
+            headers=self.request_headers(phase),
+            name=f"/recommend [{phase}]"
+        )
+
+    def explain(self):
+        phase = current_phase()
+        self.client.post(
+            f"/scoring/explain/{EXPLAIN_IDS.sample()}",
+            json=RECOMMEND_QUERIES.sample(),
+            name=f"/scoring/explain [{phase}]"
         )
+
+    def schema(self):
+        phase = current_phase()
+        self.client.get("/scoring/schema", name=f"/scoring/schema [{phase}]")
+
+    # Relative frequencies of the request mix
+    MIX = [("search", 6), ("recommend", 3), ("explain", 2), ("schema", 1)]
+
+    def pick(self):
+        names, weights = zip(*self.MIX)
+        return getattr(self, random.choices(names, weights=weights)[0])
+
+class ClosedLoopUser(MixedWorkload, HttpUser):
+    """Each user waits for its response, then thinks for a short while."""
+    abstract = MODE != "closed"
+    wait_time = between(0.2, 1.0)
+
+    @task
+    def mixed(self):
+        self.pick()()
+
+class OpenLoopUser(MixedWorkload, HttpUser):
+    """
+    Fires requests at Poisson arrival times regardless of whether earlier ones
+    have finished, so a slow server builds a queue instead of throttling the
+    load. That is what exposes tail latency under bursts.
+    """
+    abstract = MODE != "open"
+
+    @task
+    def arrivals(self):
+        rate_per_user = TARGET_RPS / max(self.environment.runner.user_count, 1)
+        gevent.spawn(self.pick())
+        gevent.sleep(random.expovariate(rate_per_user))
+
+    def wait_time(self):
+        return 0
+
+@events.test_start.add_listener
+def reset_phase_clock(environment, **kwargs):
+    global RUN_STARTED
+    RUN_STARTED = time.monotonic()
+
+@events.quitting.add_listener
+def report_slos(environment, **kwargs):
+    slos = load_slos()
+    violations = []
+    rows = []
+    for entry in sorted(environment.stats.entries.values(), key=lambda e: e.name):
+        if entry.num_requests == 0:
+            continue
+        endpoint = entry.name.split(" [")[0]
+        slo = slos.get(endpoint, {})
+        observed = {
+            "p50": entry.get_response_time_percentile(0.50),
+            "p95": entry.get_response_time_percentile(0.95),
+            "p99": entry.get_response_time_percentile(0.99),
+        }
+        marks = []
+        for key, value in observed.items():
+            limit = slo.get(key)
+            ok = limit is None or value <= limit
+            marks.append(f"{value:>7.0f}{'' if ok else '!'}")
+            if not ok:
+                violations.append(f"{entry.name} {key}={value:.0f}ms > {limit}ms")
+        rows.append(f"{entry.name:<34} {entry.num_requests:>8} {entry.num_failures:>6} " + " ".join(marks))
+
+    print("\nLatency SLO report (ms, '!' = over SLO)")
+    print(f"{'name':<34} {'reqs':>8} {'fails':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("\n".join(rows))
+
+    if violations:
+        print("\nSLO violations:\n  " + "\n  ".join(violations))
+        environment.process_exit_code = 1
+    else:
+        print("\nAll endpoints within SLO")
@@ -0,0 +1,74 @@
+import pytest
+import duckdb
+import polars as pl
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.db import dataset_store
+from app.db.aggregates import region_aggregates
+from app.services.ingestion_service import IngestionService
+from tests.conftest import TEST_DATA
+
+pytestmark = pytest.mark.usefixtures("isolated_data_dir")
+
+@pytest.fixture
+def conn():
+    pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+    conn = duckdb.connect(':memory:')
+    yield conn
+    conn.close()
+
+@pytest.fixture
+async def aggregates_client(conn):
+    # No get_db override: the endpoint never asks for a request connection
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+@pytest.mark.asyncio
+async def test_state_and_county_aggregates(aggregates_client: AsyncClient):
+    response = await aggregates_client.get("/locations/aggregates")
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["state"] for r in data["regions"]] == ["CA", "TX"]
+
+    ca = data["regions"][0]
+    assert ca["count"] == 2
+    income = ca["features"]["median_income"]
+    assert (income["min"], income["mean"], income["max"]) == (80000.0, 90000.0, 100000.0)
+    assert income["p50"] == 90000.0
+
+    response = await aggregates_client.get("/locations/aggregates", params={"level": "county", "state": "CA"})
+    counties = response.json()["regions"]
+    assert [(r["state"], r["county"], r["count"]) for r in counties] == [("CA", "CA", 2)]
+
+@pytest.mark.asyncio
+async def test_upsert_refreshes_only_touched_states(aggregates_client: AsyncClient, conn, monkeypatch):
+    await aggregates_client.get("/locations/aggregates")
+    tx_before = region_aggregates.by_state("TX")[0]
+
+    IngestionService(conn).upsert_locations([dict(TEST_DATA[0], location_id="LOC-700", county="Other", median_income=120000.0)])
+
+    from app.db.repositories import LocationRepository
+    seen = []
+    original = LocationRepository.compute_region_aggregates
+    def spy(self, states=None):
+        seen.append(states)
+        return original(self, states)
+    monkeypatch.setattr(LocationRepository, "compute_region_aggregates", spy)
+
+    data = (await aggregates_client.get("/locations/aggregates", params={"state": "CA"})).json()
+    assert seen == [["CA"]]
+    assert data["regions"][0]["count"] == 3
+    assert data["regions"][0]["features"]["median_income"]["max"] == 120000.0
+    # Untouched states keep their resident rows
+    assert region_aggregates.by_state("TX")[0] is tx_before
+
+    counties = (await aggregates_client.get("/locations/aggregates", params={"level": "county"})).json()["regions"]
+    assert [(r["state"], r["county"]) for r in counties] == [("CA", "CA"), ("CA", "Other"), ("TX", "TX")]
+    assert seen == [["CA"]]
+
+@pytest.mark.asyncio
+async def test_aggregates_rejects_unknown_level(aggregates_client: AsyncClient):
+    response = await aggregates_client.get("/locations/aggregates", params={"level": "city"})
+    assert response.status_code == 422
@@ -45,7 +45,18 @@ def patch_repository(monkeypatch):
             stats[feat] = {"min": float(row[i*2]), "max": float(row[i*2 + 1])}
         return stats
 
+    def mock_compute_feature_distribution(self, points):
+        features = ["median_income", "crime_index", "growth_index", "home_price", "rent_price"]
+        grid = ", ".join(repr(i / (points - 1)) for i in range(points))
+        selects = [f"AVG({f}), STDDEV_POP({f}), quantile_cont({f}, [{grid}])" for f in features]
+        row = self.conn.execute(f"SELECT {', '.join(selects)} FROM test_data_table").fetchone()
+        return {
+            feat: {"mean": row[i*3], "std": row[i*3 + 1], "quantiles": [float(v) for v in row[i*3 + 2]]}
+            for i, feat in enumerate(features)
+        }
+
     monkeypatch.setattr(LocationRepository, "get_locations", mock_get_locations)
+    monkeypatch.setattr(LocationRepository, "compute_feature_distribution", mock_compute_feature_distribution)
     monkeypatch.setattr(LocationRepository, "get_all_locations_for_scoring", mock_get_all_locations_for_scoring)
     monkeypatch.setattr(LocationRepository, "get_feature_stats", mock_get_feature_stats)
 
@@ -119,3 +130,64 @@ async def test_scoring_schema(client: AsyncClient):
     income_feat = next(f for f in data if f["feature_name"] == "median_income")
     assert income_feat["min_value"] == 80000.0
     assert income_feat["max_value"] == 150000.0
+
+@pytest.mark.asyncio
+async def test_pareto_frontier(client: AsyncClient):
+    payload = {"features": ["rent_price", "median_income"], "filters": {"state": "CA"}}
+    response = await client.post("/recommend/pareto", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+
+    # LOC-001 has the higher income, LOC-002 the lower rent: neither dominates
+    assert data["total_analyzed"] == 2
+    assert data["features"] == ["median_income", "rent_price"]
+    assert {r["location"]["location_id"] for r in data["results"]} == {"LOC-001", "LOC-002"}
+    assert set(data["results"][0]["normalized"]) == {"median_income", "rent_price"}
+
+    # Across all states LOC-003 is best on income, crime and growth, but not on price
+    response = await client.post("/recommend/pareto", json={"features": ["median_income", "crime_index"]})
+    assert [r["location"]["location_id"] for r in response.json()["results"]] == ["LOC-003"]
+
+@pytest.mark.asyncio
+async def test_pareto_rejects_unknown_feature(client: AsyncClient):
+    response = await client.post("/recommend/pareto", json={"features": ["population"]})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_scoring_sensitivity(client: AsyncClient):
+    payload = {"weights": {"median_income": 1.0, "home_price": 1.0}, "filters": {"state": "CA"}, "limit": 1}
+    response = await client.post("/scoring/sensitivity", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+
+    # Same scores as test_recommend_locations: LOC-001 1.036, LOC-002 1.0
+    assert [entry["location_id"] for entry in data["top"]] == ["LOC-001"]
+    assert data["next_entrant"]["location_id"] == "LOC-002"
+    ranges = {entry["feature_name"]: entry for entry in data["ranges"]}
+
+    # LOC-002 is cheaper, so more weight on home price lets it overtake LOC-001
+    home = ranges["home_price"]
+    assert home["min_weight"] is None
+    # Gap is 2/7 - 0.25 = 1/28 and closes at 0.25 per unit of weight
+    assert home["max_weight"] == pytest.approx(1.0 + 1 / 7)
+    assert home["above_max"] == {"kind": "enter", "location_id": "LOC-002", "overtakes_id": "LOC-001"}
+
+    # LOC-001 earns more, so only cutting the income weight can change the winner
+    income = ranges["median_income"]
+    assert income["max_weight"] is None
+    assert income["below_min"]["location_id"] == "LOC-002"
+
+@pytest.mark.asyncio
+async def test_recommend_percentile_normalization(client: AsyncClient):
+    payload = {"weights": {"median_income": 1.0}, "normalization": "percentile", "limit": 5}
+    response = await client.post("/recommend", json=payload)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["location"]["location_id"] for r in results] == ["LOC-003", "LOC-001", "LOC-002"]
+    # Incomes 80k/100k/150k are the dataset's 0th, 50th and 100th percentiles
+    assert [r["total_score"] for r in results] == pytest.approx([1.0, 0.5, 0.0])
+
+@pytest.mark.asyncio
+async def test_recommend_rejects_unknown_normalization(client: AsyncClient):
+    response = await client.post("/recommend", json={"weights": {"median_income": 1.0}, "normalization": "robust"})
+    assert response.status_code == 422
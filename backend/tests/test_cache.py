@@ -0,0 +1,127 @@
+import os
+import pytest
+import subprocess
+import polars as pl
+from httpx import AsyncClient
+
+from app.db import dataset_store
+from app.db.dataset_version import get_dataset_version, bump_dataset_version
+from app.db.repositories import LocationRepository
+from app.db.cache import CacheClient, drain_pending_writes
+from tests.conftest import TEST_DATA
+
+pytestmark = pytest.mark.usefixtures("isolated_data_dir")
+
+def make_location(location_id):
+    return {
+        "location_id": location_id, "city": "City", "county": "County", "state": "CA",
+        "median_income": 50000, "crime_index": 50, "growth_index": 5, "home_price": 300000,
+        "rent_price": 1500, "population": 10000, "lat": 0.0, "lon": 0.0
+    }
+
+def test_version_starts_at_zero_and_bumps():
+    assert get_dataset_version() == 0
+    assert bump_dataset_version() == 1
+    assert bump_dataset_version() == 2
+    assert get_dataset_version() == 2
+
+@pytest.mark.asyncio
+async def test_version_bump_invalidates_search_cache(client: AsyncClient, mock_redis_client, monkeypatch):
+    current = {"id": "OLD"}
+    monkeypatch.setattr(LocationRepository, "get_locations", lambda self, state, offset, limit: ([make_location(current["id"])], 1))
+
+    response = await client.get("/locations/search")
+    assert response.json()["locations"][0]["location_id"] == "OLD"
+    # Cache writes are fire-and-forget
+    await drain_pending_writes()
+    assert all(key.startswith("v0") for key in mock_redis_client._store)
+
+    # Data changes underneath; the cached response is still served until the version moves
+    current["id"] = "NEW"
+    response = await client.get("/locations/search")
+    assert response.json()["locations"][0]["location_id"] == "OLD"
+
+    bump_dataset_version()
+    response = await client.get("/locations/search")
+    assert response.json()["locations"][0]["location_id"] == "NEW"
+
+@pytest.mark.asyncio
+async def test_cache_client_batches_round_trips(mock_redis_client):
+    cache = CacheClient(mock_redis_client)
+    await cache.set_many({"a": "1", "b": "2", "c": "3"})
+    assert mock_redis_client.round_trips == 1
+
+    assert await cache.get_many(["a", "missing", "c"]) == ["1", None, "3"]
+    assert mock_redis_client.round_trips == 2
+    assert await cache.get_many([]) == []
+    assert mock_redis_client.round_trips == 2
+
+@pytest.mark.asyncio
+async def test_batch_explain_caches_each_location(client: AsyncClient, mock_redis_client, monkeypatch):
+    pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+    fetched = []
+    get_locations_by_ids = LocationRepository.get_locations_by_ids
+
+    def recording_get_locations_by_ids(self, location_ids):
+        fetched.append(list(location_ids))
+        return get_locations_by_ids(self, location_ids)
+
+    monkeypatch.setattr(LocationRepository, "get_locations_by_ids", recording_get_locations_by_ids)
+    ids = [row["location_id"] for row in TEST_DATA]
+    body = {"weights": {"median_income": 1.0, "crime_index": 0.5}}
+
+    first = await client.post("/scoring/explain", json={**body, "location_ids": [ids[0], "NOPE"]})
+    assert [row["location_id"] for row in first.json()["results"]] == [ids[0]]
+    assert first.json()["missing"] == ["NOPE"]
+    await drain_pending_writes()
+    # One MGET, then one pipeline for the new entry
+    assert mock_redis_client.round_trips == 2
+
+    second = await client.post("/scoring/explain", json={**body, "location_ids": ids[:2]})
+    await drain_pending_writes()
+    assert mock_redis_client.round_trips == 4
+    # Only the location not cached yet was read and scored
+    assert fetched[-1] == [ids[1]]
+    assert second.json()["results"][0] == first.json()["results"][0]
+    single = await client.post(f"/scoring/explain/{ids[1]}", json=body)
+    assert single.json() == second.json()["results"][1]
+
+def fake_generator(rows):
+    """Stands in for the generator subprocess: writes `rows` to the --output path"""
+    def run(cmd, **kwargs):
+        output = cmd[cmd.index("--output") + 1]
+        pl.DataFrame(rows, schema=dataset_store.location_schema()).write_parquet(output)
+        return subprocess.CompletedProcess(cmd, 0, stdout="ok", stderr="")
+    return run
+
+@pytest.mark.asyncio
+async def test_reset_dummy_data_bumps_version(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(subprocess, "run", fake_generator(TEST_DATA))
+
+    response = await client.post("/admin/reset-dummy-data?rows=10")
+    assert response.status_code == 200
+    assert response.json()["dataset_version"] == 1
+    assert get_dataset_version() == 1
+
+@pytest.mark.asyncio
+async def test_reset_blocked_when_validation_fails(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(subprocess, "run", fake_generator(TEST_DATA))
+    assert (await client.post("/admin/reset-dummy-data?rows=3")).json()["status"] == "success"
+    published = pl.read_parquet(dataset_store.BASE_FILE)
+
+    # One corrupt home price (and a NaN) in an otherwise normal regeneration
+    corrupt = [dict(row) for row in TEST_DATA]
+    corrupt[0]["home_price"] = 9.9e12
+    corrupt[1]["crime_index"] = float("nan")
+    monkeypatch.setattr(subprocess, "run", fake_generator(corrupt))
+
+    data = (await client.post("/admin/reset-dummy-data?rows=3")).json()
+    assert data["status"] == "error"
+    failed = {(issue["check"], issue["column"]) for issue in data["validation"]["errors"]}
+    assert ("nulls", "crime_index") in failed
+    assert ("drift", "home_price") in failed
+
+    # Nothing was published: same file, same version
+    assert get_dataset_version() == 1
+    assert pl.read_parquet(dataset_store.BASE_FILE).equals(published)
+    assert not os.path.exists(f"{dataset_store.BASE_FILE}.staged")
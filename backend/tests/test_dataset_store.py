@@ -0,0 +1,217 @@
+import os
+import time
+import pytest
+import duckdb
+import polars as pl
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.db import dataset_store
+from app.db.repositories import LocationRepository
+from app.services.ingestion_service import IngestionService
+from tests.conftest import TEST_DATA
+
+pytestmark = pytest.mark.usefixtures("isolated_data_dir")
+
+@pytest.fixture
+def conn():
+    pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+    conn = duckdb.connect(':memory:')
+    yield conn
+    conn.close()
+
+def make_row(location_id, state="CA", **overrides):
+    row = dict(TEST_DATA[0], location_id=location_id, state=state)
+    row.update(overrides)
+    return row
+
+def test_upsert_replaces_and_appends(conn):
+    service = IngestionService(conn)
+    result = service.upsert_locations([
+        make_row("LOC-001", median_income=90000.0),
+        make_row("LOC-999", state="NY"),
+    ])
+    assert result["upserted"] == 2
+    assert result["inserted"] == 1
+    assert result["affected_states"] == ["CA", "NY"]
+
+    repo = LocationRepository(conn)
+    locations, total = repo.get_locations(None, 0, 100)
+    assert total == 4
+    by_id = {loc["location_id"]: loc for loc in locations}
+    assert by_id["LOC-001"]["median_income"] == 90000.0
+    assert by_id["LOC-999"]["state"] == "NY"
+
+def test_newest_delta_wins(conn):
+    service = IngestionService(conn)
+    service.upsert_locations([make_row("LOC-002", crime_index=30.0)])
+    service.upsert_locations([make_row("LOC-002", crime_index=35.0)])
+
+    loc = LocationRepository(conn).get_location_by_id("LOC-002")
+    assert loc["crime_index"] == 35.0
+
+def test_incremental_stats_match_full_scan(conn):
+    service = IngestionService(conn)
+    repo = LocationRepository(conn)
+
+    # Extends the range (within the validation drift limit) without touching an extreme
+    service.upsert_locations([make_row("LOC-500", median_income=180000.0)])
+    # Replaces the row holding the income minimum (LOC-002, 80k), forcing a rescan
+    service.upsert_locations([make_row("LOC-002", median_income=95000.0)])
+
+    assert repo.get_feature_stats() == repo.compute_feature_stats()
+    assert repo.get_feature_stats()["median_income"] == {"min": 95000.0, "max": 180000.0}
+
+def test_upsert_only_bumps_touched_scopes(conn):
+    service = IngestionService(conn)
+    # A new row inside the existing min/max leaves the stats scope untouched
+    result = service.upsert_locations([make_row("LOC-600", state="TX")])
+    assert result["stats_changed"] is False
+
+    assert dataset_store.get_generation("state:TX") == 1
+    assert dataset_store.get_generation(dataset_store.ALL_STATES_SCOPE) == 1
+    assert dataset_store.get_generation("state:CA") == 0
+    assert dataset_store.get_generation(dataset_store.STATS_SCOPE) == 0
+
+def test_compaction_preserves_data(conn, monkeypatch):
+    monkeypatch.setattr(settings, "DELTA_COMPACTION_THRESHOLD", 2)
+    service = IngestionService(conn)
+    service.upsert_locations([make_row("LOC-700")])
+    result = service.upsert_locations([make_row("LOC-001", rent_price=1800.0)])
+    assert result["compacted"] is True
+    assert dataset_store.read_manifest()["deltas"] == []
+
+    repo = LocationRepository(conn)
+    locations, total = repo.get_locations(None, 0, 100)
+    assert total == 4
+    assert repo.get_location_by_id("LOC-001")["rent_price"] == 1800.0
+
+@pytest.mark.asyncio
+async def test_upsert_endpoint(client: AsyncClient, conn):
+    response = await client.post("/admin/upsert-locations", json=[make_row("LOC-800", state="WA")])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "success"
+    assert data["inserted"] == 1
+    assert data["affected_states"] == ["WA"]
+
+def test_feature_distribution_follows_upserts(conn):
+    from app.db.distributions import feature_distributions
+    repo = LocationRepository(conn)
+
+    dist = feature_distributions.get(repo)
+    quantiles = dist["median_income"]["quantiles"]
+    assert (quantiles[0], quantiles[-1]) == (80000.0, 150000.0)
+    assert feature_distributions.get(repo) is dist
+
+    IngestionService(conn).upsert_locations([make_row("LOC-600", median_income=90000.0)])
+    dist = feature_distributions.get(repo)
+    assert dist["median_income"]["mean"] == pytest.approx((100000 + 80000 + 150000 + 90000) / 4)
+
+def test_workers_load_the_distribution_writers_publish(conn, monkeypatch):
+    from app.db.distributions import feature_distributions
+    IngestionService(conn).upsert_locations([make_row("LOC-601", median_income=90000.0)])
+
+    def scan(self, points):
+        raise AssertionError("the upsert already published this dataset's distribution")
+    monkeypatch.setattr(LocationRepository, "compute_feature_distribution", scan)
+
+    dist = feature_distributions.get(LocationRepository(conn))
+    assert dist["median_income"]["mean"] == pytest.approx((100000 + 80000 + 150000 + 90000) / 4)
+    assert len(dist["median_income"]["quantiles"]) == 1001
+
+def test_upsert_rejects_corrupt_batch(conn):
+    from app.services.validation_service import DatasetValidationError
+    service = IngestionService(conn)
+    manifest_before = dict(dataset_store.read_manifest())
+
+    with pytest.raises(DatasetValidationError) as excinfo:
+        service.upsert_locations([make_row("LOC-800", home_price=9.9e12)])
+    assert [issue["check"] for issue in excinfo.value.report["errors"]] == ["drift"]
+    # Nothing written, so stats stay unskewed
+    assert dataset_store.read_manifest() == manifest_before
+    assert LocationRepository(conn).get_location_by_id("LOC-800") is None
+
+def test_location_base_matches_dataset_contract():
+    from app.schemas.dataset import LOCATION_COLUMNS
+    from app.schemas.location import LocationBase
+    kinds = {str: "string", float: "float", int: "int"}
+    assert {name: kinds[field.annotation] for name, field in LocationBase.model_fields.items()} == LOCATION_COLUMNS
+
+def test_schema_check_against_dataset_contract(conn, tmp_path):
+    from app.services.validation_service import ValidationService
+    bad = pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).drop("lon").with_columns(pl.col("population").cast(pl.String))
+    path = str(tmp_path / "bad.parquet")
+    bad.write_parquet(path)
+
+    report = ValidationService(conn).validate_parquet(path)
+    assert not report["passed"]
+    assert {issue["column"] for issue in report["errors"]} == {"lon", "population"}
+
+@pytest.mark.asyncio
+async def test_upsert_endpoint_returns_422_on_validation_failure(conn):
+    from httpx import ASGITransport
+    from app.main import app
+    from app.db.connection import get_db
+
+    async def override_get_db():
+        yield conn
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/admin/upsert-locations", json=[make_row("LOC-801", rent_price=-1e9)])
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 422
+    assert response.json()["detail"]["errors"][0]["column"] == "rent_price"
+
+def _rewrite_keeping_stat(path, content):
+    # What a replace can look like to stat(): reused inode, same size, same mtime
+    st = os.stat(path)
+    with open(path, "r+", encoding="utf-8") as f:
+        f.write(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    after = os.stat(path)
+    assert (after.st_ino, after.st_size, after.st_mtime_ns) == (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def test_manifest_change_is_seen_when_stat_metadata_is_unchanged():
+    from app.db.dataset_version import dataset_write_lock
+    with dataset_write_lock():
+        dataset_store.publish_stats({}, ["state:CA"])
+    assert dataset_store.get_generation("state:CA") == 1
+    with open(dataset_store.MANIFEST_FILE, "r", encoding="utf-8") as f:
+        manifest = f.read()
+    _rewrite_keeping_stat(dataset_store.MANIFEST_FILE, manifest.replace('"state:CA": 1', '"state:CA": 2'))
+    assert dataset_store.get_generation("state:CA") == 2
+
+def test_version_bump_is_seen_when_stat_metadata_is_unchanged():
+    from app.db import dataset_version
+    dataset_version.bump_dataset_version()
+    assert dataset_version.get_dataset_version() == 1
+    _rewrite_keeping_stat(dataset_version.VERSION_FILE, "2")
+    assert dataset_version.get_dataset_version() == 2
+
+def _hold_write_lock(locked, seconds):
+    from app.db.dataset_version import dataset_write_lock
+    with dataset_write_lock():
+        locked.set()
+        time.sleep(seconds)
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork to share the patched lock path")
+def test_write_lock_is_held_across_processes_until_released():
+    import multiprocessing
+    from app.db import dataset_version
+    ctx = multiprocessing.get_context("fork")
+    locked = ctx.Event()
+    holder = ctx.Process(target=_hold_write_lock, args=(locked, 0.5))
+    holder.start()
+    assert locked.wait(5)
+
+    started = time.monotonic()
+    with dataset_version.dataset_write_lock():
+        waited = time.monotonic() - started
+    holder.join()
+
+    assert waited > 0.2
+    # Never deleted, so a later writer can't end up locking a different file
+    assert os.path.exists(dataset_version.LOCK_FILE)
@@ -0,0 +1,75 @@
+import time
+import pytest
+import duckdb
+import polars as pl
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, slow_query_log
+from app.db import dataset_store
+from app.db.repositories import LocationRepository
+from tests.conftest import TEST_DATA
+
+def busy_wait(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+def test_profiler_collects_collapsed_stacks():
+    profiler = SamplingProfiler()
+    assert profiler.start(seconds=5, interval=0.001)
+    assert not profiler.start(seconds=5, interval=0.001)  # one session at a time
+
+    busy_wait(0.2)
+    collapsed = profiler.stop()
+
+    assert not profiler.running
+    lines = collapsed.strip().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_wait" in line for line in lines)
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_and_explained_on_demand(client: AsyncClient, isolated_data_dir, monkeypatch):
+    pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+    # Threshold of 0 disables logging, so use the smallest positive one
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-9)
+    slow_query_log.clear()
+
+    conn = duckdb.connect(':memory:')
+    LocationRepository(conn).get_all_locations_for_scoring({"state": "CA"})
+    conn.close()
+
+    entry = slow_query_log.entries(1)[0]
+    assert "state = ?" in entry["sql"]
+    assert entry["params"] == ["CA"]
+    assert entry["rows"] == 2
+    # Never re-run inside the slow request itself
+    assert entry["explain_analyze"] is None
+
+    assert (await client.get("/admin/slow-queries?limit=1")).json()["queries"][0]["explain_analyze"] is None
+    explained = (await client.get("/admin/slow-queries?limit=1&explain=true")).json()["queries"][0]
+    assert "ANALYZE" in explained["explain_analyze"].upper()
+    assert slow_query_log.entries(1)[0]["explain_analyze"] == explained["explain_analyze"]
+
+@pytest.mark.asyncio
+async def test_profiler_endpoints(client: AsyncClient):
+    response = await client.post("/admin/profiler/start?seconds=0.2&interval_ms=1")
+    assert response.status_code == 200
+    assert (await client.post("/admin/profiler/start?seconds=1")).status_code == 409
+
+    response = await client.post("/admin/profiler/stop")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (await client.get("/admin/profiler")).json()["running"] is False
+
+@pytest.mark.asyncio
+async def test_slow_query_endpoint(client: AsyncClient):
+    slow_query_log.clear()
+    slow_query_log.record("SELECT 1", [], 900.0, 1, None)
+    data = (await client.get("/admin/slow-queries")).json()
+    assert data["queries"][0]["sql"] == "SELECT 1"
+
+    await client.delete("/admin/slow-queries")
+    assert (await client.get("/admin/slow-queries")).json()["queries"] == []
@@ -0,0 +1,36 @@
+import importlib.util
+import os
+import sys
+import polars as pl
+
+from app.db import dataset_store
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "scripts", "generate_dummy_data.py")
+
+def load_generator():
+    spec = importlib.util.spec_from_file_location("generate_dummy_data", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Worker processes unpickle generate_chunk by module name
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def test_generated_schema_matches_store(tmp_path):
+    gen = load_generator()
+    output = str(tmp_path / "locations.parquet")
+    gen.generate_data(1000, output=output, chunk_size=300, workers=1)
+
+    df = pl.read_parquet(output)
+    assert df.height == 1000
+    assert dict(df.schema) == dataset_store.location_schema()
+    assert df["location_id"].is_unique().all()
+    assert df["location_id"][0] == "LOC-000001"
+    assert df["median_income"].min() >= 30000 and df["median_income"].max() <= 150000
+
+def test_output_independent_of_worker_count(tmp_path):
+    gen = load_generator()
+    serial, parallel = str(tmp_path / "serial.parquet"), str(tmp_path / "parallel.parquet")
+    gen.generate_data(1000, output=serial, chunk_size=250, workers=1)
+    gen.generate_data(1000, output=parallel, chunk_size=250, workers=2)
+
+    assert pl.read_parquet(serial).equals(pl.read_parquet(parallel))
@@ -0,0 +1,163 @@
+import gzip
+import json
+import threading
+
+import brotli
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.http_cache import (
+    BROTLI, GZIP, IDENTITY, EncodedBodyCache, encoded_etag, etag_matches, negotiate_encoding
+)
+from app.db.cache import drain_pending_writes
+from app.db.connection import get_db
+from app.db.dataset_version import bump_dataset_version
+from app.db.repositories import LocationRepository
+from app.main import app
+from tests.conftest import TEST_DATA
+
+pytestmark = pytest.mark.usefixtures("isolated_data_dir")
+
+@pytest.fixture(autouse=True)
+def patch_repository(monkeypatch):
+    calls = {"get_locations": 0}
+
+    def get_locations(self, state, offset, limit):
+        calls["get_locations"] += 1
+        # Pad the rows so bodies clear the compression threshold
+        return [dict(row, city=row["city"] * 50) for row in TEST_DATA[:limit]], len(TEST_DATA)
+
+    stats = {feat: {"min": 0.0, "max": 1.0} for feat in ("median_income", "crime_index", "growth_index", "home_price", "rent_price")}
+    monkeypatch.setattr(LocationRepository, "get_locations", get_locations)
+    monkeypatch.setattr(LocationRepository, "get_feature_stats", lambda self: stats)
+    return calls
+
+def fail_on_db():
+    raise AssertionError("a 304 must not open a DB connection")
+    yield
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br") == BROTLI
+    assert negotiate_encoding("gzip;q=0.5, br;q=0") == GZIP
+    assert negotiate_encoding("*") == BROTLI
+    assert negotiate_encoding("deflate") == IDENTITY
+    assert negotiate_encoding(None) == IDENTITY
+
+def test_etag_matches_list_weak_and_wildcard():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+def test_etags_differ_per_encoding_and_all_match():
+    assert encoded_etag('"b"', IDENTITY) == '"b"'
+    assert encoded_etag('"b"', BROTLI) == '"b-br"'
+    assert encoded_etag('"b"', GZIP) == '"b-gzip"'
+    assert etag_matches('"b-br"', '"b"')
+    assert etag_matches('W/"b-gzip"', '"b"')
+    assert not etag_matches('"a-br"', '"b"')
+
+def test_body_cache_encodes_once_and_evicts_by_bytes(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_COMPRESS_MIN_BYTES", 0)
+    cache = EncodedBodyCache(max_bytes=3000)
+    body = json.dumps({"x": "y" * 1000}).encode()
+
+    encoded, encoding = cache.put('"1"', body, GZIP)
+    assert encoding == GZIP and gzip.decompress(encoded) == body
+    # Other encodings are derived from the stored identity body
+    encoded, encoding = cache.get('"1"', BROTLI)
+    assert encoding == BROTLI and brotli.decompress(encoded) == body
+
+    cache.put('"2"', body)
+    cache.put('"3"', body)
+    assert cache.stats()["bytes"] <= 3000
+    assert cache.get('"1"', IDENTITY) is None
+    assert cache.get('"3"', IDENTITY) == (body, IDENTITY)
+
+@pytest.mark.asyncio
+async def test_large_bodies_compress_off_the_event_loop(monkeypatch):
+    import app.core.http_cache as http_cache
+    threads = []
+    encode_body = http_cache.encode_body
+
+    def recording_encode_body(body, encoding):
+        threads.append(threading.current_thread())
+        return encode_body(body, encoding)
+
+    monkeypatch.setattr(http_cache, "encode_body", recording_encode_body)
+    monkeypatch.setattr(settings, "HTTP_COMPRESS_THREADPOOL_MIN_BYTES", 2000)
+    cache = EncodedBodyCache(max_bytes=1 << 20)
+    small, large = b"x" * 1000, b"x" * 4000
+
+    assert gzip.decompress((await cache.put_async('"s"', small, GZIP))[0]) == small
+    assert brotli.decompress((await cache.put_async('"l"', large, BROTLI))[0]) == large
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+
+@pytest.mark.asyncio
+async def test_search_304_before_db_or_redis(client: AsyncClient, mock_redis_client, patch_repository):
+    first = await client.get("/locations/search?limit=2")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    await drain_pending_writes()
+    # A different query is a different representation
+    other = await client.get("/locations/search?limit=1", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    await drain_pending_writes()
+
+    round_trips = mock_redis_client.round_trips
+    app.dependency_overrides[get_db] = fail_on_db
+    response = await client.get("/locations/search?limit=2", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert mock_redis_client.round_trips == round_trips
+    assert patch_repository["get_locations"] == 2
+
+@pytest.mark.asyncio
+async def test_search_serves_precompressed_bodies(client: AsyncClient, mock_redis_client, patch_repository):
+    plain = await client.get("/locations/search?limit=3", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    await drain_pending_writes()
+
+    for encoding in (GZIP, BROTLI):
+        response = await client.get("/locations/search?limit=3", headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        # A strong tag per encoding; all of them revalidate against the same data
+        assert response.headers["etag"] == encoded_etag(plain.headers["etag"], encoding)
+        assert response.json() == plain.json()
+    # Both came from this worker's encoded bodies: no second DB query, no Redis read
+    assert patch_repository["get_locations"] == 1
+    assert mock_redis_client.round_trips == 2  # the first request's GET miss and SETEX
+
+    revalidated = await client.get(
+        "/locations/search?limit=3", headers={"Accept-Encoding": BROTLI, "If-None-Match": encoded_etag(plain.headers["etag"], BROTLI)}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == encoded_etag(plain.headers["etag"], BROTLI)
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_sent_without_reserializing(client: AsyncClient, mock_redis_client):
+    from app.core.http_cache import encoded_bodies
+    first = await client.get("/locations/search?limit=2", headers={"Accept-Encoding": "identity"})
+    await drain_pending_writes()
+    encoded_bodies.clear()
+
+    cached = next(iter(mock_redis_client._store.values()))
+    response = await client.get("/locations/search?limit=2", headers={"Accept-Encoding": "identity"})
+    assert response.content == cached.encode() == first.content
+
+@pytest.mark.asyncio
+async def test_etag_changes_with_the_dataset(client: AsyncClient):
+    etag = (await client.get("/scoring/schema")).headers["etag"]
+    assert (await client.get("/scoring/schema", headers={"If-None-Match": etag})).status_code == 304
+
+    bump_dataset_version()
+    response = await client.get("/scoring/schema", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 5
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+from httpx import AsyncClient
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.http_cache import encoded_bodies
+from app.db.cache import drain_pending_writes
+from app.db.repositories import LocationRepository
+from tests.conftest import TEST_DATA
+
+@pytest.fixture(autouse=True)
+def patch_repository(monkeypatch):
+    monkeypatch.setattr(LocationRepository, "get_locations", lambda self, state, offset, limit: (TEST_DATA[:limit], len(TEST_DATA)))
+
+@pytest.mark.asyncio
+async def test_server_timing_header_lists_stages(client: AsyncClient):
+    response = await client.get("/locations/search?limit=2", headers={"X-Bypass-Cache": "true"})
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    for name in ("get_locations", "cache_set", "serialize", "total"):
+        assert f"{name};dur=" in timing
+
+def test_render_while_new_series_are_added():
+    counter = metrics.Counter("test_total", "test")
+    histogram = metrics.Histogram("test_seconds", "test", metrics.LATENCY_BUCKETS)
+    done = threading.Event()
+
+    def writer():
+        for i in range(20000):
+            counter.inc(namespace=f"ns{i}", result="hit")
+            histogram.observe(0.01, route=f"/r{i}")
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    # Scrapes copy the series under the lock, so new keys never break the iteration
+    while not done.is_set():
+        counter.render()
+        histogram.render()
+    thread.join()
+    assert len(counter.items()) == len(histogram.items()) == 20000
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_cache_and_rows(client: AsyncClient):
+    await client.get("/locations/search?limit=2")
+    await drain_pending_writes()
+    # Drop this worker's encoded body so the next request goes to Redis
+    encoded_bodies.clear()
+    await client.get("/locations/search?limit=2")
+    await client.get("/locations/search?limit=2")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'locofinder_cache_requests_total{namespace="locations_search",result="hit"}' in body
+    assert 'locofinder_cache_requests_total{namespace="locations_search",result="local_hit"}' in body
+    assert 'locofinder_stage_seconds_bucket{stage="get_locations",le="+Inf"}' in body
+    assert 'locofinder_rows_returned_count{route="/locations/search"}' in body
+    assert 'locofinder_request_seconds_count{route="/locations/search"}' in body
+    assert 'locofinder_cache_hit_ratio{namespace="locations_search"}' in body
+
+@pytest.mark.asyncio
+async def test_disabled_metrics_skip_instrumentation(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    before = metrics.STAGE_SECONDS.count(stage="get_locations")
+
+    response = await client.get("/locations/search?limit=2", headers={"X-Bypass-Cache": "true"})
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert metrics.STAGE_SECONDS.count(stage="get_locations") == before
+    assert (await client.get("/metrics")).status_code == 404
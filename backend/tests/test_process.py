@@ -0,0 +1,83 @@
+import os
+import sys
+import subprocess
+import pytest
+import polars as pl
+from httpx import AsyncClient
+
+from app.core.process import ProcessState, memory_usage, parse_smaps_rollup
+from app.db import dataset_store
+from app.db.aggregates import region_aggregates
+from app.db.distributions import feature_distributions
+from app.db.suggest_index import suggest_index
+from app.db.warmup import warm_resident_state
+from tests.conftest import TEST_DATA
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SMAPS_ROLLUP = """\
+55d0c0a00000-7ffd1b5f2000 ---p 00000000 00:00 0                          [rollup]
+Rss:              204800 kB
+Pss:               71680 kB
+Shared_Clean:     143360 kB
+Shared_Dirty:      10240 kB
+Private_Clean:      2048 kB
+Private_Dirty:     49152 kB
+Referenced:       204800 kB
+"""
+
+def test_parse_smaps_rollup():
+    assert parse_smaps_rollup(SMAPS_ROLLUP) == {"rss_mb": 200.0, "pss_mb": 70.0, "shared_mb": 150.0, "private_mb": 50.0}
+
+def test_memory_usage_of_this_process():
+    memory = memory_usage()
+    assert memory
+    assert all(value > 0 for value in memory.values())
+
+def test_worker_reports_readiness_over_pipe():
+    state = ProcessState()
+    ready_r, ready_w = os.pipe()
+    state.become_worker(2, forked_at=state.started_at, ready_fd=ready_w)
+
+    ms = state.mark_ready()
+    pid, reported = os.read(ready_r, 4096).decode("ascii").split()
+    os.close(ready_r)
+
+    assert state.ready
+    assert int(pid) == os.getpid()
+    assert float(reported) == pytest.approx(ms, abs=0.001)
+    snapshot = state.snapshot()
+    assert snapshot["role"] == "worker"
+    assert snapshot["worker_index"] == 2
+    assert snapshot["timings_ms"]["ready_ms"] == round(ms, 3)
+
+def test_app_import_defers_polars():
+    # Read-only workers never need polars; it loads on the first write or validation
+    code = "import sys, app.main; print('polars' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+def test_warm_resident_state(isolated_data_dir):
+    pl.DataFrame(TEST_DATA, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+
+    timings = warm_resident_state()
+
+    assert set(timings) == {"suggest_index", "feature_distributions", "region_aggregates"}
+    assert not suggest_index.is_stale()
+    assert not region_aggregates.is_stale()
+    assert [s["name"] for s in suggest_index.lookup("testa")] == ["TestA"]
+    assert [row["state"] for row in region_aggregates.by_state()] == ["CA", "TX"]
+    assert feature_distributions._key is not None
+
+def test_warm_resident_state_without_data(isolated_data_dir):
+    assert warm_resident_state() == {}
+    assert suggest_index.is_stale()
+
+@pytest.mark.asyncio
+async def test_process_endpoint(client: AsyncClient):
+    response = await client.get("/admin/process")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["role"] == "single"
+    assert body["pid"] == os.getpid()
+    assert body["memory"]
@@ -1,8 +1,13 @@
+import asyncio
 import pytest
+import time
 from httpx import AsyncClient, ASGITransport
 from app.main import app
-from app.db.redis import get_redis
-from tests.mock_redis import MockFailingRedis
+from app.core.config import settings
+from app.db.cache import CacheClient
+from app.db.circuit_breaker import CircuitBreaker, cache_breaker
+from app.db.redis import get_redis, redis_client
+from tests.mock_redis import MockFailingRedis, MockSlowRedis
 
 @pytest.fixture
 async def failing_redis_client_app():
@@ -51,3 +56,75 @@ async def test_search_redis_down_resilience(failing_redis_client_app: AsyncClien
     assert response.status_code == 200
     data = response.json()
     assert data["locations"][0]["location_id"] == "RESILIENT"
+
+def test_breaker_opens_then_probes_once():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()       # the single probe
+    assert not breaker.allow()   # everyone else keeps failing fast
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    cache = CacheClient(MockSlowRedis(delay=1.0), breaker=breaker)
+
+    probe = asyncio.create_task(cache.get("key"))
+    await asyncio.sleep(0.01)
+    assert breaker.state == "half_open"
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.allow()       # the next call gets to probe
+    assert not breaker.allow()
+
+@pytest.mark.asyncio
+async def test_slow_redis_trips_breaker_without_adding_latency(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_OP_TIMEOUT_MS", 20.0)
+    slow = MockSlowRedis(delay=1.0)
+    cache = CacheClient(slow)
+
+    for _ in range(settings.REDIS_BREAKER_FAILURE_THRESHOLD):
+        started = time.perf_counter()
+        assert await cache.get("key") is None
+        assert time.perf_counter() - started < 0.5
+    assert cache_breaker.state == "open"
+
+    # Open breaker: Redis isn't even called
+    calls = slow.round_trips
+    assert await cache.get("key") is None
+    assert await cache.get_many(["a", "b"]) == [None, None]
+    assert slow.round_trips == calls
+
+@pytest.mark.asyncio
+async def test_search_without_redis_pool(monkeypatch):
+    from app.db.repositories import LocationRepository
+    monkeypatch.setattr(LocationRepository, "get_locations", lambda self, state, offset, limit: ([], 0))
+    monkeypatch.setattr(redis_client, "pool", None)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/locations/search")
+        assert response.status_code == 200
+        health = (await ac.get("/health")).json()
+        assert health["redis"] == "disconnected"
+        assert health["redis_circuit"]["state"] == "closed"
+
+@pytest.mark.asyncio
+async def test_health_reports_open_circuit(failing_redis_client_app: AsyncClient):
+    for _ in range(settings.REDIS_BREAKER_FAILURE_THRESHOLD):
+        cache_breaker.record_failure()
+    data = (await failing_redis_client_app.get("/health")).json()
+    assert data["redis_circuit"]["state"] == "open"
+    assert data["redis_circuit"]["seconds_until_probe"] > 0
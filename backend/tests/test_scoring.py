@@ -1,5 +1,9 @@
 import pytest
-from app.scoring.engine import normalize_minmax, normalize_zscore, score_locations
+import numpy as np
+from app.scoring.engine import normalize_minmax, normalize_zscore, score_locations, SCORABLE_FEATURES, EngineFeature
+from app.scoring.skyline import skyline_indices, pareto_frontier
+from app.scoring.sensitivity import weight_sensitivity
+from app.scoring.normalization import Normalizer, QUANTILE_POINTS
 from app.schemas.scoring import ScoringWeights
 
 def test_normalize_minmax_standard():
@@ -43,3 +47,119 @@ def test_score_locations():
     # L2 has min income (0.0) and max rent (0.0 reversed)
     assert result[1]["location_id"] == "L2"
     assert result[1]["total_score"] == 0.0
+
+def brute_force_skyline(values):
+    keep = set()
+    for i, p in enumerate(values):
+        if not any((q >= p).all() and (q > p).any() for q in values):
+            keep.add(i)
+    return keep
+
+@pytest.mark.parametrize("dims", [2, 3, 5])
+def test_skyline_matches_brute_force(dims):
+    rng = np.random.default_rng(dims)
+    # Coarse values so ties and exact duplicates actually occur
+    values = rng.integers(0, 20, size=(700, dims)).astype(float)
+    assert set(skyline_indices(values).tolist()) == brute_force_skyline(values)
+
+def test_pareto_frontier_honours_minimize():
+    locations = [
+        {"location_id": "cheap", "median_income": 50000, "rent_price": 1000},
+        {"location_id": "rich", "median_income": 100000, "rent_price": 3000},
+        {"location_id": "balanced", "median_income": 75000, "rent_price": 2000},
+        # Poorer and pricier than "balanced"
+        {"location_id": "dominated", "median_income": 70000, "rent_price": 2500},
+    ]
+    db_stats = {"median_income": {"min": 50000, "max": 100000}, "rent_price": {"min": 1000, "max": 3000}}
+    features = [EngineFeature(name="median_income", minimize=False), EngineFeature(name="rent_price", minimize=True)]
+
+    frontier = pareto_frontier(locations, db_stats, features)
+    assert {entry["location"]["location_id"] for entry in frontier} == {"cheap", "rich", "balanced"}
+    cheap = next(entry for entry in frontier if entry["location"]["location_id"] == "cheap")
+    assert cheap["normalized"] == {"median_income": 0.0, "rent_price": 1.0}
+
+def test_recommend_winner_is_on_frontier():
+    rng = np.random.default_rng(7)
+    locations = [
+        {"location_id": f"L{i}", **{feat.name: float(v) for feat, v in zip(SCORABLE_FEATURES, rng.uniform(0, 100, 5))}}
+        for i in range(300)
+    ]
+    db_stats = {feat.name: {"min": 0.0, "max": 100.0} for feat in SCORABLE_FEATURES}
+    frontier_ids = {entry["location"]["location_id"] for entry in pareto_frontier(locations, db_stats, SCORABLE_FEATURES)}
+
+    weights = ScoringWeights(median_income=0.7, crime_index=0.2, growth_index=0.1, home_price=0.9, rent_price=0.4)
+    best = score_locations([dict(loc) for loc in locations], db_stats, weights)[0]
+    assert best["location_id"] in frontier_ids
+
+def test_weight_sensitivity_ranges_are_exact():
+    rng = np.random.default_rng(11)
+    locations = [
+        {"location_id": f"L{i}", **{feat.name: float(v) for feat, v in zip(SCORABLE_FEATURES, rng.uniform(0, 100, 5))}}
+        for i in range(200)
+    ]
+    db_stats = {feat.name: {"min": 0.0, "max": 100.0} for feat in SCORABLE_FEATURES}
+    weights = ScoringWeights(median_income=0.7, crime_index=0.2, growth_index=0.1, home_price=0.9, rent_price=0.4)
+
+    def top_ids(w, k=5):
+        return [loc["location_id"] for loc in score_locations([dict(loc) for loc in locations], db_stats, w)[:k]]
+
+    analysis = weight_sensitivity(locations, db_stats, weights, limit=5)
+    baseline = top_ids(weights)
+    assert [entry["location_id"] for entry in analysis["top"]] == baseline
+    assert analysis["next_entrant"]["location_id"] == top_ids(weights, k=6)[5]
+
+    for entry in analysis["ranges"]:
+        name = entry["feature_name"]
+        for bound, event, inside, outside in (
+            (entry["max_weight"], entry["above_max"], -1e-6, 1e-6),
+            (entry["min_weight"], entry["below_min"], 1e-6, -1e-6),
+        ):
+            if bound is None:
+                continue
+            assert top_ids(weights.model_copy(update={name: bound + inside})) == baseline
+            changed = top_ids(weights.model_copy(update={name: bound + outside}))
+            assert changed != baseline
+            assert event["location_id"] in changed
+            if event["kind"] == "enter":
+                assert event["location_id"] not in baseline
+                assert event["overtakes_id"] not in changed
+
+def make_distribution(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "quantiles": np.quantile(values, np.linspace(0, 1, QUANTILE_POINTS)).tolist()
+    }
+
+def test_normalizer_strategies_match_scalar_functions():
+    values = np.array([10.0, 20.0, 55.0, 90.0])
+    stats = {"x": {"min": 10.0, "max": 90.0}}
+    dist = {"x": make_distribution(values)}
+
+    minmax = Normalizer("minmax", stats).normalize("x", values, minimize=True)
+    assert minmax.tolist() == [normalize_minmax(v, 10.0, 90.0, minimize=True) for v in values]
+
+    zscore = Normalizer("zscore", stats, dist).normalize("x", values, minimize=False)
+    expected = [normalize_zscore(v, dist["x"]["mean"], dist["x"]["std"]) for v in values]
+    assert zscore == pytest.approx(expected)
+
+def test_percentile_normalization_resists_outliers():
+    # 99 ordinary home prices and one mansion
+    prices = np.append(np.linspace(200000, 400000, 99), 1500000.0)
+    stats = {"home_price": {"min": float(prices.min()), "max": float(prices.max())}}
+    dist = {"home_price": make_distribution(prices)}
+    probe = np.array([200000.0, 300000.0, 400000.0])
+
+    minmax = Normalizer("minmax", stats).normalize("home_price", probe, minimize=True)
+    percentile = Normalizer("percentile", stats, dist).normalize("home_price", probe, minimize=True)
+
+    # Min-max squeezes the ordinary homes into the top 20% of the scale...
+    assert minmax.min() > 0.8
+    # ...while ranks spread them over the whole scale
+    assert percentile == pytest.approx([1.0, 0.5, 0.0101], abs=0.01)
+
+def test_percentile_mass_point_maps_to_mid_rank():
+    values = np.array([0.0] * 50 + [1.0] * 50)
+    normalizer = Normalizer("percentile", {}, {"x": make_distribution(values)})
+    assert normalizer.normalize("x", np.array([0.0, 1.0]), minimize=False) == pytest.approx([0.25, 0.75], abs=0.01)
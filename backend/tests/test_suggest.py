@@ -0,0 +1,97 @@
+import random
+import time
+
+import polars as pl
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.db import dataset_store
+from app.db import suggest_index as suggest_module
+from app.db.dataset_version import bump_dataset_version
+from app.db.suggest_index import PrefixIndex, normalize_term, suggest_index
+from tests.conftest import TEST_DATA
+
+pytestmark = pytest.mark.usefixtures("isolated_data_dir")
+
+def write_base(rows):
+    pl.DataFrame(rows, schema=dataset_store.location_schema()).write_parquet(dataset_store.BASE_FILE)
+
+@pytest.fixture
+async def suggest_client():
+    write_base([
+        dict(TEST_DATA[0], location_id="LOC-1", city="San Jose", county="Santa Clara", population=1000000),
+        dict(TEST_DATA[0], location_id="LOC-2", city="San José", county="Santa Clara", population=50),
+        dict(TEST_DATA[0], location_id="LOC-3", city="Sacramento", county="Sacramento", population=500000),
+        dict(TEST_DATA[2], location_id="LOC-4", city="San Antonio", county="Bexar", population=1400000),
+        dict(TEST_DATA[2], location_id="LOC-5", city="San Antonio", county="Bexar", population=100000),
+    ])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+def brute_force(places, query, limit):
+    term = normalize_term(query)
+    matches = [p for p in places if normalize_term(p[0]).startswith(term)]
+    matches.sort(key=lambda p: (-p[4], normalize_term(p[0]), p[1], p[2]))
+    return [(p[0], p[1], p[2]) for p in matches[:limit]]
+
+def test_normalize_term_folds_case_accents_and_spaces():
+    assert normalize_term("  San  JOSÉ ") == "san jose"
+
+def test_lookup_matches_brute_force_with_precomputed_prefixes(monkeypatch):
+    monkeypatch.setattr(suggest_module, "SCAN_LIMIT", 8)
+    rng = random.Random(0)
+    syllables = ["san", "ta", "mar", "ia", "lo", "s", "an", "ge", "les", "port"]
+    places = [
+        ("".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))).title(), rng.choice(["city", "county"]),
+         rng.choice(["CA", "TX", "NY"]), None, rng.randint(0, 50), 1, None)
+        for _ in range(2000)
+    ]
+    index = PrefixIndex(places)
+    assert index._top, "short prefixes should have been precomputed"
+    for query in ["s", "sa", "san", "santa", "m", "lo", "port", "Ge", "x", "sanport"]:
+        got = [(s["name"], s["kind"], s["state"]) for s in index.lookup(query, 10)]
+        assert got == brute_force(places, query, 10), query
+
+@pytest.mark.asyncio
+async def test_suggest_ranks_by_population_and_folds_accents(suggest_client: AsyncClient):
+    response = await suggest_client.get("/locations/suggest", params={"q": "san"})
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert [(s["name"], s["kind"], s["state"]) for s in suggestions] == [
+        ("San Antonio", "city", "TX"), ("Santa Clara", "county", "CA"), ("San Jose", "city", "CA"), ("San José", "city", "CA")
+    ]
+    # Places aggregate their locations; cities point at the most populous one
+    assert suggestions[0]["population"] == 1500000
+    assert suggestions[0]["locations"] == 2
+    assert suggestions[0]["location_id"] == "LOC-4"
+    assert suggestions[1]["location_id"] is None
+
+    response = await suggest_client.get("/locations/suggest", params={"q": "SAN JOSÉ", "limit": 1})
+    assert [s["name"] for s in response.json()["suggestions"]] == ["San Jose"]
+
+    assert (await suggest_client.get("/locations/suggest", params={"q": ""})).status_code == 422
+
+@pytest.mark.asyncio
+async def test_suggest_rebuilds_on_dataset_change(suggest_client: AsyncClient):
+    assert (await suggest_client.get("/locations/suggest", params={"q": "fres"})).json()["suggestions"] == []
+
+    write_base([dict(TEST_DATA[0], location_id="LOC-9", city="Fresno", county="Fresno")])
+    bump_dataset_version()
+    names = [s["name"] for s in (await suggest_client.get("/locations/suggest", params={"q": "fres"})).json()["suggestions"]]
+    assert names == ["Fresno", "Fresno"]
+
+def test_suggest_lookup_is_sub_millisecond():
+    rng = random.Random(1)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    places = [
+        ("".join(rng.choice(letters) for _ in range(rng.randint(4, 12))), "city", "CA", None, rng.randint(0, 10**6), 1, None)
+        for _ in range(200_000)
+    ]
+    index = PrefixIndex(places)
+    queries = ["a", "b", "s", "st", "abc", "qz", "mnop", "zzzz"] * 50
+    started = time.perf_counter()
+    for query in queries:
+        index.lookup(query, 10)
+    assert (time.perf_counter() - started) / len(queries) < 0.001
@@ -1,3 +1,73 @@
 # Purpose: BLS ingestion connector
-def fetch_bls_data(series_id: str):
-    raise NotImplementedError('Implement BLS fetch logic')
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+
+from ingestion.framework import Connector, ConnectorError, IngestionResult, RequestSpec, SourceConfig, default_output
+
+# API v2 limits per request
+SERIES_PER_REQUEST = 50
+YEARS_PER_REQUEST = 20
+
+class BLSConnector(Connector):
+    """Time series observations, batched 50 series by up to 20 years per request."""
+    source = "bls"
+    schema = pa.schema([
+        ("series_id", pa.string()),
+        ("year", pa.int32()),
+        ("period", pa.string()),
+        ("value", pa.float64()),
+    ])
+
+    def __init__(self, series_ids: Sequence[str], start_year: int, end_year: int, config: Optional[SourceConfig] = None):
+        super().__init__(config)
+        self.series_ids = list(series_ids)
+        self.start_year = start_year
+        self.end_year = end_year
+
+    def requests(self) -> Iterable[RequestSpec]:
+        for first in range(self.start_year, self.end_year + 1, YEARS_PER_REQUEST):
+            last = min(first + YEARS_PER_REQUEST - 1, self.end_year)
+            for i in range(0, len(self.series_ids), SERIES_PER_REQUEST):
+                yield RequestSpec(
+                    "timeseries/data/",
+                    method="POST",
+                    json_body={
+                        "seriesid": self.series_ids[i:i + SERIES_PER_REQUEST],
+                        "startyear": str(first),
+                        "endyear": str(last),
+                    }
+                )
+
+    def request_kwargs(self, spec: RequestSpec) -> Dict[str, Any]:
+        # BLS takes the key in the JSON body, not the query string
+        kwargs = {"params": dict(spec.params), "json": spec.json_body, "data": spec.form}
+        if self.api_key():
+            kwargs["json"] = {**spec.json_body, self.config.api_key_param: self.api_key()}
+        return kwargs
+
+    def check_payload(self, payload: Any, request: RequestSpec) -> None:
+        # BLS answers failures (bad series, exhausted daily quota, ...) with HTTP 200
+        status = payload.get("status")
+        if status != "REQUEST_SUCCEEDED":
+            messages = "; ".join(payload.get("message") or []) or "no message"
+            raise ConnectorError(f"[{self.source}] {request.method} {request.path} returned {status}: {messages}")
+
+    def parse(self, payload: Any, request: RequestSpec) -> List[dict]:
+        records = []
+        for series in payload.get("Results", {}).get("series", []):
+            for point in series.get("data", []):
+                value = point.get("value")
+                records.append({
+                    "series_id": series["seriesID"],
+                    "year": int(point["year"]),
+                    "period": point["period"],
+                    # "-" marks a missing observation
+                    "value": float(value) if value not in (None, "", "-") else None,
+                })
+        return records
+
+def fetch_bls_data(series_id: str, start_year: int = 2015, end_year: int = 2024, output: Optional[str] = None) -> IngestionResult:
+    connector = BLSConnector([series_id], start_year, end_year)
+    return asyncio.run(connector.run(output or default_output("bls", f"{series_id}-{start_year}-{end_year}")))
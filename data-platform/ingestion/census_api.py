@@ -1,5 +1,71 @@
 # Purpose: Census ingestion connector
 # Key responsibilities: Fetch and normalize Census records
 # Inputs/Outputs: Inputs year/config, outputs canonical rows
-def fetch_census_data(year: int):
-    raise NotImplementedError('Implement Census fetch logic')
+import asyncio
+from typing import Any, Iterable, List, Optional
+
+import pyarrow as pa
+
+from ingestion.framework import Connector, IngestionResult, RequestSpec, SourceConfig, default_output
+from ingestion.states import STATE_FIPS
+
+# ACS 5-year variables -> canonical column
+ACS_VARIABLES = {
+    "B19013_001E": "median_income",
+    "B01003_001E": "population",
+    "B25077_001E": "home_price",
+    "B25064_001E": "rent_price",
+}
+
+class CensusConnector(Connector):
+    """County-level ACS 5-year estimates, one request per state."""
+    source = "census"
+    schema = pa.schema([
+        ("year", pa.int32()),
+        ("state_fips", pa.string()),
+        ("county_fips", pa.string()),
+        ("name", pa.string()),
+        ("median_income", pa.float64()),
+        ("population", pa.int64()),
+        ("home_price", pa.float64()),
+        ("rent_price", pa.float64()),
+    ])
+
+    def __init__(self, year: int, states: Optional[List[str]] = None, config: Optional[SourceConfig] = None):
+        super().__init__(config)
+        self.year = year
+        self.states = states or list(STATE_FIPS)
+
+    def requests(self) -> Iterable[RequestSpec]:
+        get = ",".join(["NAME", *ACS_VARIABLES])
+        for state in self.states:
+            yield RequestSpec(
+                f"{self.year}/acs/acs5",
+                params={"get": get, "for": "county:*", "in": f"state:{STATE_FIPS[state]}"}
+            )
+
+    def parse(self, payload: Any, request: RequestSpec) -> List[dict]:
+        # A header row, then one row of strings per county
+        header, *rows = payload
+        index = {name: i for i, name in enumerate(header)}
+        records = []
+        for row in rows:
+            record = {
+                "year": self.year,
+                "state_fips": row[index["state"]],
+                "county_fips": row[index["county"]],
+                "name": row[index["NAME"]],
+            }
+            for variable, column in ACS_VARIABLES.items():
+                value = row[index[variable]]
+                # The ACS reports suppressed estimates as large negative sentinels
+                number = float(value) if value not in (None, "") else None
+                if number is not None and number < 0:
+                    number = None
+                record[column] = int(number) if column == "population" and number is not None else number
+            records.append(record)
+        return records
+
+def fetch_census_data(year: int, output: Optional[str] = None) -> IngestionResult:
+    connector = CensusConnector(year)
+    return asyncio.run(connector.run(output or default_output("census", f"acs5-{year}")))
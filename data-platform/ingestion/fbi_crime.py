@@ -1,3 +1,52 @@
 # Purpose: FBI crime ingestion connector
-def fetch_fbi_crime(year: int):
-    raise NotImplementedError('Implement FBI fetch logic')
+import asyncio
+from typing import Any, Iterable, List, Optional
+
+import pyarrow as pa
+
+from ingestion.framework import Connector, IngestionResult, RequestSpec, SourceConfig, default_output
+from ingestion.states import STATE_FIPS
+
+class FBICrimeConnector(Connector):
+    """State-level annual crime estimates, one request per state."""
+    source = "fbi_crime"
+    schema = pa.schema([
+        ("state", pa.string()),
+        ("year", pa.int32()),
+        ("population", pa.int64()),
+        ("violent_crime", pa.int64()),
+        ("property_crime", pa.int64()),
+        ("crime_rate_per_100k", pa.float64()),
+    ])
+
+    def __init__(self, year: int, states: Optional[List[str]] = None, config: Optional[SourceConfig] = None):
+        super().__init__(config)
+        self.year = year
+        self.states = states or list(STATE_FIPS)
+
+    def requests(self) -> Iterable[RequestSpec]:
+        for state in self.states:
+            yield RequestSpec(f"estimate/state/{state}", params={"from": self.year, "to": self.year})
+
+    def parse(self, payload: Any, request: RequestSpec) -> List[dict]:
+        records = []
+        for row in payload.get("results", []):
+            population = row.get("population")
+            violent = row.get("violent_crime")
+            prop = row.get("property_crime")
+            rate = None
+            if population and violent is not None and prop is not None:
+                rate = (violent + prop) / population * 100_000
+            records.append({
+                "state": row["state_abbr"],
+                "year": int(row["year"]),
+                "population": population,
+                "violent_crime": violent,
+                "property_crime": prop,
+                "crime_rate_per_100k": rate,
+            })
+        return records
+
+def fetch_fbi_crime(year: int, output: Optional[str] = None) -> IngestionResult:
+    connector = FBICrimeConnector(year)
+    return asyncio.run(connector.run(output or default_output("fbi_crime", f"estimates-{year}")))
@@ -0,0 +1,268 @@
+# Purpose: Shared async runtime for ingestion connectors
+# Key responsibilities: Concurrent fetching with per-source limits, retries with backoff,
+#   on-disk response cache for replay, streaming record batches to parquet
+# Inputs/Outputs: Inputs a Connector + source config, outputs one parquet file per run
+import os
+import json
+import random
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import httpx
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+logger = logging.getLogger("data_platform")
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "configs", "data_sources.yaml")
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "backend", "data", "raw")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Cache modes: "off", "readwrite" (serve hits, store misses), "replay" (cache only, never the network)
+CACHE_MODES = ("off", "readwrite", "replay")
+
+class ConnectorError(Exception):
+    """A request failed for good (non-retryable status, retries exhausted, or a replay miss)."""
+
+@dataclass
+class SourceConfig:
+    name: str
+    base_url: str
+    max_concurrency: int = 8
+    max_retries: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    timeout: float = 30.0
+    batch_size: int = 50_000
+    cache_mode: str = "off"
+    cache_dir: Optional[str] = None
+    api_key_env: Optional[str] = None
+    api_key_param: str = "key"
+
+def load_source_config(name: str, path: str = CONFIG_FILE, **overrides: Any) -> SourceConfig:
+    """Settings for one source from data_sources.yaml; keyword overrides win (handy for tests)."""
+    with open(path, "r", encoding="utf-8") as f:
+        sources = yaml.safe_load(f).get("sources", {})
+    if name not in sources:
+        raise KeyError(f"No source '{name}' in {path}")
+
+    settings = dict(sources[name])
+    settings["base_url"] = settings.pop("endpoint", settings.get("base_url"))
+    settings.update(overrides)
+    config = SourceConfig(name=name, **settings)
+    if config.cache_mode not in CACHE_MODES:
+        raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got '{config.cache_mode}'")
+    return config
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """One HTTP request; `path` is relative to the source's base_url."""
+    path: str
+    method: str = "GET"
+    params: Dict[str, Any] = field(default_factory=dict)
+    json_body: Optional[Any] = None
+    form: Optional[Dict[str, str]] = None
+
+    def cache_key(self) -> str:
+        # Secrets are added at send time, so they never reach the key or the cache files
+        blob = json.dumps([self.method, self.path, self.params, self.json_body, self.form], sort_keys=True, default=str)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """JSON response bodies on disk, one file per request, written atomically."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, payload: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+@dataclass
+class IngestionResult:
+    source: str
+    output: str
+    records: int = 0
+    requests: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+
+class Connector:
+    """
+    Base class for a source. Subclasses set `source` and `schema` and implement
+    requests() and parse(); follow_up() adds pagination. run() does the rest:
+    up to max_concurrency requests in flight, retries with exponential backoff
+    and full jitter (honouring Retry-After), the response cache, and streaming
+    parsed rows to parquet one record batch at a time, so memory stays bounded
+    by batch_size no matter how many records the source has.
+    """
+    source: str = ""
+    schema: pa.Schema = pa.schema([])
+
+    def __init__(self, config: Optional[SourceConfig] = None):
+        self.config = config or load_source_config(self.source)
+        self.cache = ResponseCache(self.config.cache_dir) if self.config.cache_mode != "off" and self.config.cache_dir else None
+
+    def requests(self) -> Iterable[RequestSpec]:
+        raise NotImplementedError
+
+    def parse(self, payload: Any, request: RequestSpec) -> List[dict]:
+        raise NotImplementedError
+
+    def check_payload(self, payload: Any, request: RequestSpec) -> None:
+        """
+        Raise ConnectorError for a failure the source reports inside a 200
+        body. Runs before the payload is cached, so a failure is never replayed.
+        """
+
+    def follow_up(self, payload: Any, request: RequestSpec) -> Iterable[RequestSpec]:
+        """Further requests implied by a response (next page, cursor); none by default."""
+        return ()
+
+    def api_key(self) -> Optional[str]:
+        return os.environ.get(self.config.api_key_env) if self.config.api_key_env else None
+
+    def request_kwargs(self, spec: RequestSpec) -> Dict[str, Any]:
+        """httpx arguments for a spec; the API key goes in the query string unless overridden."""
+        params = dict(spec.params)
+        if self.api_key():
+            params[self.config.api_key_param] = self.api_key()
+        return {"params": params, "json": spec.json_body, "data": spec.form}
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), self.config.backoff_max)
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+
+    async def fetch(self, client: httpx.AsyncClient, spec: RequestSpec, result: IngestionResult) -> Any:
+        key = spec.cache_key()
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                result.cache_hits += 1
+                return cached
+            if self.config.cache_mode == "replay":
+                raise ConnectorError(f"[{self.source}] replay cache miss for {spec.method} {spec.path} {spec.params}")
+
+        for attempt in range(self.config.max_retries + 1):
+            response = None
+            try:
+                response = await client.request(spec.method, spec.path, **self.request_kwargs(spec))
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    payload = response.json()
+                    result.requests += 1
+                    self.check_payload(payload, spec)
+                    if self.cache is not None:
+                        self.cache.put(key, payload)
+                    return payload
+                reason = f"HTTP {response.status_code}"
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                reason = type(e).__name__
+            except httpx.HTTPStatusError as e:
+                raise ConnectorError(f"[{self.source}] {spec.method} {spec.path} failed: HTTP {e.response.status_code}") from e
+
+            if attempt == self.config.max_retries:
+                raise ConnectorError(f"[{self.source}] {spec.method} {spec.path} failed after {attempt + 1} attempts ({reason})")
+            delay = self._backoff(attempt, response)
+            result.retries += 1
+            logger.warning(f"[{self.source}] {spec.method} {spec.path} {reason}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _records(self, client: httpx.AsyncClient, result: IngestionResult) -> AsyncIterator[List[dict]]:
+        """Parsed pages as they arrive, from max_concurrency workers sharing one work queue."""
+        work: asyncio.Queue = asyncio.Queue()
+        pages: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_concurrency * 2)
+        for spec in self.requests():
+            work.put_nowait(spec)
+
+        async def worker():
+            while True:
+                spec = await work.get()
+                try:
+                    payload = await self.fetch(client, spec, result)
+                    for follow in self.follow_up(payload, spec):
+                        work.put_nowait(follow)
+                    await pages.put(self.parse(payload, spec))
+                except Exception as e:
+                    await pages.put(e)
+                finally:
+                    work.task_done()
+
+        async def close_when_done():
+            await work.join()
+            await pages.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.config.max_concurrency)]
+        closer = asyncio.create_task(close_when_done())
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            for task in workers + [closer]:
+                task.cancel()
+            await asyncio.gather(*workers, closer, return_exceptions=True)
+
+    async def run(self, output: str) -> IngestionResult:
+        """Fetch everything and write it to `output`. The file only appears if the whole run succeeds."""
+        result = IngestionResult(source=self.source, output=output)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        tmp_path = f"{output}.{os.getpid()}.tmp"
+        buffer: List[dict] = []
+
+        limits = httpx.Limits(max_connections=self.config.max_concurrency, max_keepalive_connections=self.config.max_concurrency)
+        try:
+            with pq.ParquetWriter(tmp_path, self.schema) as writer:
+                async with httpx.AsyncClient(base_url=self.config.base_url, timeout=self.config.timeout, limits=limits) as client:
+                    async for rows in self._records(client, result):
+                        buffer.extend(rows)
+                        if len(buffer) >= self.config.batch_size:
+                            batch, buffer = buffer, []
+                            # Encoding a batch is CPU work; keep it off the event loop so fetches continue
+                            await asyncio.to_thread(writer.write_batch, pa.RecordBatch.from_pylist(batch, schema=self.schema))
+                            result.records += len(batch)
+                if buffer:
+                    writer.write_batch(pa.RecordBatch.from_pylist(buffer, schema=self.schema))
+                    result.records += len(buffer)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, output)
+
+        logger.info(
+            f"[{self.source}] wrote {result.records} records to {output} "
+            f"({result.requests} requests, {result.cache_hits} cache hits, {result.retries} retries)"
+        )
+        return result
+
+def default_output(source: str, label: str) -> str:
+    return os.path.join(DEFAULT_OUTPUT_DIR, source, f"{label}.parquet")
+
+async def run_connectors(jobs: List[tuple]) -> List[IngestionResult]:
+    """Run (connector, output) pairs side by side; each source keeps its own concurrency limit."""
+    return list(await asyncio.gather(*(connector.run(output) for connector, output in jobs)))
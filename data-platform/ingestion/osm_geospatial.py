@@ -1,3 +1,56 @@
 # Purpose: OSM geospatial ingestion connector
-def fetch_osm_geospatial(area: str):
-    raise NotImplementedError('Implement OSM fetch logic')
+import asyncio
+from typing import Any, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+
+from ingestion.framework import Connector, IngestionResult, RequestSpec, SourceConfig, default_output
+
+# Amenity categories pulled per area; one Overpass query each so they run in parallel
+DEFAULT_AMENITIES = ["school", "hospital", "pharmacy", "library", "marketplace", "bus_station"]
+
+class OSMConnector(Connector):
+    """Amenity points of interest inside a named area, via the Overpass API."""
+    source = "osm"
+    schema = pa.schema([
+        ("osm_id", pa.int64()),
+        ("area", pa.string()),
+        ("amenity", pa.string()),
+        ("name", pa.string()),
+        ("lat", pa.float64()),
+        ("lon", pa.float64()),
+    ])
+
+    def __init__(self, area: str, amenities: Optional[Sequence[str]] = None, config: Optional[SourceConfig] = None):
+        super().__init__(config)
+        self.area = area
+        self.amenities = list(amenities or DEFAULT_AMENITIES)
+
+    def requests(self) -> Iterable[RequestSpec]:
+        for amenity in self.amenities:
+            query = (
+                f'[out:json][timeout:{int(self.config.timeout)}];'
+                f'area["name"="{self.area}"]->.a;'
+                f'node["amenity"="{amenity}"](area.a);'
+                f'out body;'
+            )
+            yield RequestSpec("interpreter", method="POST", form={"data": query})
+
+    def parse(self, payload: Any, request: RequestSpec) -> List[dict]:
+        return [
+            {
+                "osm_id": element["id"],
+                "area": self.area,
+                "amenity": element.get("tags", {}).get("amenity"),
+                "name": element.get("tags", {}).get("name"),
+                "lat": element["lat"],
+                "lon": element["lon"],
+            }
+            for element in payload.get("elements", [])
+            if element.get("type") == "node"
+        ]
+
+def fetch_osm_geospatial(area: str, output: Optional[str] = None) -> IngestionResult:
+    connector = OSMConnector(area)
+    label = area.lower().replace(" ", "_")
+    return asyncio.run(connector.run(output or default_output("osm", label)))
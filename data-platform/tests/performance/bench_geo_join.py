@@ -0,0 +1,88 @@
+# Purpose: Benchmark the bulk spatial join on synthetic county-like polygons
+# Run from data-platform/: python -m tests.performance.bench_geo_join --points 2000000 --polygons 3000
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from transformations.geo_join import GeoIndex, geo_join_batches
+
+def synthetic_polygons(count: int, vertices: int, seed: int = 0) -> dict:
+    """
+    One wobbly star-shaped polygon per cell of a jittered grid over the
+    continental US box, `vertices` points each: roughly county density and
+    boundary detail, with gaps between polygons for points that match nothing.
+    """
+    rng = np.random.default_rng(seed)
+    cols = int(math.ceil(math.sqrt(count * 2.2)))
+    rows = int(math.ceil(count / cols))
+    cell_w, cell_h = 58.0 / cols, 25.0 / rows
+    angles = np.linspace(0, 2 * math.pi, vertices, endpoint=False)
+    features = []
+    for i in range(count):
+        cx = -125.0 + (i % cols + 0.5) * cell_w
+        cy = 24.0 + (i // cols + 0.5) * cell_h
+        radius = 0.48 * min(cell_w, cell_h) * (0.6 + 0.4 * rng.random(vertices))
+        ring = np.column_stack([cx + radius * np.cos(angles), cy + radius * np.sin(angles)])
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [ring.tolist()]},
+            "properties": {"GEOID": f"{i:05d}", "NAME": f"County {i}"}
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+def point_batches(total: int, batch_size: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, batch_size):
+        n = min(batch_size, total - start)
+        yield pa.RecordBatch.from_pydict({"lat": rng.uniform(24.0, 49.0, n), "lon": rng.uniform(-125.0, -67.0, n)})
+
+def naive_seconds_per_point(geodata: dict, sample: int) -> float:
+    """The per-record loop this replaces: bbox check, then ray casting every candidate polygon."""
+    rings = [np.asarray(f["geometry"]["coordinates"][0]) for f in geodata["features"]]
+    boxes = [(r[:, 0].min(), r[:, 1].min(), r[:, 0].max(), r[:, 1].max()) for r in rings]
+    batch = next(point_batches(sample, sample, seed=2))
+    started = time.perf_counter()
+    for px, py in zip(batch.column(1).to_pylist(), batch.column(0).to_pylist()):
+        for ring, (x0, y0, x1, y1) in zip(rings, boxes):
+            if x0 <= px <= x1 and y0 <= py <= y1:
+                inside = False
+                for (ax, ay), (bx, by) in zip(ring.tolist(), np.roll(ring, -1, axis=0).tolist()):
+                    if (ay > py) != (by > py) and px < ax + (py - ay) * (bx - ax) / (by - ay):
+                        inside = not inside
+                if inside:
+                    break
+    return (time.perf_counter() - started) / sample
+
+def run(points: int, polygons: int, vertices: int, batch_size: int, workers_list, naive_sample: int):
+    geodata = synthetic_polygons(polygons, vertices)
+    if naive_sample:
+        per_point = naive_seconds_per_point(geodata, naive_sample)
+        print(f"naive loop: {per_point * 1e6:.0f}us/point, ~{per_point * points:.0f}s for {points} points (from {naive_sample})")
+
+    started = time.perf_counter()
+    index = GeoIndex(geodata)
+    print(f"index: {polygons} polygons x {vertices} vertices built in {time.perf_counter() - started:.2f}s")
+
+    for workers in workers_list:
+        started = time.perf_counter()
+        matched = 0
+        for batch in geo_join_batches(point_batches(points, batch_size), index, workers=workers):
+            matched += batch.num_rows - batch.column(batch.schema.get_field_index("GEOID")).null_count
+        elapsed = time.perf_counter() - started
+        print(f"workers={workers}: {points} points in {elapsed:.2f}s ({points / elapsed:,.0f} points/s, {matched} matched)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark transformations.geo_join on synthetic polygons")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--polygons", type=int, default=3000)
+    parser.add_argument("--vertices", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=200_000)
+    parser.add_argument("--workers", type=str, default=f"1,{os.cpu_count() or 1}", help="Comma-separated worker counts to compare")
+    parser.add_argument("--naive-sample", type=int, default=200, help="Points timed with the per-record loop (0 to skip)")
+    args = parser.parse_args()
+    workers = sorted({int(w) for w in args.workers.split(",")})
+    run(args.points, args.polygons, args.vertices, args.batch_size, workers, args.naive_sample)
@@ -0,0 +1,87 @@
+import math
+import random
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from transformations import geo_join as geo_join_module
+from transformations.geo_join import GeoIndex, PolygonIndex, geo_join, geo_join_batches, geo_join_parquet
+
+def square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+def feature(geometry, **properties):
+    return {"type": "Feature", "geometry": geometry, "properties": properties}
+
+def star(cx, cy, radius, vertices, rng):
+    angles = np.linspace(0, 2 * math.pi, vertices, endpoint=False)
+    radii = radius * (0.5 + 0.5 * np.array([rng.random() for _ in angles]))
+    return {"type": "Polygon", "coordinates": [[[cx + r * math.cos(a), cy + r * math.sin(a)] for a, r in zip(angles, radii)]]}
+
+def brute_force(geometries, x, y):
+    """Per-point, per-polygon even-odd ray casting: slow but obviously right."""
+    def contains(geometry, px, py):
+        polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        inside = False
+        for ring in (ring for polygon in polygons for ring in polygon):
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                if (y1 > py) != (y2 > py) and px < x1 + (py - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+        return inside
+    return np.array([next((f for f, g in enumerate(geometries) if contains(g, px, py)), -1) for px, py in zip(x, y)])
+
+GEODATA = {
+    "type": "FeatureCollection",
+    "features": [
+        # Square with a hole, a concave L, and a two-part multipolygon
+        feature({"type": "Polygon", "coordinates": [square(0, 0, 10, 10), square(4, 4, 6, 6)]}, GEOID="01", NAME="Holey"),
+        feature({"type": "Polygon", "coordinates": [[[10, 0], [20, 0], [20, 4], [14, 4], [14, 10], [10, 10], [10, 0]]]}, GEOID="02", NAME="Ell"),
+        feature({"type": "MultiPolygon", "coordinates": [[square(30, 0, 32, 2)], [square(34, 0, 36, 2)]]}, GEOID="03", NAME="Islands"),
+    ]
+}
+
+def test_holes_concave_and_multipolygons():
+    index = PolygonIndex([f["geometry"] for f in GEODATA["features"]])
+    x = np.array([1, 5, 12, 17, 17, 31, 33, 35, -5, np.nan])
+    y = np.array([1, 5, 8, 2, 8, 1, 1, 1, 1, 1])
+    assert index.locate(x, y).tolist() == [0, -1, 1, 1, -1, 2, -1, 2, -1, -1]
+
+def test_matches_brute_force_on_random_polygons(monkeypatch):
+    # Small bands and chunks so every code path (multi-band edges, chunk splits) runs
+    monkeypatch.setattr(geo_join_module, "EDGES_PER_BAND", 4)
+    monkeypatch.setattr(geo_join_module, "MAX_COMPARISONS", 500)
+    rng = random.Random(0)
+    geometries = [star(rng.uniform(0, 100), rng.uniform(0, 50), rng.uniform(2, 12), rng.randint(3, 60), rng) for _ in range(40)]
+    x = np.array([rng.uniform(-5, 105) for _ in range(3000)])
+    y = np.array([rng.uniform(-5, 55) for _ in range(3000)])
+    assert (PolygonIndex(geometries).locate(x, y) == brute_force(geometries, x, y)).all()
+
+def test_geo_join_attaches_properties():
+    records = [{"id": 1, "lat": 1.0, "lon": 1.0}, {"id": 2, "lat": 1.0, "lon": 35.0}, {"id": 3, "lat": 50.0, "lon": 50.0}]
+    joined = geo_join(records, GEODATA)
+    assert joined["GEOID"].tolist()[:2] == ["01", "03"]
+    assert joined["NAME"].tolist()[:2] == ["Holey", "Islands"]
+    assert joined["NAME"].isna().tolist() == [False, False, True]
+    assert list(geo_join(records, GEODATA["features"], properties=["GEOID"]).columns) == ["id", "lat", "lon", "GEOID"]
+
+def test_batches_across_processes_keep_order_and_schema():
+    index = GeoIndex(GEODATA)
+    rng = random.Random(1)
+    batches = [
+        pa.RecordBatch.from_pydict({"lat": [rng.uniform(0, 10) for _ in range(500)], "lon": [rng.uniform(0, 40) for _ in range(500)]})
+        for _ in range(6)
+    ]
+    # A batch that matches nothing must keep the string type
+    batches.append(pa.RecordBatch.from_pydict({"lat": [90.0], "lon": [90.0]}))
+    parallel = list(geo_join_batches(batches, index, workers=2))
+    inline = list(geo_join_batches(batches, index, workers=1))
+    assert [b.to_pydict() for b in parallel] == [b.to_pydict() for b in inline]
+    assert all(b.schema.field("GEOID").type == pa.string() for b in parallel)
+
+def test_geo_join_parquet_streams_and_swaps_in(tmp_path):
+    source, output = str(tmp_path / "points.parquet"), str(tmp_path / "joined.parquet")
+    pq.write_table(pa.table({"lat": [1.0, 8.0, 1.0], "lon": [1.0, 12.0, 33.0]}), source)
+    assert geo_join_parquet(source, output, GEODATA, workers=1, batch_size=2) == 3
+    assert pq.read_table(output).column("NAME").to_pylist() == ["Holey", "Ell", None]
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
@@ -0,0 +1,300 @@
+import re
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingestion.bls_api import BLSConnector
+from ingestion.census_api import CensusConnector
+from ingestion.fbi_crime import FBICrimeConnector
+from ingestion.framework import Connector, ConnectorError, RequestSpec, SourceConfig
+from ingestion.osm_geospatial import OSMConnector
+
+class StubSource:
+    """
+    A local HTTP server standing in for a data source: no network, scripted
+    failures. Route handlers get (query, body), the body being the decoded
+    JSON or form of a POST and None for a GET.
+    """
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.hits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_first = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._serve(None)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    self._serve(json.loads(raw))
+                else:
+                    self._serve({k: v[0] for k, v in parse_qs(raw).items()})
+
+            def _serve(self, body):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.hits.append((url.path, query, body))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    key = (url.path, tuple(sorted(query.items())))
+                    failing = stub.fail_first.get(key, 0)
+                    if failing:
+                        stub.fail_first[key] = failing - 1
+                try:
+                    time.sleep(0.02)
+                    if failing:
+                        self.send_response(503)
+                        self.end_headers()
+                        return
+                    handler = stub.routes.get(url.path)
+                    if handler is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    body = json.dumps(handler(query, body)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def census_counties(query, body):
+    state = query["in"].split(":")[1]
+    header = ["NAME", "B19013_001E", "B01003_001E", "B25077_001E", "B25064_001E", "state", "county"]
+    rows = [[f"County {i}, {state}", "65000", "1200", "-666666666", "1100", state, f"{i:03d}"] for i in range(1, 4)]
+    return [header] + rows
+
+@pytest.fixture
+def census_source():
+    stub = StubSource({"/data/2022/acs/acs5": census_counties})
+    yield stub
+    stub.close()
+
+def make_config(name, base_url, tmp_path, **overrides):
+    settings = dict(
+        name=name, base_url=base_url, max_concurrency=3, backoff_base=0.01,
+        cache_mode="readwrite", cache_dir=str(tmp_path / "cache")
+    )
+    settings.update(overrides)
+    return SourceConfig(**settings)
+
+@pytest.mark.asyncio
+async def test_concurrent_fetch_with_retries_and_replay(census_source, tmp_path):
+    states = ["CA", "TX", "NY", "WA", "OH", "FL"]
+    census_source.fail_first[("/data/2022/acs/acs5", tuple(sorted({
+        "get": "NAME,B19013_001E,B01003_001E,B25077_001E,B25064_001E", "for": "county:*", "in": "state:48"
+    }.items())))] = 2
+
+    config = make_config("census", f"{census_source.url}/data", tmp_path)
+    output = str(tmp_path / "census.parquet")
+    result = await CensusConnector(2022, states, config).run(output)
+
+    assert result.records == 18
+    assert result.retries == 2
+    assert 1 < census_source.max_in_flight <= 3
+    table = pq.read_table(output).to_pylist()
+    assert {row["state_fips"] for row in table} == {"06", "48", "36", "53", "39", "12"}
+    # Suppressed ACS estimates become nulls
+    assert all(row["home_price"] is None and row["median_income"] == 65000.0 for row in table)
+
+    # Replay from the on-disk cache with the source gone
+    census_source.close()
+    replay = make_config("census", "http://127.0.0.1:9", tmp_path, cache_mode="replay")
+    result = await CensusConnector(2022, states, replay).run(str(tmp_path / "replay.parquet"))
+    assert (result.records, result.requests, result.cache_hits) == (18, 0, 6)
+    assert sorted(pq.read_table(str(tmp_path / "replay.parquet")).to_pylist(), key=str) == sorted(table, key=str)
+
+class PagedConnector(Connector):
+    """Minimal cursor-paged source, to exercise follow_up() without tying the test to a real API."""
+    source = "paged"
+    schema = pa.schema([("id", pa.string()), ("region", pa.string()), ("value", pa.float64())])
+
+    def __init__(self, regions, config):
+        super().__init__(config)
+        self.regions = regions
+
+    def requests(self):
+        for region in self.regions:
+            yield RequestSpec("items", params={"region": region, "page": 1})
+
+    def follow_up(self, payload, request):
+        if payload.get("next_page"):
+            yield RequestSpec(request.path, params={**request.params, "page": payload["next_page"]})
+
+    def parse(self, payload, request):
+        return [{"id": item["id"], "region": request.params["region"], "value": item["value"]} for item in payload["results"]]
+
+@pytest.mark.asyncio
+async def test_pagination_streams_record_batches(tmp_path):
+    def items(query, body):
+        page = int(query["page"])
+        results = [{"id": f"{query['region']}-{page}-{i}", "value": 300000 + i} for i in range(4)]
+        return {"results": results, "next_page": page + 1 if page < 5 else None}
+
+    stub = StubSource({"/api/items": items})
+    try:
+        config = make_config("paged", f"{stub.url}/api", tmp_path, cache_mode="off", batch_size=6)
+        output = str(tmp_path / "paged.parquet")
+        result = await PagedConnector(["a", "b"], config).run(output)
+    finally:
+        stub.close()
+
+    assert result.records == 2 * 5 * 4
+    assert len(stub.hits) == 10
+    parquet = pq.ParquetFile(output)
+    assert parquet.metadata.num_rows == 40
+    # Rows were flushed in batches as pages arrived, not written in one go at the end
+    assert parquet.metadata.num_row_groups > 1
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_leaves_no_output(tmp_path):
+    stub = StubSource({})
+    try:
+        config = make_config("census", f"{stub.url}/data", tmp_path, cache_mode="off")
+        output = tmp_path / "census.parquet"
+        with pytest.raises(ConnectorError, match="HTTP 404"):
+            await CensusConnector(2022, ["CA"], config).run(str(output))
+    finally:
+        stub.close()
+
+    assert len(stub.hits) == 1
+    assert not output.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+def cached_text(tmp_path):
+    return "".join(path.read_text() for path in (tmp_path / "cache").rglob("*.json"))
+
+@pytest.mark.asyncio
+async def test_bls_posts_json_batches_with_the_key_in_the_body(tmp_path, monkeypatch):
+    def series_data(query, body):
+        years = range(int(body["startyear"]), int(body["endyear"]) + 1)
+        return {"status": "REQUEST_SUCCEEDED", "message": [], "Results": {"series": [
+            {"seriesID": sid, "data": [{"year": str(y), "period": "M13", "value": "-" if sid.endswith("0") else "4.2"} for y in years]}
+            for sid in body["seriesid"]
+        ]}}
+
+    monkeypatch.setenv("TEST_BLS_KEY", "bls-secret")
+    series = [f"LAUCN{i:05d}" for i in range(60)]
+    stub = StubSource({"/publicAPI/v2/timeseries/data/": series_data})
+    stub.fail_first[("/publicAPI/v2/timeseries/data/", ())] = 1
+    try:
+        config = make_config("bls", f"{stub.url}/publicAPI/v2", tmp_path, api_key_env="TEST_BLS_KEY", api_key_param="registrationkey")
+        result = await BLSConnector(series, 2023, 2024, config).run(str(tmp_path / "bls.parquet"))
+    finally:
+        stub.close()
+
+    assert (result.records, result.requests, result.retries) == (120, 2, 1)
+    bodies = [body for _, _, body in stub.hits]
+    assert all(body["registrationkey"] == "bls-secret" and (body["startyear"], body["endyear"]) == ("2023", "2024") for body in bodies)
+    assert sorted({len(body["seriesid"]) for body in bodies}) == [10, 50]
+    rows = pq.read_table(str(tmp_path / "bls.parquet")).to_pylist()
+    assert {(row["series_id"], row["value"]) for row in rows if row["year"] == 2024} >= {("LAUCN00000", None), ("LAUCN00001", 4.2)}
+    # The key is added at send time, so it never reaches the cache
+    assert "bls-secret" not in cached_text(tmp_path)
+
+    replay = make_config("bls", "http://127.0.0.1:9", tmp_path, cache_mode="replay")
+    result = await BLSConnector(series, 2023, 2024, replay).run(str(tmp_path / "replay.parquet"))
+    assert (result.records, result.requests, result.cache_hits) == (120, 0, 2)
+
+@pytest.mark.asyncio
+async def test_bls_failure_is_not_cached(tmp_path):
+    stub = StubSource({"/publicAPI/v2/timeseries/data/": lambda query, body: {
+        "status": "REQUEST_NOT_PROCESSED", "message": ["daily threshold reached"], "Results": {}
+    }})
+    try:
+        config = make_config("bls", f"{stub.url}/publicAPI/v2", tmp_path)
+        with pytest.raises(ConnectorError, match="daily threshold reached"):
+            await BLSConnector(["LAUCN00001"], 2023, 2024, config).run(str(tmp_path / "bls.parquet"))
+    finally:
+        stub.close()
+
+    assert not (tmp_path / "bls.parquet").exists()
+    assert cached_text(tmp_path) == ""
+
+@pytest.mark.asyncio
+async def test_osm_posts_one_overpass_form_per_amenity(tmp_path):
+    def interpreter(query, body):
+        amenity = re.search(r'node\["amenity"="(\w+)"\]', body["data"]).group(1)
+        assert 'area["name"="Travis County"]' in body["data"] and "[timeout:30]" in body["data"]
+        return {"elements": [
+            {"type": "node", "id": 1 if amenity == "school" else 2, "lat": 30.2, "lon": -97.7, "tags": {"amenity": amenity, "name": f"A {amenity}"}},
+            {"type": "node", "id": 10 if amenity == "school" else 20, "lat": 30.3, "lon": -97.8, "tags": {"amenity": amenity}},
+            {"type": "way", "id": 99, "nodes": [1, 2]},
+        ]}
+
+    stub = StubSource({"/api/interpreter": interpreter})
+    stub.fail_first[("/api/interpreter", ())] = 1
+    try:
+        config = make_config("osm", f"{stub.url}/api", tmp_path)
+        result = await OSMConnector("Travis County", ["school", "hospital"], config).run(str(tmp_path / "osm.parquet"))
+    finally:
+        stub.close()
+
+    assert (result.records, result.requests, result.retries) == (4, 2, 1)
+    rows = pq.read_table(str(tmp_path / "osm.parquet")).to_pylist()
+    # Ways are skipped; a node without a name tag gets a null name
+    assert sorted((row["osm_id"], row["amenity"], row["name"]) for row in rows) == [
+        (1, "school", "A school"), (2, "hospital", "A hospital"), (10, "school", None), (20, "hospital", None)
+    ]
+    assert all(row["area"] == "Travis County" for row in rows)
+
+    replay = make_config("osm", "http://127.0.0.1:9", tmp_path, cache_mode="replay")
+    result = await OSMConnector("Travis County", ["school", "hospital"], replay).run(str(tmp_path / "replay.parquet"))
+    assert (result.records, result.cache_hits) == (4, 2)
+
+@pytest.mark.asyncio
+async def test_fbi_requests_each_state_and_derives_the_rate(tmp_path, monkeypatch):
+    def estimates(state, population):
+        return lambda query, body: {"results": [{
+            "state_abbr": state, "year": query["from"], "population": population, "violent_crime": 5, "property_crime": 15
+        }]}
+
+    monkeypatch.setenv("TEST_FBI_KEY", "fbi-secret")
+    stub = StubSource({"/cde/estimate/state/CA": estimates("CA", 1000), "/cde/estimate/state/TX": estimates("TX", None)})
+    stub.fail_first[("/cde/estimate/state/TX", (("API_KEY", "fbi-secret"), ("from", "2022"), ("to", "2022")))] = 2
+    try:
+        config = make_config("fbi_crime", f"{stub.url}/cde", tmp_path, api_key_env="TEST_FBI_KEY", api_key_param="API_KEY")
+        result = await FBICrimeConnector(2022, ["CA", "TX"], config).run(str(tmp_path / "fbi.parquet"))
+    finally:
+        stub.close()
+
+    assert (result.records, result.requests, result.retries) == (2, 2, 2)
+    assert all(query == {"from": "2022", "to": "2022", "API_KEY": "fbi-secret"} for _, query, _ in stub.hits)
+    rows = {row["state"]: row for row in pq.read_table(str(tmp_path / "fbi.parquet")).to_pylist()}
+    assert rows["CA"]["crime_rate_per_100k"] == 2000.0 and rows["CA"]["year"] == 2022
+    # No population, no rate
+    assert rows["TX"]["crime_rate_per_100k"] is None
+
+    # A new key still hits the cache: keys are not part of the cache key
+    monkeypatch.setenv("TEST_FBI_KEY", "rotated")
+    config = make_config("fbi_crime", "http://127.0.0.1:9", tmp_path, api_key_env="TEST_FBI_KEY", api_key_param="API_KEY")
+    result = await FBICrimeConnector(2022, ["CA", "TX"], config).run(str(tmp_path / "cached.parquet"))
+    assert (result.records, result.requests, result.cache_hits) == (2, 0, 2)
@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+import random
+import subprocess
+
+import polars as pl
+import pytest
+
+from validation.distribution_checks import profile, validate_distribution
+from validation.null_checks import validate_nulls
+from validation.schema_validation import LOCATION_SCHEMA, validate_schema
+from validation.stage import ValidationFailed, publish_dataset, validate_dataset
+
+DATA_PLATFORM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_locations(n=1000, seed=0):
+    rng = random.Random(seed)
+    return pl.DataFrame([
+        {
+            "location_id": f"LOC-{i}",
+            "city": f"City {i}",
+            "county": f"County {i % 20}",
+            "state": ["CA", "TX", "NY"][i % 3],
+            "median_income": rng.uniform(40000, 120000),
+            "crime_index": rng.uniform(0, 100),
+            "growth_index": rng.uniform(-5, 15),
+            "home_price": rng.uniform(150000, 900000),
+            "rent_price": rng.uniform(800, 4000),
+            "population": rng.randint(1000, 500000),
+            "lat": rng.uniform(25, 49),
+            "lon": rng.uniform(-124, -67),
+        }
+        for i in range(n)
+    ], schema=LOCATION_SCHEMA)
+
+def test_schema_flags_missing_mistyped_and_unexpected_columns():
+    df = make_locations(10).drop("lat").with_columns(
+        pl.col("population").cast(pl.String),
+        pl.lit(1).alias("extra")
+    )
+    issues = {(i["column"], i["message"].split(" ")[0]) for i in validate_schema(df)}
+    assert issues == {("lat", "missing"), ("population", "column"), ("extra", "unexpected")}
+    assert validate_schema(make_locations(10)) == []
+
+def test_nulls_count_nan_and_inf_against_threshold():
+    df = make_locations(100).with_columns(
+        pl.when(pl.int_range(pl.len()) < 2).then(float("nan")).otherwise(pl.col("crime_index")).alias("crime_index"),
+        pl.when(pl.int_range(pl.len()) == 5).then(None).otherwise(pl.col("city")).alias("city")
+    )
+    issues = validate_nulls(df, list(LOCATION_SCHEMA))
+    assert {i["column"] for i in issues} == {"crime_index", "city"}
+    # Within a 5% allowance, and per-field thresholds override
+    assert validate_nulls(df, list(LOCATION_SCHEMA), 0.05) == []
+    assert [i["column"] for i in validate_nulls(df, ["crime_index", "city"], {"crime_index": 0.01, "city": 0.05})] == ["crime_index"]
+
+def test_profile_ignores_non_finite_values():
+    df = make_locations(100).with_columns(
+        pl.when(pl.int_range(pl.len()) == 0).then(float("inf")).otherwise(pl.col("home_price")).alias("home_price")
+    )
+    stats = profile(df)["features"]["home_price"]
+    assert stats["max"] <= 900000
+
+def test_distribution_drift_against_baseline():
+    baseline = profile(make_locations(seed=1))
+    assert validate_distribution(make_locations(seed=2), baseline) == []
+
+    # One corrupt value blows the range; a rescaled column moves mean and std
+    corrupt = make_locations(seed=2).with_columns(
+        pl.when(pl.int_range(pl.len()) == 0).then(1e9).otherwise(pl.col("median_income")).alias("median_income"),
+        (pl.col("rent_price") * 10).alias("rent_price")
+    )
+    checks = {(i["column"], i["message"].split(" ")[1]) for i in validate_distribution(corrupt, baseline)}
+    assert ("median_income", "range") in checks
+    assert ("rent_price", "mean") in checks
+    assert ("rent_price", "standard") in checks
+
+    # Batches only get the range check
+    batch = make_locations(3, seed=3).with_columns(pl.lit(3900.0).alias("rent_price"))
+    assert validate_distribution(batch, baseline, batch=True) == []
+
+def test_duplicate_ids_fail_the_stage():
+    df = pl.concat([make_locations(10), make_locations(10).head(2)])
+    report = validate_dataset(df)
+    assert not report["passed"]
+    assert report["errors"][0]["check"] == "duplicates"
+
+def test_publish_blocked_on_failure_and_baseline_rolled_forward(tmp_path):
+    target = str(tmp_path / "locations.parquet")
+    candidate = str(tmp_path / "candidate.parquet")
+
+    make_locations(seed=1).write_parquet(candidate)
+    report = publish_dataset(candidate, target)
+    assert report["passed"] and os.path.exists(target) and not os.path.exists(candidate)
+    with open(f"{target}.profile.json") as f:
+        assert json.load(f)["rows"] == 1000
+
+    make_locations(seed=2).with_columns((pl.col("home_price") * 5).alias("home_price")).write_parquet(candidate)
+    with pytest.raises(ValidationFailed) as exc:
+        publish_dataset(candidate, target)
+    assert {i["column"] for i in exc.value.report["errors"]} == {"home_price"}
+    # Published file untouched, candidate kept for inspection
+    assert pl.read_parquet(target)["home_price"].max() <= 900000
+    assert os.path.exists(candidate)
+
+def test_stage_runs_outside_pytest(tmp_path):
+    # pytest puts only data-platform/ on the path; the shell gives no more than that
+    candidate, target = str(tmp_path / "candidate.parquet"), str(tmp_path / "locations.parquet")
+    make_locations(200).write_parquet(candidate)
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    result = subprocess.run(
+        [sys.executable, "-m", "validation.stage", candidate, target],
+        cwd=DATA_PLATFORM_DIR, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert os.path.exists(target) and os.path.exists(f"{target}.profile.json")
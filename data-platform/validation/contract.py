@@ -0,0 +1,12 @@
+# Purpose: The location dataset contract (columns, stat features, drift rules), loaded from the backend
+# The backend owns it in backend/app/schemas/dataset.py (pure Python). Nothing in
+# the repo is installed as a package, so backend/ is put on the path here,
+# resolved from this file, the way backend/scripts/generate_dummy_data.py does.
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.schemas.dataset import LOCATION_COLUMNS, STAT_FEATURES, drift_issues
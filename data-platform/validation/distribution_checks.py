@@ -1,3 +1,48 @@
 # Purpose: Distribution checks
-def validate_distribution(records, baseline):
-    raise NotImplementedError('Implement distribution checks')
+from typing import List, Optional, Sequence
+
+import polars as pl
+
+from validation.contract import STAT_FEATURES as FEATURES, drift_issues
+from validation.schema_validation import Records, as_lazy
+
+def profile(records: Records, features: Sequence[str] = FEATURES) -> dict:
+    """
+    {"rows", "features": {feat: {"min", "max", "mean", "std"}}} over finite
+    values, in one aggregate pass. This is the baseline the next version is
+    checked against, the same shape the backend keeps in its manifest.
+    """
+    lazy = as_lazy(records)
+    exprs = [pl.len().alias("__rows")]
+    for feat in features:
+        finite = pl.col(feat).filter(pl.col(feat).is_finite())
+        exprs += [
+            finite.min().alias(f"{feat}__min"),
+            finite.max().alias(f"{feat}__max"),
+            finite.mean().alias(f"{feat}__mean"),
+            finite.std(ddof=0).alias(f"{feat}__std"),
+        ]
+    row = lazy.select(exprs).collect().row(0, named=True)
+
+    result = {"rows": row["__rows"], "features": {}}
+    for feat in features:
+        if row[f"{feat}__min"] is not None:
+            result["features"][feat] = {stat: float(row[f"{feat}__{stat}"]) for stat in ("min", "max", "mean", "std")}
+    return result
+
+def validate_distribution(
+    records: Records,
+    baseline: Optional[dict],
+    batch: bool = False,
+    current: Optional[dict] = None
+) -> List[dict]:
+    """
+    Drift against the previous version's profile, by the backend's rules and
+    default limits (drift_issues in backend/app/schemas/dataset.py), so a
+    version that passes here passes the backend's validator too. Pass
+    `current` to reuse a profile that was already computed.
+    """
+    if not baseline:
+        return []
+    current = current or profile(records, list(baseline.get("features", {})))
+    return drift_issues(current, baseline, batch)
@@ -1,3 +1,46 @@
 # Purpose: Null checks
-def validate_nulls(records, required_fields):
-    raise NotImplementedError('Implement null checks')
+from typing import Dict, List, Optional, Sequence, Union
+
+import polars as pl
+
+from validation.schema_validation import Records, as_lazy
+
+def validate_nulls(
+    records: Records,
+    required_fields: Sequence[str],
+    max_null_rate: Union[float, Dict[str, float]] = 0.0
+) -> List[dict]:
+    """
+    Null rate per required field against `max_null_rate` (one threshold, or
+    per field). NaN and inf count as nulls in float columns. All counts come
+    from a single aggregate pass.
+    """
+    lazy = as_lazy(records)
+    schema = lazy.collect_schema()
+    exprs = [pl.len().alias("__rows")]
+    for name in required_fields:
+        invalid = pl.col(name).is_null()
+        if schema[name].is_float():
+            invalid = invalid | ~pl.col(name).is_finite()
+        exprs.append(invalid.sum().alias(name))
+    counts = lazy.select(exprs).collect().row(0, named=True)
+
+    rows = counts["__rows"]
+    issues = []
+    for name in required_fields:
+        limit = max_null_rate.get(name, 0.0) if isinstance(max_null_rate, dict) else max_null_rate
+        invalid = counts[name]
+        rate = invalid / rows if rows else 0.0
+        if invalid and rate > limit:
+            issues.append({
+                "check": "nulls", "column": name,
+                "message": f"{invalid} null/NaN/inf values in '{name}' ({rate:.4%}, max {limit:.4%})"
+            })
+    return issues
+
+def validate_unique(records: Records, key: str = "location_id") -> Optional[dict]:
+    """Issue for duplicate keys, or None."""
+    counts = as_lazy(records).select(pl.len().alias("rows"), pl.col(key).n_unique().alias("distinct")).collect().row(0)
+    if counts[0] == counts[1]:
+        return None
+    return {"check": "duplicates", "column": key, "message": f"{counts[0] - counts[1]} duplicate {key} values"}
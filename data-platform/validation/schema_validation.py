@@ -1,3 +1,44 @@
 # Purpose: Schema validation checks
-def validate_schema(records, schema):
-    raise NotImplementedError('Implement schema validation')
+from typing import Dict, Iterable, List, Union
+
+import polars as pl
+
+from validation.contract import LOCATION_COLUMNS
+
+Records = Union[pl.DataFrame, pl.LazyFrame, Iterable[dict]]
+
+# Derived from the backend's dataset contract (backend/app/schemas/dataset.py)
+_POLARS_TYPES = {"string": pl.String, "float": pl.Float64, "int": pl.Int64}
+LOCATION_SCHEMA = {name: _POLARS_TYPES[kind] for name, kind in LOCATION_COLUMNS.items()}
+
+def as_lazy(records: Records) -> pl.LazyFrame:
+    """Every check works on a LazyFrame, so parquet scans stay lazy and columnar."""
+    if isinstance(records, pl.LazyFrame):
+        return records
+    if isinstance(records, pl.DataFrame):
+        return records.lazy()
+    return pl.DataFrame(list(records), infer_schema_length=None).lazy()
+
+def _compatible(actual: pl.DataType, expected: pl.DataType) -> bool:
+    if expected == pl.String:
+        return actual == pl.String
+    if expected.is_float():
+        return actual.is_float()
+    return actual.is_integer()
+
+def validate_schema(records: Records, schema: Dict[str, pl.DataType] = LOCATION_SCHEMA) -> List[dict]:
+    """Missing, unexpected and mistyped columns. Reads the schema only, never the rows."""
+    actual = as_lazy(records).collect_schema()
+    issues = []
+    for name, expected in schema.items():
+        if name not in actual:
+            issues.append({"check": "schema", "column": name, "message": f"missing column '{name}'"})
+        elif not _compatible(actual[name], expected):
+            issues.append({
+                "check": "schema", "column": name,
+                "message": f"column '{name}' is {actual[name]}, expected {expected}"
+            })
+    for name in actual:
+        if name not in schema:
+            issues.append({"check": "schema", "column": name, "message": f"unexpected column '{name}'"})
+    return issues
@@ -0,0 +1,92 @@
+# Purpose: Validation stage run before a dataset is published
+# Usage: python -m validation.stage CANDIDATE TARGET [--baseline PATH]  (from data-platform/)
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from typing import Optional
+
+import polars as pl
+
+from validation.schema_validation import LOCATION_SCHEMA, Records, as_lazy, validate_schema
+from validation.null_checks import validate_nulls, validate_unique
+from validation.distribution_checks import profile, validate_distribution
+
+logger = logging.getLogger("data_platform")
+
+class ValidationFailed(Exception):
+    """A candidate dataset failed validation; carries the full report."""
+
+    def __init__(self, report: dict):
+        super().__init__("; ".join(issue["message"] for issue in report["errors"]))
+        self.report = report
+
+def validate_dataset(records: Records, baseline: Optional[dict] = None, max_null_rate: float = 0.0) -> dict:
+    """
+    Schema, nulls, unique location_id and drift against `baseline`, as a
+    few column-wise passes over the whole frame. Returns
+    {"passed", "rows", "errors", "profile", "duration_ms"}; the profile is the
+    baseline for the next version.
+    """
+    started = time.perf_counter()
+    lazy = as_lazy(records)
+    errors = validate_schema(lazy)
+    current = None
+    # The remaining checks read the expected columns, so they need a valid schema
+    if not errors:
+        errors += validate_nulls(lazy, list(LOCATION_SCHEMA), max_null_rate)
+        duplicates = validate_unique(lazy)
+        if duplicates:
+            errors.append(duplicates)
+        current = profile(lazy)
+        errors += validate_distribution(lazy, baseline, current=current)
+
+    return {
+        "passed": not errors,
+        "rows": current["rows"] if current else 0,
+        "errors": errors,
+        "profile": current,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+def publish_dataset(candidate: str, target: str, baseline_path: Optional[str] = None) -> dict:
+    """
+    Validate the parquet at `candidate` and only then move it over `target`.
+    The baseline is the profile stored at `baseline_path` by the previous
+    publish, which is replaced by the new profile on success. On failure
+    the candidate is left in place for inspection and ValidationFailed is
+    raised, so the published file never changes.
+    """
+    baseline_path = baseline_path or f"{target}.profile.json"
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = validate_dataset(pl.scan_parquet(candidate), baseline)
+    if not report["passed"]:
+        logger.warning(f"Not publishing {candidate}: {len(report['errors'])} validation issue(s)")
+        raise ValidationFailed(report)
+
+    os.replace(candidate, target)
+    tmp_path = f"{baseline_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report["profile"], f)
+    os.replace(tmp_path, baseline_path)
+    logger.info(f"Published {target} ({report['rows']} rows, validated in {report['duration_ms']}ms)")
+    return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Validate a candidate parquet and publish it over the target if it passes")
+    parser.add_argument("candidate", help="Parquet file to validate")
+    parser.add_argument("target", help="Published parquet it replaces")
+    parser.add_argument("--baseline", default=None, help="Previous profile (default: TARGET.profile.json)")
+    args = parser.parse_args()
+    try:
+        publish_dataset(args.candidate, args.target, args.baseline)
+    except ValidationFailed as e:
+        print(json.dumps(e.report["errors"], indent=2))
+        sys.exit(1)